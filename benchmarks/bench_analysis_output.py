@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+설문 분석 LLM 출력 크기 / 지연 비교
+- 기존 형식: LLM이 top_types 3개를 팔레트·키워드·메이크업 팁까지 모두 생성
+- 신규 형식: LLM은 ranking(type, score, description, 대표 색 palette 3개) + detailed_analysis만 생성,
+             나머지 필드는 services/catalog.py 에서 채움
+
+기본 실행은 오프라인 비교:
+  같은 문장을 담은 대표 응답 두 개의 출력 토큰 수를 세고 (tiktoken이 없으면 근사치),
+  --tps (초당 생성 토큰) 기준 예상 생성 시간과 서버 측 후처리 시간을 비교한다.
+--live N 을 주면 실제 OpenAI API로 두 프롬프트를 N번씩 호출해
+  usage.completion_tokens 와 응답 시간을 측정한다 (OPENAI_API_KEY 필요, 과금 발생).
+
+사용법: python benchmarks/bench_analysis_output.py [--tps 60] [--live 3]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import tempfile
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+_tmp_dir = tempfile.mkdtemp(prefix="bench_output_")
+os.environ.setdefault("DB_URL", f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}")
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench-dummy")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+os.environ.setdefault("OPENAI_WARMUP", "false")
+
+from openai_client import get_openai_client  # noqa: E402
+from routers import survey_router  # noqa: E402
+from services.catalog import SEASON_CATALOG  # noqa: E402
+
+ANSWERS = [
+    SimpleNamespace(question_id=1, option_id="opt_warm_undertone", option_label="노란빛, 복숭아빛 - 황금색 느낌"),
+    SimpleNamespace(question_id=2, option_id="opt_light_skin", option_label="밝음 (아이보리, 밝은 베이지 톤)"),
+    SimpleNamespace(question_id=3, option_id="opt_hair_golden", option_label="금색, 밝은 갈색, 적갈색"),
+    SimpleNamespace(question_id=4, option_id="opt_eye_warm_light", option_label="황금 갈색, 토파즈, 밝은 아쿠아"),
+    SimpleNamespace(question_id=7, option_id="opt_metal_warm", option_label="골드/구리색"),
+]
+
+ANALYSIS_TEXT = (
+    "손목 안쪽의 노란빛과 복숭아빛, 금빛이 도는 밝은 모발과 토파즈 같은 눈동자는 "
+    "따뜻하고 맑은 색에서 가장 생기 있게 빛나는 봄 웜톤의 전형적인 특징입니다. "
+    "골드 액세서리가 얼굴을 환하게 밝혀준다는 점도 이를 뒷받침합니다. "
+    "코럴과 피치처럼 채도가 높고 가벼운 색을 얼굴 가까이에 두면 혈색이 살아나고, "
+    "차갑고 탁한 색은 피부를 칙칙하게 보이게 할 수 있으니 피하는 것이 좋습니다. "
+    "가을 웜톤의 깊은 색도 어느 정도 소화하지만, 무게감보다는 밝고 투명한 색이 더 잘 어울립니다."
+)
+RANKING = [("spring", 88, "햇살 머금은 꽃잎처럼 맑고 따뜻한 생기를 지닌 당신"),
+           ("autumn", 72, "잘 익은 가을빛처럼 포근하고 깊은 온기를 품은 당신"),
+           ("summer", 58, "새벽 안개처럼 부드럽고 은은한 분위기를 지닌 당신")]
+
+# 기존 프롬프트의 응답 형식 지시문 (비교 기준)
+LEGACY_FORMAT = """이 답변들을 기반으로 사용자의 퍼스널 컬러 타입을 분석하세요.
+
+반드시 다음 가이드라인을 따라주세요:
+- 메인 타입 1개와 추천 타입 2개로 총 3개의 타입을 제공해주세요
+- 각 타입의 description은 문학적이고 감성적으로 작성해주세요
+- name은 이모지와 함께 일관된 형식으로 작성해주세요 (예: '봄 웜톤 🌸')
+
+분석 결과는 다음 형식으로 JSON으로 반드시 응답해주세요:
+{
+    "result_tone": "spring|summer|autumn|winter 중 정확히 하나",
+    "confidence": 0-100 사이의 숫자 (신뢰도 퍼센트, 진단의 확실성 정도),
+    "total_score": 0-100 사이의 숫자 (종합 점수, 타입 특성의 부합도),
+    "detailed_analysis": "사용자의 답변을 기반으로 한 자세한 분석 설명 (200-400자 정도)",
+    "top_types": [
+        {
+            "type": "spring|summer|autumn|winter",
+            "name": "퍼스널 컬러 타입명 (반드시 '봄 웜톤 🌸' 형식)",
+            "description": "타입의 특성을 문학적이고 감성적으로 표현한 설명 (30-50자)",
+            "color_palette": ["#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0"],
+            "style_keywords": ["화사함", "발랄함", "생동감", "밝음", "따뜻함"],
+            "makeup_tips": ["코럴 블러셔", "피치 립", "골든 아이섀도우", "브라운 마스카라"],
+            "score": 0-100 (해당 타입과의 일치도)
+        },
+        ... (총 3개)
+    ]
+}
+
+응답은 반드시 JSON 형식만 포함해야 합니다. 다른 설명은 포함하지 마세요."""
+
+
+def legacy_sample() -> str:
+    top_types = []
+    for season, score, description in RANKING:
+        profile = SEASON_CATALOG[season]
+        top_types.append({
+            "type": season,
+            "name": profile.name,
+            "description": description,
+            "color_palette": list(profile.color_palette),
+            "style_keywords": list(profile.style_keywords),
+            "makeup_tips": list(profile.makeup_tips),
+            "score": score,
+        })
+    return json.dumps({"result_tone": "spring", "confidence": 85, "total_score": 88,
+                       "detailed_analysis": ANALYSIS_TEXT, "top_types": top_types},
+                      ensure_ascii=False, indent=4)
+
+
+def compact_sample() -> str:
+    ranking = [{"type": season, "score": score, "description": description,
+                "palette": list(SEASON_CATALOG[season].color_palette[:3])}
+               for season, score, description in RANKING]
+    return json.dumps({"result_tone": "spring", "confidence": 85, "total_score": 88,
+                       "detailed_analysis": ANALYSIS_TEXT, "ranking": ranking},
+                      ensure_ascii=False, indent=4)
+
+
+def token_counter():
+    try:
+        import tiktoken
+        encoding = tiktoken.get_encoding("o200k_base")  # gpt-4o 계열 토크나이저
+        return (lambda text: len(encoding.encode(text))), "tiktoken o200k_base"
+    except Exception:
+        # 근사치: ASCII는 4자당 1토큰, 한글 등 그 외 문자는 1자당 1토큰
+        def approx(text: str) -> int:
+            ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+            return round(ascii_chars / 4 + (len(text) - ascii_chars))
+        return approx, "근사치 (pip install tiktoken 으로 정확히 측정)"
+
+
+def parse_time_us(text: str, repeat: int = 2000) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        survey_router.parse_analysis_response(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def offline(tps: float) -> int:
+    count, method = token_counter()
+    legacy, compact = legacy_sample(), compact_sample()
+    legacy_tokens, compact_tokens = count(legacy), count(compact)
+
+    legacy_result = survey_router.parse_analysis_response(legacy)
+    compact_result = survey_router.parse_analysis_response(compact)
+    same_fields = all(
+        legacy_result["top_types"][i][field] == compact_result["top_types"][i][field]
+        for i in range(3) for field in ("type", "name", "color_palette", "style_keywords", "makeup_tips", "score")
+    )
+
+    print(f"출력 토큰 ({method})")
+    print(f"  기존 (top_types 전체 생성): {legacy_tokens:5d} tokens  ≈ {legacy_tokens / tps:5.2f}s @ {tps:.0f} tok/s")
+    print(f"  신규 (ranking + 카탈로그) : {compact_tokens:5d} tokens  ≈ {compact_tokens / tps:5.2f}s @ {tps:.0f} tok/s")
+    print(f"  감소: {1 - compact_tokens / legacy_tokens:.0%}")
+    print(f"서버 후처리 (파싱 + 정규화): 기존 {parse_time_us(legacy):.0f}us / 신규 {parse_time_us(compact):.0f}us")
+    print(f"최종 top_types 동일 여부: {'✅' if same_fields else '❌'}")
+    return 0 if same_fields and compact_tokens < legacy_tokens else 1
+
+
+def live(n: int) -> int:
+    system_prompt, user_prompt = survey_router.build_analysis_prompts(ANSWERS)
+    head = user_prompt.split("이 답변들을 기반으로")[0]
+    prompts = {"기존": head + LEGACY_FORMAT, "신규": user_prompt}
+    max_tokens = {"기존": 1500, "신규": survey_router.ANALYSIS_MAX_TOKENS}
+    client = get_openai_client()
+
+    summary = {}
+    for label, prompt in prompts.items():
+        latencies, tokens = [], []
+        for _ in range(n):
+            start = time.perf_counter()
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}],
+                temperature=0.7,
+                max_tokens=max_tokens[label],
+            )
+            latencies.append(time.perf_counter() - start)
+            tokens.append(response.usage.completion_tokens)
+        summary[label] = (statistics.median(latencies), statistics.median(tokens))
+        print(f"  {label}: 출력 {summary[label][1]:.0f} tokens, 응답 {summary[label][0]:.2f}s (중앙값, {n}회)")
+
+    ok = summary["신규"][1] < summary["기존"][1] and summary["신규"][0] < summary["기존"][0]
+    print("✅ PASS: 출력 토큰과 응답 시간 모두 감소" if ok else "❌ FAIL: 감소하지 않음")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="설문 분석 LLM 출력 크기 / 지연 비교")
+    parser.add_argument("--tps", type=float, default=60.0, help="예상 생성 속도 (출력 tokens/s)")
+    parser.add_argument("--live", type=int, default=0, help="실제 API 호출 횟수 (0이면 오프라인 비교만)")
+    args = parser.parse_args()
+
+    status = offline(args.tps)
+    if args.live:
+        print("실제 API 비교 (gpt-4o-mini)")
+        status = live(args.live) or status
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+IVF 근사 검색 벤치마크 (rag.ann)
+- 합성 데이터: 군집 구조가 있는 정규화 벡터 (실제 임베딩처럼 주제별로 뭉쳐 있음)
+- 기준: VectorIndex 전수 검색 (exact=True)
+- nprobe별 recall@k (전수 검색 top-k 대비) 와 단일 쿼리 QPS 비교
+- IVF 빌드 시간과 rag.store 저장/로드 시간도 측정
+
+사용법: python benchmarks/bench_ann_search.py [--size 500000] [--dim 128] [--nprobe 1 4 8 16 32 64]
+  (dim 1536 × 500k 는 약 3GB 메모리가 필요하므로 기본 dim은 128)
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag import store as rag_store  # noqa: E402
+from rag.ann import IVFIndex  # noqa: E402
+from rag.index import VectorIndex, normalize_rows  # noqa: E402
+
+
+def synthetic(size, dim, clusters, noise, rng):
+    centers = normalize_rows(rng.standard_normal((clusters, dim)).astype(np.float32))
+    labels = rng.integers(0, clusters, size)
+    matrix = np.empty((size, dim), dtype=np.float32)
+    for start in range(0, size, 100_000):
+        block = labels[start:start + 100_000]
+        matrix[start:start + len(block)] = centers[block] + noise * rng.standard_normal((len(block), dim)).astype(np.float32)
+    return normalize_rows(matrix), centers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IVF 근사 검색 벤치마크")
+    parser.add_argument("--size", type=int, default=500_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=2_000, help="합성 데이터 군집 수")
+    parser.add_argument("--noise", type=float, default=0.08, help="군집 내 분산 (차원당 표준편차)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nlist", type=int, default=None, help="IVF list 수 (기본 √N)")
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32, 64])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    matrix, _ = synthetic(args.size, args.dim, args.clusters, args.noise, rng)
+    queries = normalize_rows(matrix[rng.choice(args.size, args.queries, replace=False)]
+                             + args.noise * rng.standard_normal((args.queries, args.dim)).astype(np.float32))
+    print(f"데이터 {args.size:,} x {args.dim} ({matrix.nbytes / 2**20:.0f}MB), "
+          f"생성 {time.perf_counter() - start:.1f}s, 쿼리 {args.queries}개, k={args.k}")
+
+    index = VectorIndex([""] * args.size, matrix, normalized=True)
+
+    # 기준: 전수 검색 (정답 + 단일 쿼리 지연)
+    truth = np.concatenate([index.search_batch(queries[i:i + 50], args.k, exact=True)[0]
+                            for i in range(0, args.queries, 50)])
+    start = time.perf_counter()
+    for q in queries:
+        index.search_batch(q.reshape(1, -1), args.k, exact=True)
+    exact_qps = args.queries / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    index.build_ann(nlist=args.nlist)
+    build_s = time.perf_counter() - start
+    ann = index.ann
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        rag_store.save_arrays("bench_ivf", ann.to_arrays(), cache_dir=cache_dir)
+        save_ms = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        loaded = IVFIndex.from_arrays(rag_store.load_arrays("bench_ivf", cache_dir=cache_dir)["arrays"])
+        load_ms = (time.perf_counter() - start) * 1e3
+    same = np.array_equal(loaded.order, ann.order) and np.array_equal(loaded.centroids, ann.centroids)
+    print(f"IVF 빌드 {build_s:.1f}s (nlist={ann.nlist}), 저장 {save_ms:.0f}ms / 로드 {load_ms:.0f}ms "
+          f"{'✅' if same else '❌ 로드 결과 불일치'}")
+
+    print(f"{'mode':>12} | {'recall@' + str(args.k):>9} | {'QPS':>8} | {'speedup':>7} | {'후보 비율':>8}")
+    print("-" * 58)
+    print(f"{'exact':>12} | {1.0:9.3f} | {exact_qps:8.0f} | {1.0:6.1f}x | {1.0:8.1%}")
+    best = None
+    for nprobe in args.nprobe:
+        start = time.perf_counter()
+        found = np.concatenate([index.search_batch(q.reshape(1, -1), args.k, nprobe=nprobe)[0] for q in queries])
+        qps = args.queries / (time.perf_counter() - start)
+        recall = np.mean([len(np.intersect1d(f, t)) / args.k for f, t in zip(found, truth)])
+        scanned = np.mean([len(ann.candidates(q, nprobe)) for q in queries[:20]]) / args.size
+        print(f"{'nprobe=' + str(nprobe):>12} | {recall:9.3f} | {qps:8.0f} | {qps / exact_qps:6.1f}x | {scanned:8.1%}")
+        if recall >= 0.95 and best is None:
+            best = (nprobe, recall, qps / exact_qps)
+
+    if best is None:
+        print("❌ recall 0.95 이상인 nprobe가 없습니다.")
+        return 1
+    print(f"✅ nprobe={best[0]}: recall {best[1]:.3f}, 전수 검색 대비 {best[2]:.1f}배 빠름")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+설문 제출 동시성 검증
+- OpenAI 분석 함수를 --latency 초 동안 블로킹하는 가짜 분석으로 바꾼 뒤
+  /api/survey/submit 요청 N개를 동시에 보낸다.
+- offload: 현재 구현 (전용 스레드 풀에서 분석) → 전체 소요 ≈ 1x latency
+- inline : 이벤트 루프에서 직접 호출하던 이전 방식 → 전체 소요 ≈ Nx latency
+- DB는 임시 SQLite 파일을 사용하므로 MySQL/OpenAI 없이 실행된다.
+
+사용법: python benchmarks/bench_concurrent_submit.py [--requests 8] [--latency 1.0]
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+_tmp_dir = tempfile.mkdtemp(prefix="bench_submit_")
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench-dummy")
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+import models  # noqa: E402
+from database import Base, engine, SessionLocal  # noqa: E402
+from routers import survey_router, user_router  # noqa: E402
+
+ANSWERS = {
+    "answers": [
+        {"question_id": 1, "option_id": "opt_warm_undertone", "option_label": "노란빛, 복숭아빛 - 황금색 느낌"},
+        {"question_id": 2, "option_id": "opt_light_skin", "option_label": "밝음 (아이보리, 밝은 베이지 톤)"},
+    ]
+}
+
+
+def make_fake_analysis(latency: float):
+    def fake_analysis(answers, fresh: bool = False) -> dict:
+        time.sleep(latency)  # 동기 OpenAI 호출 대기 시간 흉내
+        return {
+            "result_tone": "spring",
+            "confidence": 80,
+            "total_score": 80,
+            "detailed_analysis": "벤치마크용 분석 결과",
+            "top_types": [],
+        }
+    return fake_analysis
+
+
+async def _inline(func, *args, **kwargs):
+    return func(*args, **kwargs)
+
+
+async def fire(n: int) -> float:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[
+            client.post("/api/survey/submit", json=ANSWERS) for _ in range(n)
+        ])
+        elapsed = time.perf_counter() - start
+    failed = [r.status_code for r in responses if r.status_code != 201]
+    if failed:
+        raise RuntimeError(f"실패한 요청이 있습니다: {failed}")
+    return elapsed
+
+
+def main_bench():
+    parser = argparse.ArgumentParser(description="설문 제출 동시성 검증")
+    parser.add_argument("--requests", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=1.0, help="가짜 LLM 호출 지연(초)")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = models.User(username="bench", nickname="bench", password="-", email="bench@example.com")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    main.app.dependency_overrides[user_router.get_current_user] = \
+        lambda: SimpleNamespace(id=user_id, username="bench", is_active=True)
+    survey_router.analyze_personal_color_with_openai = make_fake_analysis(args.latency)
+
+    offload = asyncio.run(fire(args.requests))
+    survey_router.run_blocking = _inline
+    inline = asyncio.run(fire(args.requests))
+
+    print(f"동시 요청 {args.requests}개, LLM 지연 {args.latency:.2f}s")
+    print(f"  offload (현재): {offload:6.2f}s  ({offload / args.latency:4.1f}x latency)")
+    print(f"  inline  (이전): {inline:6.2f}s  ({inline / args.latency:4.1f}x latency)")
+
+    ok = offload < args.latency * 2
+    print("✅ PASS: 동시 요청이 ~1x 지연 안에 완료됨" if ok else "❌ FAIL: 이벤트 루프가 블로킹됨")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_bench())
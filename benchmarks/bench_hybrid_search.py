@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+RAG 검색 방식별 품질 / 지연 비교 (bm25 / vector / hybrid)
+- 평가 세트: 코퍼스에 실제로 있는 용어(정확 일치)와 섹션 단위 개념 질의
+  청크에 정답 표지 문자열이 들어 있으면 관련 청크로 본다.
+- 지표: hit@k (상위 k개 안에 관련 청크가 있는 비율), MRR@10, 쿼리당 검색 시간 중앙값
+- vector / hybrid 임베딩 백엔드는 --embedder 로 선택 (rag.embedding)
+  local (기본): 문자 n-gram 해시 임베딩, 네트워크 없음 / openai: OPENAI_API_KEY 필요, 임베딩 과금 발생
+  (--live 는 --embedder openai 와 같음) 임베딩 호출 시간은 검색 시간과 따로 표시한다.
+
+사용법: python benchmarks/bench_hybrid_search.py [--k 3] [--alpha 0.5] [--embedder local|openai]
+"""
+import os
+import sys
+import time
+import glob
+import argparse
+import statistics
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+from rag.chunking import iter_chunks  # noqa: E402
+from rag.embedding import EMBEDDERS, get_embedder  # noqa: E402
+from rag.index import normalize_rows, top_k_rows  # noqa: E402
+from rag.lexical import BM25Index, fuse_scores  # noqa: E402
+from rag.service import CORPUS_FILES, RagService  # noqa: E402
+
+# (질의, 인덱스, 정답 표지 문자열들)
+EVAL_SET = [
+    ("피스타치오 그린 컬러", "beauty_trend", ["피스타치오"]),
+    ("레오파드 패턴 코디", "beauty_trend", ["레오파드"]),
+    ("청청 데님 셋업", "beauty_trend", ["데님"]),
+    ("슬라우치 부츠", "beauty_trend", ["슬라우치"]),
+    ("볼레로가 다시 유행", "beauty_trend", ["볼레로"]),
+    ("페이크 퍼 소재", "beauty_trend", ["페이크 퍼"]),
+    ("카키색 올리브 그린이 어울리는 타입", "personal_color", ["올리브 그"]),
+    ("네이비 블루와 와인이 어울리는 계절", "personal_color", ["네이비 블루"]),
+    ("여름 타입이 피해야 할 색상", "personal_color", ["렌지색, 노란색을 바탕으로 한 밤색"]),
+    ("겨울 쿨톤이 피해야 할 색", "personal_color", ["불투명한 파스텔 톤이나 주황색계열"]),
+    ("봄 웜톤의 이미지", "personal_color", ["봄 색상의 기본색"]),
+    ("가을 유형 신체 색상 특징", "personal_color", ["가을 색상의 특징인 깊고"]),
+    ("따뜻한 색과 차가운 색의 구분", "personal_color", ["따뜻한 색(Warm)과 차가운 색(Cool)의 특징"]),
+    ("여름 쿨톤 피부와 머리카락 특징", "personal_color", ["여름 색상의 특징인 희고"]),
+]
+
+
+def load_chunks():
+    chunks = {}
+    for name, pattern in CORPUS_FILES.items():
+        chunks[name] = [c.text for path in sorted(glob.glob(pattern)) for c in iter_chunks(path)]
+    return chunks
+
+
+def rank_of(ids, chunks, markers):
+    for rank, i in enumerate(ids, 1):
+        if any(m in chunks[i] for m in markers):
+            return rank
+    return None
+
+
+def report(label, ranks, latencies, k, extra=""):
+    hit = sum(1 for r in ranks if r is not None and r <= k) / len(ranks)
+    mrr = sum(1 / r for r in ranks if r is not None) / len(ranks)
+    print(f"  {label:<8} hit@{k} {hit:5.0%}  MRR@10 {mrr:.3f}  검색 {statistics.median(latencies) * 1e3:7.3f}ms{extra}")
+    return hit, mrr
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG 검색 방식별 품질 / 지연 비교")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--alpha", type=float, default=0.5, help="hybrid에서 벡터 점수 비중")
+    parser.add_argument("--repeat", type=int, default=50, help="지연 측정 반복 횟수")
+    parser.add_argument("--embedder", choices=EMBEDDERS, default="local", help="vector / hybrid 임베딩 백엔드")
+    parser.add_argument("--live", action="store_true", help="--embedder openai 와 같음")
+    args = parser.parse_args()
+    if args.live:
+        args.embedder = "openai"
+
+    chunks = load_chunks()
+    start = time.perf_counter()
+    lexical = {name: BM25Index(texts) for name, texts in chunks.items()}
+    build_ms = (time.perf_counter() - start) * 1e3
+    print(f"청크: {', '.join(f'{n} {len(t)}개' for n, t in chunks.items())}, "
+          f"BM25 빌드 {build_ms:.1f}ms, 색인어 {sum(ix.vocabulary_size for ix in lexical.values())}개")
+    print(f"평가 질의 {len(EVAL_SET)}개")
+
+    def timed(fn):
+        samples = []
+        for _ in range(args.repeat):
+            t = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - t)
+        return min(samples)
+
+    bm25_ranks, bm25_lat = [], []
+    for query, name, markers in EVAL_SET:
+        ids = [i for i, _ in lexical[name].search(query, 10)]
+        bm25_ranks.append(rank_of(ids, chunks[name], markers))
+        bm25_lat.append(timed(lambda: lexical[name].search(query, args.k)))
+    status = 0
+    report("bm25", bm25_ranks, bm25_lat, args.k, "  (임베딩 호출 없음)")
+    if statistics.median(bm25_lat) >= 1e-3:
+        print("  ⚠️ bm25 검색이 1ms 이상 걸렸습니다.")
+        status = 1
+
+    # 인덱스 캐시는 임시 디렉터리에 (local 백엔드는 매번 새로 계산해도 1초 미만)
+    cache_dir = tempfile.mkdtemp(prefix="bench_hybrid_") if args.embedder == "local" else None
+    if cache_dir:
+        from rag import store as rag_store
+        rag_store.RAG_CACHE_DIR = cache_dir
+    service = RagService(embedder=get_embedder(args.embedder))
+    service.load()
+    print(f"임베딩: {service.model_id}")
+    queries = [q for q, _, _ in EVAL_SET]
+    t = time.perf_counter()
+    vectors = normalize_rows(service.embed(queries))
+    embed_ms = (time.perf_counter() - t) * 1e3 / len(queries)
+
+    results = {"vector": ([], []), "hybrid": ([], [])}
+    for (query, name, markers), vec in zip(EVAL_SET, vectors):
+        index = service.get_index(name)
+        if index.chunks != chunks[name]:
+            print(f"⚠️ {name} 인덱스 청크가 현재 코퍼스와 다릅니다 (캐시가 오래됨).")
+        dense_search = lambda: top_k_rows((index.matrix @ vec).reshape(1, -1), 10)[0][0]  # noqa: E731
+        hybrid_search = lambda: top_k_rows(  # noqa: E731
+            fuse_scores(lexical[name].scores(query), index.matrix @ vec, args.alpha).reshape(1, -1), 10)[0][0]
+        for mode, fn in (("vector", dense_search), ("hybrid", hybrid_search)):
+            results[mode][0].append(rank_of(list(fn()), index.chunks, markers))
+            results[mode][1].append(timed(fn))
+    extra = f"  + 쿼리 임베딩 {embed_ms:.0f}ms"
+    report("vector", *results["vector"], args.k, extra)
+    hybrid_hit, _ = report("hybrid", *results["hybrid"], args.k, extra)
+    vector_hit = sum(1 for r in results["vector"][0] if r is not None and r <= args.k) / len(EVAL_SET)
+    print("✅ PASS: hybrid hit@k ≥ vector" if hybrid_hit >= vector_hit else "❌ FAIL: hybrid가 vector보다 낮음")
+    return status or int(hybrid_hit < vector_hit)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+녹화/재생 스텁 기반 부하 테스트 (openai_stub.py)
+- OPENAI_STUB=replay로 공용 OpenAI 클라이언트에 재생 transport를 끼우고 실제 라우터를 그대로 호출
+  /api/survey/submit?fresh=true (분석 캐시 우회) 와 /api/chatbot/analyze 를 --concurrency 개씩 동시에 보낸다.
+- 녹화 파일을 주지 않으면 실제 system 프롬프트로 설문/챗봇 응답 녹화를 만들어 임시 파일에 넣고 재생
+  (--recordings 로 OPENAI_STUB=record 로 모은 실제 녹화를 재생할 수 있음)
+- 지연 분포 / 429 / 타임아웃 비율과 --seed 가 같으면 매 실행 같은 장애 순서가 재현된다.
+- 지표: 처리량, 엔드포인트별 p50/p95/p99, 상태 코드, 설문 결과 source(llm/catalog), 스텁 통계, 마감 초과 통계
+- DB는 임시 SQLite 파일, 임베딩은 스텁이 로컬 해시 임베딩으로 합성하므로 네트워크/API 키 없이 실행된다.
+
+사용법: python benchmarks/bench_load_replay.py [--requests 200] [--concurrency 32]
+        [--latency "chat=lognormal:1.0,0.5;embeddings=const:0.05"] [--rate-429 0.05] [--rate-timeout 0.02]
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+from collections import Counter
+from types import SimpleNamespace
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="녹화/재생 스텁 기반 부하 테스트")
+    parser.add_argument("--requests", type=int, default=200, help="전체 요청 수")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 요청 수")
+    parser.add_argument("--chatbot-ratio", type=float, default=0.3, help="챗봇 요청 비율 (나머지는 설문 제출)")
+    parser.add_argument("--latency", default="chat=lognormal:1.0,0.5;embeddings=const:0.05",
+                        help="OPENAI_STUB_LATENCY 형식의 지연 분포")
+    parser.add_argument("--rate-429", type=float, default=0.05)
+    parser.add_argument("--rate-timeout", type=float, default=0.02)
+    parser.add_argument("--timeout-after", type=float, default=3.0, help="타임아웃 장애 시 멈추는 시간(초)")
+    parser.add_argument("--deadline", type=float, default=None, help="ANALYSIS_DEADLINE 덮어쓰기(초)")
+    parser.add_argument("--recordings", default=None, help="재생할 녹화 파일 (없으면 합성 녹화)")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+args = parse_args()
+
+_tmp_dir = tempfile.mkdtemp(prefix="bench_replay_")
+os.environ["DB_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ["RAG_CACHE_DIR"] = os.path.join(_tmp_dir, "rag_cache")
+os.environ["OPENAI_STUB"] = "replay"
+os.environ["OPENAI_STUB_PATH"] = args.recordings or os.path.join(_tmp_dir, "recordings.jsonl")
+os.environ["OPENAI_STUB_LATENCY"] = args.latency
+os.environ["OPENAI_STUB_429_RATE"] = str(args.rate_429)
+os.environ["OPENAI_STUB_TIMEOUT_RATE"] = str(args.rate_timeout)
+os.environ["OPENAI_STUB_TIMEOUT_AFTER"] = str(args.timeout_after)
+os.environ["OPENAI_STUB_SEED"] = str(args.seed)
+os.environ["OPENAI_WARMUP"] = "false"
+os.environ.pop("OPENAI_API_KEY", None)  # 실제 API로 나가지 않도록 키 제거 (재생 모드는 키 불필요)
+os.environ.setdefault("SECRET_KEY", "bench-secret")
+if args.deadline is not None:
+    os.environ["ANALYSIS_DEADLINE"] = str(args.deadline)
+
+import httpx  # noqa: E402
+
+import main  # noqa: E402
+import models  # noqa: E402
+import schemas  # noqa: E402
+import openai_stub  # noqa: E402
+from database import Base, engine, SessionLocal  # noqa: E402
+from routers import chatbot_router, survey_router, user_router  # noqa: E402
+from services.color import SEASON_SWATCHES  # noqa: E402
+from services.scoring import QUESTION_OPTION_LABELS, SEASONS  # noqa: E402
+
+SUB_TONES = {"spring": "봄", "summer": "여름", "autumn": "가을", "winter": "겨울"}
+CHAT_PATH = "/v1/chat/completions"
+
+
+def random_answers(rng: random.Random) -> list:
+    answers = []
+    for qid, options in QUESTION_OPTION_LABELS.items():
+        oid = rng.choice(list(options))
+        answers.append({"question_id": qid, "option_id": oid, "option_label": options[oid]})
+    return answers
+
+
+def completion(content: dict) -> str:
+    return json.dumps({
+        "id": "chatcmpl-bench", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": json.dumps(content, ensure_ascii=False)}}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }, ensure_ascii=False)
+
+
+def seed_recordings(rng: random.Random, user) -> int:
+    """실제 system 프롬프트로 계절별 설문/챗봇 응답 녹화 (모양 키로 매칭되어 순환 재생)"""
+    recordings = openai_stub.get_recordings()
+    answers = [schemas.SurveyAnswerCreate(**a) for a in random_answers(rng)]
+    survey_system = survey_router.build_analysis_prompts(answers)[0]
+    db = SessionLocal()
+    try:
+        request = chatbot_router.ChatbotRequest(answers=["녹화용 질문"])
+        chatbot_system = chatbot_router.build_chatbot_messages(request, user, db)[0]["content"]
+    finally:
+        db.close()
+    for tone in SEASONS:
+        others = [s for s in SEASONS if s != tone]
+        survey = {
+            "result_tone": tone, "confidence": 80, "total_score": 85,
+            "detailed_analysis": f"부하 테스트용 {SUB_TONES[tone]} 타입 분석 결과입니다.",
+            "ranking": [{"type": t, "score": 85 - i * 15, "description": f"{SUB_TONES[t]} 타입 설명",
+                         "palette": list(SEASON_SWATCHES[t][5:8])}
+                        for i, t in enumerate([tone] + others[:2])],
+        }
+        recordings.add(CHAT_PATH, {"model": "gpt-4o-mini", "messages": [{"role": "system", "content": survey_system}]},
+                       200, "application/json", completion(survey))
+        chatbot = {
+            "primary_tone": "웜" if tone in ("spring", "autumn") else "쿨", "sub_tone": SUB_TONES[tone],
+            "description": f"부하 테스트용 {SUB_TONES[tone]} 타입 설명입니다.",
+            "recommendations": ["코랄", "베이지", "카키"],
+        }
+        recordings.add(CHAT_PATH, {"model": "gpt-4o-mini", "messages": [{"role": "system", "content": chatbot_system}]},
+                       200, "application/json", completion(chatbot))
+    return len(recordings.entries)
+
+
+async def fire(plan: list, concurrency: int, rng: random.Random) -> tuple:
+    results = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+
+        async def one(kind: str, payload: dict):
+            async with semaphore:
+                start = time.perf_counter()
+                if kind == "survey":
+                    r = await client.post("/api/survey/submit?fresh=true", json=payload)
+                else:
+                    r = await client.post("/api/chatbot/analyze", json=payload)
+                elapsed = time.perf_counter() - start
+            source = r.json().get("source") if kind == "survey" and r.status_code == 201 else None
+            results.append((kind, r.status_code, elapsed, source))
+
+        payloads = [(kind, {"answers": random_answers(rng)} if kind == "survey"
+                     else {"answers": [rng.choice(["웜톤인 것 같아요", "쿨톤 추천해주세요", "가을 코디 알려주세요"])]})
+                    for kind in plan]
+        start = time.perf_counter()
+        await asyncio.gather(*[one(kind, payload) for kind, payload in payloads])
+        total = time.perf_counter() - start
+    return results, total
+
+
+def main_bench():
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = models.User(username="bench", nickname="bench", password="-", email="bench@example.com")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+    bench_user = SimpleNamespace(id=user_id, username="bench", is_active=True)
+    main.app.dependency_overrides[user_router.get_current_user] = lambda: bench_user
+
+    if args.recordings:
+        print(f"녹화 파일: {args.recordings} ({len(openai_stub.get_recordings().entries)}건)")
+    else:
+        print(f"합성 녹화 {seed_recordings(rng, bench_user)}건")
+
+    plan = ["chatbot" if rng.random() < args.chatbot_ratio else "survey" for _ in range(args.requests)]
+    results, total = asyncio.run(fire(plan, args.concurrency, rng))
+
+    print(f"요청 {len(results)}개, 동시 {args.concurrency}, 지연 {args.latency}, "
+          f"429 {args.rate_429:.0%}, 타임아웃 {args.rate_timeout:.0%}")
+    print(f"전체 {total:.2f}s, 처리량 {len(results) / total:.1f} req/s")
+    print(f"{'endpoint':>8} | {'n':>4} | {'p50':>7} | {'p95':>7} | {'p99':>7} | status")
+    print("-" * 64)
+    for kind in ("survey", "chatbot"):
+        rows = [r for r in results if r[0] == kind]
+        if not rows:
+            continue
+        p50, p95, p99 = np.percentile([r[2] for r in rows], [50, 95, 99])
+        statuses = dict(Counter(r[1] for r in rows))
+        print(f"{kind:>8} | {len(rows):4d} | {p50:6.2f}s | {p95:6.2f}s | {p99:6.2f}s | {statuses}")
+    print(f"설문 source: {dict(Counter(r[3] for r in results if r[0] == 'survey' and r[3]))}")
+    print(f"스텁: {openai_stub.stub_stats()}")
+    print(f"마감 초과: {dict(survey_router.degrade_stats)}")
+
+    failed = [r for r in results if r[1] >= 500 and r[0] == "survey"]
+    ok = not failed
+    print("✅ PASS: 설문 제출은 OpenAI 장애 중에도 모두 응답함" if ok
+          else f"❌ FAIL: 설문 제출 5xx {len(failed)}건")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_bench())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+임베딩 저장 형식별 메모리 / 재현율 비교 (rag.quantize)
+- 형식: float32 (기준) / float16 / int8, 그리고 차원 축소(앞쪽 d차원만 남기고 재정규화)와의 조합
+- 지표: 벡터당 바이트, 행렬 메모리, recall@k (float32 전체 차원 전수 검색 top-k 대비), 쿼리당 검색 시간
+- 합성 데이터: 군집 구조 + 차원별 분산이 뒤로 갈수록 줄어드는 벡터
+  (text-embedding-3 계열의 dimensions 파라미터는 앞쪽 차원을 잘라 재정규화하는 방식이라 이를 흉내 냄)
+- --corpus 를 주면 실제 코퍼스 청크/평가 질의를 --embedder 로 전체 차원과 --dims 차원으로 각각 임베딩해 비교
+  local (기본): 해시 임베딩, 네트워크 없음 / openai: OPENAI_API_KEY 필요, 코퍼스 임베딩 과금 발생
+  (--live 는 --corpus --embedder openai 와 같음)
+
+사용법: python benchmarks/bench_quantization.py [--size 100000] [--dim 1536] [--dims 512 256] [--corpus] [--live]
+"""
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from rag.embedding import EMBEDDERS, get_embedder  # noqa: E402
+from rag.index import VectorIndex, normalize_rows  # noqa: E402
+from rag.quantize import STORAGE_DTYPES  # noqa: E402
+
+
+def synthetic(size, dim, clusters, noise, decay, rng):
+    spectrum = (1.0 + np.arange(dim, dtype=np.float32)) ** -decay
+    centers = rng.standard_normal((clusters, dim)).astype(np.float32) * spectrum
+    labels = rng.integers(0, clusters, size)
+    matrix = np.empty((size, dim), dtype=np.float32)
+    for start in range(0, size, 50_000):
+        block = labels[start:start + 50_000]
+        matrix[start:start + len(block)] = (centers[block]
+                                            + noise * rng.standard_normal((len(block), dim)).astype(np.float32) * spectrum)
+    queries = centers[rng.integers(0, clusters, 200)] + noise * rng.standard_normal((200, dim)).astype(np.float32) * spectrum
+    return normalize_rows(matrix), normalize_rows(queries)
+
+
+def evaluate(matrix, queries, truth, k, dims, dtype):
+    index = VectorIndex([""] * len(matrix), normalize_rows(matrix[:, :dims]), normalized=True, dtype=dtype)
+    reduced = normalize_rows(queries[:, :dims])
+    found = index.search_batch(reduced, k)[0]
+    recall = np.mean([len(np.intersect1d(f, t)) / k for f, t in zip(found, truth)])
+    samples = []
+    for q in reduced[:50]:
+        t = time.perf_counter()
+        index.search(q, k)
+        samples.append(time.perf_counter() - t)
+    return index.nbytes, float(recall), float(np.median(samples))
+
+
+def corpus_data(embedder, dims_list):
+    from bench_hybrid_search import EVAL_SET, load_chunks
+
+    chunks = [text for texts in load_chunks().values() for text in texts]
+    queries = [q for q, _, _ in EVAL_SET]
+    full = normalize_rows(get_embedder(embedder, dimensions=None).embed(chunks + queries))
+    reduced = {d: normalize_rows(get_embedder(embedder, dimensions=d).embed(chunks + queries)) for d in dims_list}
+    return full[:len(chunks)], full[len(chunks):], {d: (m[:len(chunks)], m[len(chunks):]) for d, m in reduced.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="임베딩 저장 형식별 메모리 / 재현율 비교")
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--dims", type=int, nargs="*", default=[512, 256], help="비교할 축소 차원")
+    parser.add_argument("--clusters", type=int, default=1_000)
+    parser.add_argument("--noise", type=float, default=0.5)
+    parser.add_argument("--decay", type=float, default=0.5, help="차원별 분산 감소 지수")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--min-recall", type=float, default=0.95, help="int8 전체 차원 recall 합격선")
+    parser.add_argument("--corpus", action="store_true", help="합성 데이터 대신 실제 코퍼스 측정")
+    parser.add_argument("--embedder", choices=EMBEDDERS, default="local", help="--corpus 임베딩 백엔드")
+    parser.add_argument("--live", action="store_true", help="--corpus --embedder openai 와 같음")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.live:
+        args.corpus, args.embedder = True, "openai"
+    if args.corpus:
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        os.chdir(ROOT)
+        matrix, queries, reduced = corpus_data(args.embedder, args.dims)
+        args.k = min(args.k, len(matrix))
+        print(f"실제 코퍼스 {len(matrix)}개 청크 x {matrix.shape[1]} ({args.embedder}), "
+              f"질의 {len(queries)}개, k={args.k}")
+    else:
+        rng = np.random.default_rng(args.seed)
+        matrix, queries = synthetic(args.size, args.dim, args.clusters, args.noise, args.decay, rng)
+        reduced = {d: (matrix, queries) for d in args.dims}  # 합성 데이터는 앞쪽 d차원을 잘라 흉내 냄
+        print(f"합성 데이터 {args.size:,} x {args.dim}, 질의 {len(queries)}개, k={args.k}")
+
+    truth = VectorIndex([""] * len(matrix), matrix, normalized=True).search_batch(queries, args.k)[0]
+    full_dim = matrix.shape[1]
+    print(f"{'mode':>16} | {'bytes/vec':>9} | {'memory':>9} | {'recall@' + str(args.k):>9} | {'검색':>8}")
+    print("-" * 64)
+    results = {}
+    for dims, (data, qs) in [(full_dim, (matrix, queries))] + sorted(reduced.items(), reverse=True):
+        for dtype in STORAGE_DTYPES:
+            nbytes, recall, latency = evaluate(data, qs, truth, args.k, dims, dtype)
+            results[(dims, dtype)] = recall
+            label = dtype if dims == full_dim else f"{dtype}/{dims}d"
+            print(f"{label:>16} | {nbytes / len(matrix):9.0f} | {nbytes / 2**20:7.1f}MB | {recall:9.3f} | "
+                  f"{latency * 1e3:6.2f}ms")
+
+    int8_recall = results[(full_dim, "int8")]
+    if int8_recall < args.min_recall:
+        print(f"❌ int8 recall {int8_recall:.3f} < {args.min_recall}")
+        return 1
+    print(f"✅ int8: 메모리 약 1/4, recall {int8_recall:.3f} (float16 {results[(full_dim, 'float16')]:.3f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+벡터 검색 마이크로 벤치마크
+- 기존 구현: 청크마다 순수 파이썬 cosine_similarity + 전체 sort
+- 신규 구현: rag.index.VectorIndex (정규화 float32 행렬 곱 + argpartition)
+
+사용법: python benchmarks/bench_vector_search.py [--sizes 1000 10000 100000] [--dim 1536]
+"""
+import os
+import sys
+import time
+import argparse
+from math import sqrt
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag.index import VectorIndex  # noqa: E402
+
+
+# ---------------- 기존 구현 (비교 기준) ----------------
+def cosine_similarity(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    na = sqrt(sum(x * x for x in a)) or 1e-8
+    nb = sqrt(sum(x * x for x in b)) or 1e-8
+    return dot / (na * nb)
+
+
+def legacy_top_k(q_emb, embeddings, k):
+    sims = [(cosine_similarity(q_emb, emb), i) for i, emb in enumerate(embeddings)]
+    sims.sort(reverse=True, key=lambda x: x[0])
+    return [i for _, i in sims[:k]]
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 검색 마이크로 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--batch", type=int, default=32, help="배치 검색 쿼리 수")
+    parser.add_argument("--legacy-max", type=int, default=5_000,
+                        help="기존 구현을 직접 측정할 최대 청크 수 (초과 시 선형 추정)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"dim={args.dim}, k={args.k}, batch={args.batch}")
+    print(f"{'chunks':>8} | {'legacy(ms)':>12} | {'numpy(ms)':>10} | {'batch/q(ms)':>11} | {'speedup':>8}")
+    print("-" * 62)
+
+    legacy_per_chunk = None
+    for n in args.sizes:
+        matrix = rng.standard_normal((n, args.dim), dtype=np.float32)
+        queries = rng.standard_normal((args.batch, args.dim), dtype=np.float32)
+        index = VectorIndex(["" for _ in range(n)], matrix)
+
+        numpy_ms = timed(lambda: index.search(queries[0], args.k), repeat=5) * 1000
+        batch_ms = timed(lambda: index.search_batch(queries, args.k), repeat=3) * 1000 / args.batch
+
+        if n <= args.legacy_max:
+            embeddings = matrix.tolist()
+            q = queries[0].tolist()
+            legacy_ms = timed(lambda: legacy_top_k(q, embeddings, args.k), repeat=1) * 1000
+            legacy_per_chunk = legacy_ms / n
+            # 결과 일치 확인
+            expected = legacy_top_k(q, embeddings, args.k)
+            got = [i for i, _ in index.search(queries[0], args.k)]
+            assert expected == got, f"top-k 불일치: {expected} != {got}"
+            legacy_label = f"{legacy_ms:12.1f}"
+            del embeddings
+        elif legacy_per_chunk is not None:
+            legacy_ms = legacy_per_chunk * n
+            legacy_label = f"~{legacy_ms:11.0f}"
+        else:
+            legacy_ms = None
+            legacy_label = f"{'-':>12}"
+
+        speedup = f"{legacy_ms / numpy_ms:7.0f}x" if legacy_ms else f"{'-':>8}"
+        print(f"{n:>8} | {legacy_label} | {numpy_ms:10.2f} | {batch_ms:11.3f} | {speedup}")
+
+    print("\n~ 표시는 --legacy-max 이하 측정값에서 선형 추정한 값입니다.")
+
+
+if __name__ == "__main__":
+    main()
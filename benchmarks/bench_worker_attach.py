@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+워커 프로세스별 인덱스 로드 시간 / 메모리 비교 (rag.store mmap)
+- uvicorn --workers N 처럼 여러 프로세스가 같은 .ragidx 캐시를 여는 상황을 재현
+- 방식: copy (np.fromfile로 읽어 프로세스마다 사본) / mmap (읽기 전용 매핑, 페이지 캐시 공유)
+- 지표: 워커당 로드 시간, 첫 검색 시간, Private/Shared 메모리 (/proc/self/smaps_rollup, Linux 전용)
+  mmap이면 행렬 페이지가 Shared로 잡히고 워커가 늘어도 물리 메모리는 한 벌만 쓴다.
+
+사용법: python benchmarks/bench_worker_attach.py [--size 200000] [--dim 768] [--workers 4] [--dtype float32]
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing as mp
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rag import store as rag_store  # noqa: E402
+from rag.index import VectorIndex, normalize_rows  # noqa: E402
+from rag.quantize import STORAGE_DTYPES, QuantizedMatrix  # noqa: E402
+
+
+def memory_kb():
+    """(Private, Shared) KB (smaps_rollup이 없으면 None)"""
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None
+    kb = {k.strip(): int(v.split()[0]) for k, v in fields.items() if v.strip().endswith("kB")}
+    return (kb.get("Private_Clean", 0) + kb.get("Private_Dirty", 0),
+            kb.get("Shared_Clean", 0) + kb.get("Shared_Dirty", 0))
+
+
+def worker(cache_dir, key, dtype, use_mmap, start_event, out):
+    start_event.wait()
+    before = memory_kb()
+    t = time.perf_counter()
+    if dtype == "float32":
+        data = rag_store.load_index(key, cache_dir=cache_dir, mmap=use_mmap)
+        index = VectorIndex(data["chunks"], data["embeddings"], normalized=True)
+    else:
+        data = rag_store.load_arrays(key, cache_dir=cache_dir, mmap=use_mmap)
+        vectors = QuantizedMatrix.from_arrays(data["arrays"])
+        index = VectorIndex([""] * len(vectors), vectors)
+    load_s = time.perf_counter() - t
+    query = normalize_rows(np.random.default_rng(os.getpid()).standard_normal(index.dim).astype(np.float32))[0]
+    t = time.perf_counter()
+    index.search(query, 10)
+    search_s = time.perf_counter() - t
+    after = memory_kb()
+    delta = (after[0] - before[0], after[1] - before[1]) if before and after else None
+    out.put((load_s, search_s, delta, rag_store.is_mapped(index.vectors.data)))
+
+
+def run(cache_dir, key, dtype, use_mmap, workers):
+    ctx = mp.get_context("spawn")
+    start_event, out = ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(cache_dir, key, dtype, use_mmap, start_event, out))
+             for _ in range(workers)]
+    for p in procs:
+        p.start()
+    time.sleep(1.0)  # 인터프리터 기동 시간은 측정에서 제외
+    start_event.set()
+    results = [out.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 프로세스별 인덱스 로드 시간 / 메모리 비교")
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--dtype", choices=STORAGE_DTYPES, default="float32")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    matrix = normalize_rows(rng.standard_normal((args.size, args.dim)).astype(np.float32))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if args.dtype == "float32":
+            rag_store.save_index("bench", [f"chunk {i}" for i in range(args.size)], matrix, cache_dir=cache_dir)
+        else:
+            vectors = QuantizedMatrix.from_float(matrix, args.dtype)
+            rag_store.save_arrays("bench", vectors.to_arrays(), cache_dir=cache_dir)
+        size_mb = os.path.getsize(rag_store.index_path("bench", cache_dir)) / 2**20
+        del matrix
+        print(f"인덱스 {args.size:,} x {args.dim} {args.dtype}, 파일 {size_mb:.0f}MB, 워커 {args.workers}개")
+        print(f"{'mode':>6} | {'로드':>8} | {'첫 검색':>8} | {'Private':>9} | {'Shared':>9} | mapped")
+        print("-" * 62)
+        summary = {}
+        for use_mmap in (False, True):
+            results = run(cache_dir, "bench", args.dtype, use_mmap, args.workers)
+            label = "mmap" if use_mmap else "copy"
+            load = np.median([r[0] for r in results])
+            search = np.median([r[1] for r in results])
+            deltas = [r[2] for r in results if r[2] is not None]
+            private = np.median([d[0] for d in deltas]) / 1024 if deltas else float("nan")
+            shared = np.median([d[1] for d in deltas]) / 1024 if deltas else float("nan")
+            print(f"{label:>6} | {load * 1e3:6.1f}ms | {search * 1e3:6.1f}ms | {private:7.1f}MB | "
+                  f"{shared:7.1f}MB | {all(r[3] for r in results)}")
+            summary[label] = (load, private)
+
+    copy_private, mmap_private = summary["copy"][1], summary["mmap"][1]
+    print(f"워커 {args.workers}개 합계 Private: copy {copy_private * args.workers:.0f}MB → "
+          f"mmap {mmap_private * args.workers:.0f}MB (행렬은 페이지 캐시 {size_mb:.0f}MB 한 벌 공유)")
+    ok = summary["mmap"][0] < summary["copy"][0] and mmap_private < copy_private
+    print("✅ PASS" if ok else "❌ FAIL: mmap 로드가 더 빠르거나 메모리가 적지 않습니다.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+녹화/재생 스텁 스모크 체크 (openai_stub.py)
+- OPENAI_STUB=replay로 공용 OpenAI 클라이언트(동기/비동기)에 재생 transport를 끼우고 실제 SDK 호출이 되는지 확인
+  chat 일반 응답 / stream=true (SSE 변환) / 비동기 chat / 임베딩 합성
+- 녹화 모드: RecordTransport가 만든 응답을 SDK가 그대로 읽는지, stub_transport("record")의 실제 transport가
+  SDK가 쓰는 httpx 구현과 같은 모듈인지 확인 (네트워크 없이 재생 transport를 상류로 사용)
+- 스텁의 httpx 모듈이 SDK와 어긋나면 SDK 내부에서 AssertionError로 모든 호출이 실패하므로 부하 테스트 전에 돌릴 것
+
+사용법: python benchmarks/check_stub_replay.py
+"""
+import os
+import sys
+import json
+import asyncio
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+_tmp_dir = tempfile.mkdtemp(prefix="check_stub_")
+os.environ["OPENAI_STUB"] = "replay"
+os.environ["OPENAI_STUB_PATH"] = os.path.join(_tmp_dir, "recordings.jsonl")
+os.environ["OPENAI_STUB_LATENCY"] = "const:0"
+os.environ["OPENAI_STUB_429_RATE"] = "0"
+os.environ["OPENAI_STUB_TIMEOUT_RATE"] = "0"
+os.environ["OPENAI_WARMUP"] = "false"
+os.environ.pop("OPENAI_API_KEY", None)  # 실제 API로 나가지 않도록 키 제거
+
+from openai import OpenAI, DefaultHttpxClient  # noqa: E402
+
+import openai_stub  # noqa: E402
+from openai_client import get_openai_client, get_async_openai_client, _limits  # noqa: E402
+
+CHAT_PATH = "/v1/chat/completions"
+SYSTEM = "스텁 스모크 체크용 system 프롬프트"
+CONTENT = "재생된 응답입니다."
+
+
+def completion(content: str) -> str:
+    return json.dumps({
+        "id": "chatcmpl-smoke", "object": "chat.completion", "created": 0, "model": "gpt-4o-mini",
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+    }, ensure_ascii=False)
+
+
+def messages():
+    return [{"role": "system", "content": SYSTEM}, {"role": "user", "content": "안녕하세요"}]
+
+
+def check(name: str, ok: bool, detail: str = "") -> bool:
+    print(f"{'✅' if ok else '❌'} {name}" + (f": {detail}" if detail else ""))
+    return ok
+
+
+def run_checks() -> list:
+    results = []
+    client = get_openai_client()
+
+    response = client.chat.completions.create(model="gpt-4o-mini", messages=messages())
+    results.append(check("동기 chat 재생", response.choices[0].message.content == CONTENT))
+
+    stream = client.chat.completions.create(model="gpt-4o-mini", messages=messages(), stream=True)
+    streamed = "".join(chunk.choices[0].delta.content or "" for chunk in stream if chunk.choices)
+    results.append(check("stream=true 재생 (SSE 변환)", streamed == CONTENT, repr(streamed)))
+
+    async def async_chat():
+        response = await get_async_openai_client().chat.completions.create(model="gpt-4o-mini", messages=messages())
+        return response.choices[0].message.content
+
+    results.append(check("비동기 chat 재생", asyncio.run(async_chat()) == CONTENT))
+
+    embedding = client.embeddings.create(model="text-embedding-3-small", input=["스모크"])
+    results.append(check("임베딩 합성", len(embedding.data) == 1 and len(embedding.data[0].embedding) > 0))
+
+    # 녹화 모드: 상류를 재생 transport로 바꿔 네트워크 없이 RecordTransport의 응답 경로를 확인
+    recordings = openai_stub.Recordings(os.path.join(_tmp_dir, "recorded.jsonl"))
+    upstream = openai_stub.ReplayTransport(openai_stub.get_stub_core())
+    http_client = DefaultHttpxClient(transport=openai_stub.RecordTransport(recordings, transport=upstream))
+    recorder = OpenAI(api_key="sk-stub", http_client=http_client, max_retries=0)
+    response = recorder.chat.completions.create(model="gpt-4o-mini", messages=messages())
+    results.append(check("녹화 모드 응답", response.choices[0].message.content == CONTENT and len(recordings.entries) == 1))
+
+    sdk_module = DefaultHttpxClient.__mro__[1].__module__.split(".")[0]
+    transport = openai_stub.stub_transport("record", limits=_limits(), http2=False).transport
+    transport_module = type(transport).__module__.split(".")[0]
+    results.append(check("녹화 transport 모듈", transport_module == sdk_module, f"{transport_module} (SDK: {sdk_module})"))
+    transport.close()
+    return results
+
+
+def main():
+    openai_stub.get_recordings().add(CHAT_PATH, {"model": "gpt-4o-mini", "messages": [{"role": "system", "content": SYSTEM}]},
+                                     200, "application/json", completion(CONTENT))
+    try:
+        results = run_checks()
+    except Exception as e:
+        print(f"❌ FAIL: 스텁 호출 중 예외 {type(e).__name__}: {e}")
+        return 1
+    print(f"스텁: {openai_stub.stub_stats()}")
+    ok = all(results)
+    print("✅ PASS: 녹화/재생 스텁이 SDK 클라이언트와 함께 동작함" if ok
+          else f"❌ FAIL: {results.count(False)}개 항목 실패")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,12 @@ from contextlib import asynccontextmanager
 from routers import user_router
 from routers import chatbot_router
 from routers import survey_router
+from routers import admin_router
+from rag.service import get_rag_service
+from rag.watch import CorpusWatcher
+from services.executor import shutdown_executor
+from services.jobs import job_queue
+from openai_client import warm_up_all, close_clients
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -20,11 +26,29 @@ async def lifespan(app: FastAPI):
     # 시작 시 실행되는 코드
     logger.info("🚀 퍼스널컬러 진단 서버가 시작됩니다...")
     logger.info("💡 데이터베이스 설정이 필요하면 'alembic upgrade head'를 실행하세요.")
+
+    # RAG 인덱스 로드 (디스크 캐시가 있으면 임베딩 호출 없이 로드됨)
+    rag_service = get_rag_service()
+    rag_service.load()
+
+    # 코퍼스 파일 감시 (RAG_WATCH_INTERVAL > 0일 때만, 변경 시 증분 재빌드 + 무중단 교체)
+    corpus_watcher = CorpusWatcher(rag_service)
+    await corpus_watcher.start()
+
+    # OpenAI 커넥션 풀 워밍업 (첫 사용자 요청의 TLS 핸드셰이크 비용 제거)
+    await warm_up_all()
+
+    # 설문 분석 작업 큐 워커 시작
+    await job_queue.start()
     
     yield  # 여기서 애플리케이션이 실행됨
     
     # 종료 시 실행되는 코드 (필요한 경우)
     logger.info("🔚 퍼스널컬러 진단 서버가 종료됩니다...")
+    await corpus_watcher.stop()
+    await job_queue.stop()
+    shutdown_executor()
+    await close_clients()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -60,3 +84,4 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 app.include_router(user_router.router)
 app.include_router(chatbot_router.router)
 app.include_router(survey_router.router)
+app.include_router(admin_router.router)
@@ -2,6 +2,7 @@ from sqlalchemy import Column, Integer, String, DateTime, Enum, Boolean, Float,
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from database import Base
+from services.scoring import option_score_map
 
 class User(Base):
     __tablename__ = "user"
@@ -44,3 +45,8 @@ class SurveyAnswer(Base):
     option_id = Column(String(50))
     option_label = Column(String(255))
     result = relationship("SurveyResult", back_populates="answers")
+
+    @property
+    def score_map(self):
+        """선택지의 계절별 가중치 (규칙 기반 점수 엔진에서 계산, DB 컬럼 아님)"""
+        return option_score_map(self.question_id, self.option_id)
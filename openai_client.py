@@ -0,0 +1,147 @@
+import os
+import asyncio
+import logging
+import threading
+import functools
+import importlib
+import importlib.util
+from typing import Optional
+
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Limits/Timeout/transport는 openai SDK 클라이언트가 쓰는 httpx 구현과 같은 모듈로 만들어야 한다
+# (배포판에 따라 httpx 대신 호환 포크를 씀, openai_stub도 이 모듈을 사용)
+httpx = importlib.import_module(DefaultHttpxClient.__mro__[1].__module__.split(".")[0])
+
+# 로깅 설정
+logger = logging.getLogger(__name__)
+
+# 커넥션 풀 / 타임아웃 설정 (환경 변수로 조정 가능)
+OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "100"))
+OPENAI_MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "20"))
+OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "60"))
+# HTTP/2는 선택 사항 (h2 패키지가 requirements에 없으므로 기본 꺼짐, pip install "httpx[http2]" 후 켤 것)
+OPENAI_HTTP2 = os.getenv("OPENAI_HTTP2", "false").lower() in ("1", "true", "yes")
+OPENAI_CONNECT_TIMEOUT = float(os.getenv("OPENAI_CONNECT_TIMEOUT", "5"))
+OPENAI_READ_TIMEOUT = float(os.getenv("OPENAI_READ_TIMEOUT", "60"))
+OPENAI_WRITE_TIMEOUT = float(os.getenv("OPENAI_WRITE_TIMEOUT", "10"))
+OPENAI_POOL_TIMEOUT = float(os.getenv("OPENAI_POOL_TIMEOUT", "10"))
+OPENAI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", "2"))
+OPENAI_WARMUP = os.getenv("OPENAI_WARMUP", "true").lower() in ("1", "true", "yes")
+# 녹화/재생 스텁 (openai_stub.py): replay면 실제 API 대신 녹화 응답, record면 실제 응답을 녹화
+OPENAI_STUB = os.getenv("OPENAI_STUB", "").lower()
+
+_client: Optional[OpenAI] = None
+_async_client: Optional[AsyncOpenAI] = None
+_lock = threading.Lock()
+
+
+def _api_key() -> str:
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key and OPENAI_STUB == "replay":
+        return "sk-stub"  # 재생 모드는 실제 API를 호출하지 않음
+    if not api_key:
+        raise RuntimeError("환경변수 OPENAI_API_KEY가 설정되지 않았습니다.")
+    return api_key
+
+
+@functools.lru_cache(maxsize=None)
+def _http2_enabled() -> bool:
+    # HTTP/2는 h2 패키지가 있어야 사용 가능 (pip install "httpx[http2]")
+    if OPENAI_HTTP2 and importlib.util.find_spec("h2") is None:
+        logger.warning("⚠️ OPENAI_HTTP2=true 이지만 h2 패키지가 없어 OpenAI 연결은 HTTP/1.1을 사용합니다.")
+        return False
+    return OPENAI_HTTP2
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+        keepalive_expiry=OPENAI_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(
+        connect=OPENAI_CONNECT_TIMEOUT,
+        read=OPENAI_READ_TIMEOUT,
+        write=OPENAI_WRITE_TIMEOUT,
+        pool=OPENAI_POOL_TIMEOUT,
+    )
+
+
+def _stub_transport(is_async: bool):
+    """OPENAI_STUB 설정 시 스텁 transport (아니면 None → httpx 기본 transport)"""
+    if not OPENAI_STUB:
+        return None
+    from openai_stub import stub_transport
+    logger.info(f"📼 OpenAI 스텁 사용: {OPENAI_STUB}")
+    return stub_transport(OPENAI_STUB, limits=_limits(), http2=_http2_enabled(), is_async=is_async)
+
+
+def get_openai_client() -> OpenAI:
+    """프로세스 공용 동기 OpenAI 클라이언트 (하나의 커넥션 풀을 공유)"""
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                http_client = DefaultHttpxClient(limits=_limits(), timeout=_timeout(), http2=_http2_enabled(),
+                                                 transport=_stub_transport(is_async=False))
+                _client = OpenAI(api_key=_api_key(), http_client=http_client,
+                                 timeout=_timeout(), max_retries=OPENAI_MAX_RETRIES)
+    return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """프로세스 공용 비동기 OpenAI 클라이언트"""
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                http_client = DefaultAsyncHttpxClient(limits=_limits(), timeout=_timeout(), http2=_http2_enabled(),
+                                                      transport=_stub_transport(is_async=True))
+                _async_client = AsyncOpenAI(api_key=_api_key(), http_client=http_client,
+                                            timeout=_timeout(), max_retries=OPENAI_MAX_RETRIES)
+    return _async_client
+
+
+def warm_up() -> None:
+    """동기 클라이언트 커넥션 미리 열기 (첫 요청의 TLS 핸드셰이크 비용 제거)"""
+    if not OPENAI_WARMUP:
+        return
+    try:
+        get_openai_client().with_options(max_retries=0, timeout=OPENAI_CONNECT_TIMEOUT * 2).models.list()
+        logger.info("🔥 OpenAI 커넥션 워밍업 완료")
+    except Exception as e:
+        logger.warning(f"⚠️ OpenAI 커넥션 워밍업 실패 (첫 요청에서 다시 연결): {e}")
+
+
+async def async_warm_up() -> None:
+    """비동기 클라이언트 커넥션 미리 열기"""
+    if not OPENAI_WARMUP:
+        return
+    try:
+        await get_async_openai_client().with_options(max_retries=0, timeout=OPENAI_CONNECT_TIMEOUT * 2).models.list()
+        logger.info("🔥 OpenAI(async) 커넥션 워밍업 완료")
+    except Exception as e:
+        logger.warning(f"⚠️ OpenAI(async) 커넥션 워밍업 실패 (첫 요청에서 다시 연결): {e}")
+
+
+async def warm_up_all() -> None:
+    """lifespan 시작 시 동기/비동기 클라이언트를 동시에 워밍업"""
+    await asyncio.gather(asyncio.to_thread(warm_up), async_warm_up())
+
+
+async def close_clients() -> None:
+    """lifespan 종료 시 커넥션 풀 정리"""
+    global _client, _async_client
+    if _client is not None:
+        _client.close()
+        _client = None
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
@@ -0,0 +1,354 @@
+# openai_stub.py
+#
+# OpenAI API 녹화/재생 스텁 (httpx transport)
+# - openai_client의 공용 클라이언트에 transport로 끼워 넣으므로 라우터 코드는 바뀌지 않고 그대로 실행된다.
+#   OPENAI_STUB=replay: 녹화 파일(JSONL)의 응답을 돌려줌 (실제 API 호출 없음, API 키 불필요)
+#   OPENAI_STUB=record: 실제 OpenAI로 보내고 응답을 녹화 파일에 추가
+# - 재생 매칭: 요청 본문이 같은 녹화 → (chat) 모델 + system 프롬프트가 같은 녹화를 순환 → (chat) 같은 경로의 녹화를 순환
+#   녹화가 없으면 임베딩은 로컬 해시 임베딩으로, 모델 목록은 고정 응답으로 합성하고 나머지는 404
+#   stream=true 요청에 일반 JSON 녹화가 걸리면 SSE 청크로 바꿔 보낸다.
+# - 지연: OPENAI_STUB_LATENCY 분포에서 뽑아 대기 (재생 모드만)
+#   예: "lognormal:1.2,0.4" (중앙값 1.2초) / "chat=uniform:0.5,2;embeddings=const:0.05" (경로 종류별)
+#   분포: const:v / uniform:lo,hi / normal:mu,sigma / lognormal:median,sigma / exp:mean
+# - 장애 주입: OPENAI_STUB_429_RATE 확률로 429 (Retry-After 포함), OPENAI_STUB_TIMEOUT_RATE 확률로 읽기 타임아웃
+#   타임아웃은 OPENAI_STUB_TIMEOUT_AFTER 초(기본: 요청의 read 타임아웃) 동안 멈춘 뒤 httpx.ReadTimeout
+
+import os
+import json
+import math
+import time
+import base64
+import random
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# transport/응답 객체는 openai SDK가 쓰는 httpx 구현과 같은 모듈로 만들어야 한다 (openai_client에서 찾은 모듈)
+from openai_client import httpx
+
+logger = logging.getLogger(__name__)
+
+OPENAI_STUB = os.getenv("OPENAI_STUB", "").lower()  # "" / replay / record
+OPENAI_STUB_PATH = os.getenv("OPENAI_STUB_PATH", os.path.join(".openai_stub", "recordings.jsonl"))
+OPENAI_STUB_LATENCY = os.getenv("OPENAI_STUB_LATENCY", "const:0")
+OPENAI_STUB_429_RATE = float(os.getenv("OPENAI_STUB_429_RATE", "0"))
+OPENAI_STUB_TIMEOUT_RATE = float(os.getenv("OPENAI_STUB_TIMEOUT_RATE", "0"))
+OPENAI_STUB_TIMEOUT_AFTER = float(os.getenv("OPENAI_STUB_TIMEOUT_AFTER", "0"))  # 0이면 요청의 read 타임아웃
+OPENAI_STUB_RETRY_AFTER = float(os.getenv("OPENAI_STUB_RETRY_AFTER", "1"))  # 429 응답의 Retry-After(초)
+OPENAI_STUB_SEED = os.getenv("OPENAI_STUB_SEED")  # 지정하면 지연/장애가 실행마다 같은 순서로 발생
+
+STUB_MODES = ("replay", "record")
+STUB_EMBEDDING_DIM = 1536  # 합성 임베딩 기본 차원 (요청에 dimensions가 있으면 그 값)
+
+Sampler = Callable[[random.Random], float]
+
+
+def parse_distribution(spec: str) -> Sampler:
+    """"lognormal:1.2,0.4" 같은 분포 문자열 → rng를 받아 초 단위 값을 뽑는 함수"""
+    name, _, params = spec.strip().partition(":")
+    args = [float(x) for x in params.split(",") if x.strip()]
+    try:
+        if name == "const":
+            value = args[0] if args else 0.0
+            return lambda rng: value
+        if name == "uniform":
+            low, high = args
+            return lambda rng: rng.uniform(low, high)
+        if name == "normal":
+            mu, sigma = args
+            return lambda rng: max(0.0, rng.gauss(mu, sigma))
+        if name == "lognormal":
+            median, sigma = args
+            return lambda rng: rng.lognormvariate(math.log(median), sigma)
+        if name == "exp":
+            (mean,) = args
+            return lambda rng: rng.expovariate(1.0 / mean)
+    except ValueError:
+        pass
+    raise ValueError(f"지연 분포 형식이 잘못되었습니다: {spec}")
+
+
+def parse_latency(spec: str) -> Dict[str, Sampler]:
+    """"chat=...;embeddings=..." → {경로 종류: 분포}, 종류 없이 하나만 주면 모든 경로에 적용("*")"""
+    samplers: Dict[str, Sampler] = {}
+    for part in filter(None, (p.strip() for p in spec.split(";"))):
+        kind, sep, dist = part.partition("=")
+        if sep:
+            samplers[kind.strip()] = parse_distribution(dist)
+        else:
+            samplers["*"] = parse_distribution(part)
+    return samplers
+
+
+def endpoint_kind(path: str) -> str:
+    if path.endswith("/chat/completions"):
+        return "chat"
+    if path.endswith("/embeddings"):
+        return "embeddings"
+    return "other"
+
+
+def _digest(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def request_keys(path: str, body: Dict[str, Any]) -> Tuple[str, str]:
+    """(본문 전체 키, 모양 키) - 모양 키는 chat이면 모델 + system 프롬프트, 그 외는 모델 + 차원"""
+    exact = _digest([path, body])
+    if endpoint_kind(path) == "chat":
+        system = next((m.get("content") for m in body.get("messages", []) if m.get("role") == "system"), None)
+        shape = _digest([path, body.get("model"), system])
+    else:
+        shape = _digest([path, body.get("model"), body.get("dimensions")])
+    return exact, shape
+
+
+class Recordings:
+    """녹화 파일 (JSONL, 한 줄에 요청 키 + 응답 한 건)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: List[Dict[str, Any]] = []
+        self._by_key: Dict[str, List[Dict[str, Any]]] = {}
+        self._turn: Counter = Counter()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        self._index(json.loads(line))
+        logger.info(f"📼 OpenAI 녹화 {len(self.entries)}건 로드: {path}")
+
+    def _index(self, entry: Dict[str, Any]) -> None:
+        self.entries.append(entry)
+        for key in (entry["key"], entry["shape"], entry["path"]):
+            self._by_key.setdefault(key, []).append(entry)
+
+    def add(self, path: str, body: Dict[str, Any], status: int, content_type: str, text: str) -> Dict[str, Any]:
+        """응답 한 건 녹화 (파일 끝에 추가)"""
+        exact, shape = request_keys(path, body)
+        entry = {"path": path, "key": exact, "shape": shape, "stream": bool(body.get("stream")),
+                 "status": status, "content_type": content_type, "body": text}
+        with self._lock:
+            self._index(entry)
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry
+
+    def find(self, path: str, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """요청에 맞는 녹화 (일반 요청에는 SSE 녹화를 쓰지 않음)"""
+        exact, shape = request_keys(path, body)
+        keys = (exact, shape, path) if endpoint_kind(path) == "chat" else (exact,)
+        stream = bool(body.get("stream"))
+        with self._lock:
+            for key in keys:
+                candidates = [e for e in self._by_key.get(key, ()) if stream or not e["stream"]]
+                if candidates:
+                    turn = self._turn[key]
+                    self._turn[key] += 1
+                    return candidates[turn % len(candidates)]
+        return None
+
+
+def completion_to_sse(completion: Dict[str, Any], piece: int = 20) -> str:
+    """chat.completion JSON → 같은 내용의 chat.completion.chunk SSE 본문"""
+    content = completion["choices"][0]["message"].get("content") or ""
+    base = {"id": completion.get("id", "chatcmpl-stub"), "object": "chat.completion.chunk",
+            "created": completion.get("created", 0), "model": completion.get("model", "")}
+    deltas = [{"role": "assistant", "content": ""}] + [{"content": content[i:i + piece]}
+                                                       for i in range(0, len(content), piece)]
+    events = [dict(base, choices=[{"index": 0, "delta": d, "finish_reason": None}]) for d in deltas]
+    events.append(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+    return "".join(f"data: {json.dumps(e, ensure_ascii=False)}\n\n" for e in events) + "data: [DONE]\n\n"
+
+
+def synthesize_embeddings(body: Dict[str, Any]) -> Dict[str, Any]:
+    """녹화가 없는 임베딩 요청 → 로컬 해시 임베딩 응답 (같은 입력이면 항상 같은 벡터)"""
+    from rag.embedding import HashingEmbedder
+
+    inputs = body.get("input", [])
+    inputs = [inputs] if isinstance(inputs, str) else list(inputs)
+    vectors = HashingEmbedder(body.get("dimensions") or STUB_EMBEDDING_DIM).embed([str(x) for x in inputs])
+    data = []
+    for i, vec in enumerate(vectors):
+        embedding = (base64.b64encode(vec.astype("<f4").tobytes()).decode("ascii")
+                     if body.get("encoding_format") == "base64" else vec.tolist())
+        data.append({"object": "embedding", "index": i, "embedding": embedding})
+    tokens = sum(len(str(x)) for x in inputs)
+    return {"object": "list", "data": data, "model": body.get("model", ""),
+            "usage": {"prompt_tokens": tokens, "total_tokens": tokens}}
+
+
+def _error_body(message: str, kind: str, code: Optional[str] = None) -> Dict[str, Any]:
+    return {"error": {"message": message, "type": kind, "param": None, "code": code}}
+
+
+class StubCore:
+    """녹화 파일 + 지연/장애 설정 + 통계 (동기/비동기 transport가 공유)"""
+
+    def __init__(self, recordings: Recordings, latency: str = OPENAI_STUB_LATENCY,
+                 rate_429: float = OPENAI_STUB_429_RATE, rate_timeout: float = OPENAI_STUB_TIMEOUT_RATE,
+                 timeout_after: float = OPENAI_STUB_TIMEOUT_AFTER, retry_after: float = OPENAI_STUB_RETRY_AFTER,
+                 seed: Optional[int] = None):
+        self.recordings = recordings
+        self.latency = parse_latency(latency)
+        self.rate_429 = rate_429
+        self.rate_timeout = rate_timeout
+        self.timeout_after = timeout_after
+        self.retry_after = retry_after
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def plan(self, request: httpx.Request) -> Tuple[float, Optional[str]]:
+        """요청 하나의 (지연 초, 장애 종류: None / "429" / "timeout")"""
+        kind = endpoint_kind(request.url.path)
+        sampler = self.latency.get(kind) or self.latency.get("*")
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._rng.random()
+            delay = sampler(self._rng) if sampler else 0.0
+            if roll < self.rate_timeout:
+                self.stats["timeouts"] += 1
+                timeout = request.extensions.get("timeout", {}).get("read") or 60.0
+                return (self.timeout_after or timeout), "timeout"
+            if roll < self.rate_timeout + self.rate_429:
+                self.stats["rate_limited"] += 1
+                return delay, "429"
+        return delay, None
+
+    def respond(self, request: httpx.Request, fault: Optional[str]) -> httpx.Response:
+        if fault == "timeout":
+            raise httpx.ReadTimeout("OpenAI 스텁 타임아웃", request=request)
+        if fault == "429":
+            return httpx.Response(429, headers={"retry-after": str(self.retry_after)}, request=request,
+                                  json=_error_body("Rate limit reached (stub)", "requests", "rate_limit_exceeded"))
+        path = request.url.path
+        body = json.loads(request.content or b"{}") if request.method == "POST" else {}
+        entry = self.recordings.find(path, body)
+        if entry is not None:
+            self._count("replayed")
+            text, content_type = entry["body"], entry["content_type"]
+            if body.get("stream") and not entry["stream"] and entry["status"] == 200:
+                text, content_type = completion_to_sse(json.loads(text)), "text/event-stream"
+            return httpx.Response(entry["status"], headers={"content-type": content_type},
+                                  content=text.encode("utf-8"), request=request)
+        kind = endpoint_kind(path)
+        if kind == "embeddings":
+            self._count("synthesized")
+            return httpx.Response(200, json=synthesize_embeddings(body), request=request)
+        if request.method == "GET" and path.endswith("/models"):
+            return httpx.Response(200, request=request, json={
+                "object": "list", "data": [{"id": "gpt-4o-mini", "object": "model", "created": 0, "owned_by": "stub"}]})
+        self._count("missing")
+        logger.warning(f"⚠️ OpenAI 스텁: 녹화된 응답이 없습니다 ({request.method} {path})")
+        return httpx.Response(404, request=request,
+                              json=_error_body(f"녹화된 응답이 없습니다: {path}", "invalid_request_error", "stub_missing"))
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+
+class ReplayTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """녹화 재생 transport (동기: time.sleep, 비동기: asyncio.sleep로 지연)"""
+
+    def __init__(self, core: StubCore):
+        self.core = core
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        delay, fault = self.core.plan(request)
+        if delay > 0:
+            time.sleep(delay)
+        return self.core.respond(request, fault)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        delay, fault = self.core.plan(request)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self.core.respond(request, fault)
+
+
+class RecordTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """실제 API로 보내고 응답 본문을 녹화하는 transport"""
+
+    def __init__(self, recordings: Recordings, transport: Optional[httpx.BaseTransport] = None,
+                 async_transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.recordings = recordings
+        self.transport = transport
+        self.async_transport = async_transport
+
+    def _record(self, request: httpx.Request, response: httpx.Response) -> httpx.Response:
+        body = json.loads(request.content or b"{}") if request.method == "POST" else {}
+        content_type = response.headers.get("content-type", "application/json")
+        if request.method == "POST":
+            self.recordings.add(request.url.path, body, response.status_code, content_type, response.text)
+        # 이미 디코딩한 본문으로 새 응답을 만듦 (content-encoding 헤더는 빼야 다시 풀지 않음)
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in ("content-encoding", "content-length")}
+        return httpx.Response(response.status_code, headers=headers, content=response.content, request=request)
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.transport.handle_request(request)
+        response.read()
+        return self._record(request, response)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.async_transport.handle_async_request(request)
+        await response.aread()
+        return self._record(request, response)
+
+    def close(self) -> None:
+        if self.transport is not None:
+            self.transport.close()
+
+    async def aclose(self) -> None:
+        if self.async_transport is not None:
+            await self.async_transport.aclose()
+
+
+_core: Optional[StubCore] = None
+_recordings: Optional[Recordings] = None
+_lock = threading.Lock()
+
+
+def get_recordings() -> Recordings:
+    global _recordings
+    if _recordings is None:
+        with _lock:
+            if _recordings is None:
+                _recordings = Recordings(OPENAI_STUB_PATH)
+    return _recordings
+
+
+def get_stub_core() -> StubCore:
+    """프로세스 공용 재생 설정 (동기/비동기 클라이언트가 녹화 순환 순서와 통계를 공유)"""
+    global _core
+    if _core is None:
+        recordings = get_recordings()
+        with _lock:
+            if _core is None:
+                seed = int(OPENAI_STUB_SEED) if OPENAI_STUB_SEED else None
+                _core = StubCore(recordings, seed=seed)
+    return _core
+
+
+def stub_stats() -> Dict[str, int]:
+    """재생 통계 (requests / replayed / synthesized / missing / rate_limited / timeouts)"""
+    return dict(_core.stats) if _core is not None else {}
+
+
+def stub_transport(mode: str, limits: httpx.Limits, http2: bool, is_async: bool = False):
+    """openai_client에서 쓰는 transport (mode: replay / record)"""
+    if mode not in STUB_MODES:
+        raise ValueError(f"지원하지 않는 OPENAI_STUB 모드입니다: {mode}")
+    if mode == "replay":
+        return ReplayTransport(get_stub_core())
+    if is_async:
+        return RecordTransport(get_recordings(), async_transport=httpx.AsyncHTTPTransport(limits=limits, http2=http2))
+    return RecordTransport(get_recordings(), transport=httpx.HTTPTransport(limits=limits, http2=http2))
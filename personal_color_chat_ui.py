@@ -9,64 +9,19 @@ import os
 from dotenv import load_dotenv
 # .env 파일 로드
 load_dotenv()
-# 환경변수에서 API 키 가져오기
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-# OpenAI 클라이언트 초기화 시 사용
+# OpenAI 클라이언트 타입 (실제 인스턴스는 openai_client의 공용 클라이언트 사용)
 from openai import OpenAI
-client = OpenAI(api_key=OPENAI_API_KEY)
+from openai_client import get_openai_client
 import json
 import time
 import streamlit as st
 from typing import Dict, Any, Tuple, List
-from math import sqrt
 
 # ======================================================================
-# 파트 A) 공용 유틸리티 (RAG용 텍스트 분할/임베딩/검색)
+# 파트 A) 공용 RAG 검색 서비스 (rag 패키지)
 # ======================================================================
 
-def chunk_text(text: str, chunk_size: int = 800, overlap: int = 100) -> List[str]:
-    """텍스트를 일정 길이로 안전하게 분할"""
-    if overlap >= chunk_size:
-        raise ValueError("overlap은 chunk_size보다 작아야 합니다.")
-    chunks = []
-    start = 0
-    text_length = len(text)
-    while start < text_length:
-        end = min(start + chunk_size, text_length)
-        chunks.append(text[start:end])
-        if end == text_length:
-            break
-        start += (chunk_size - overlap)  # 안전한 전진
-    return [c.strip() for c in chunks if c.strip()]
-
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    """코사인 유사도 계산"""
-    dot = sum(x * y for x, y in zip(a, b))
-    na = sqrt(sum(x * x for x in a)) or 1e-8
-    nb = sqrt(sum(x * x for x in b)) or 1e-8
-    return dot / (na * nb)
-
-def embed_texts(client: OpenAI, texts: List[str], model: str = "text-embedding-3-small") -> List[List[float]]:
-    """텍스트 리스트를 임베딩 벡터로 변환"""
-    res = client.embeddings.create(model=model, input=texts)
-    return [item.embedding for item in res.data]
-
-def build_rag_index(client: OpenAI, filepath: str, chunk_size: int = 800, overlap: int = 100) -> Dict[str, Any]:
-    """RAG 인덱스 생성"""
-    with open(filepath, encoding="utf-8") as f:
-        text = f.read()
-    chunks = chunk_text(text, chunk_size=chunk_size, overlap=overlap)
-    embeddings = embed_texts(client, chunks)
-    return {"chunks": chunks, "embeddings": embeddings}
-
-def top_k_chunks(query: str, index: Dict[str, Any], client: OpenAI, k: int = 3) -> List[str]:
-    """쿼리와 가장 유사한 청크 Top-K 반환"""
-    if not index or "embeddings" not in index or "chunks" not in index:
-        return []
-    q_emb = embed_texts(client, [query])[0]
-    sims = [(cosine_similarity(q_emb, emb), i) for i, emb in enumerate(index["embeddings"])]
-    sims.sort(reverse=True, key=lambda x: x[0])
-    return [index["chunks"][i] for _, i in sims[:k]]
+from rag.service import RagService, get_rag_service
 
 # ======================================================================
 # 파트 B) 데이터/상태 클래스 및 LLM 챗봇 로직
@@ -142,16 +97,12 @@ class LLMPersonalColorChatbot:
         answers = [a.get("text", "") for a in self.collected_data.get("answers", [])]
         query = " / ".join(answers).strip() or "퍼스널컬러 진단 기준"
 
-        fixed_index = st.session_state.get("fixed_index")
-        trend_index = st.session_state.get("trend_index")
+        rag: RagService = st.session_state.get("rag_service")
+        top_k = st.session_state.get("top_k", 3)
 
-        fixed_chunks = top_k_chunks(
-            query, fixed_index, self.client, k=st.session_state.get("top_k", 3)
-        ) if fixed_index else []
-
-        trend_chunks = top_k_chunks(
-            query, trend_index, self.client, k=st.session_state.get("top_k", 3)
-        ) if trend_index else []
+        found = rag.search_texts_multi(query, {"personal_color": top_k, "beauty_trend": top_k}) if rag else {}
+        fixed_chunks = found.get("personal_color", [])
+        trend_chunks = found.get("beauty_trend", [])
 
         # ✅ 프롬프트 강화: 불변/가변 지식 구분해서 리포트에 반영하도록 지시
         prompt_system = (
@@ -234,16 +185,11 @@ if os.getenv("OPENAI_API_KEY") is None:
     st.stop()
 
 try:
-    client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    client = get_openai_client()
 except Exception as e:
     st.error(f"OpenAI 클라이언트 초기화 중 오류가 발생했습니다: {e}")
     st.stop()
 
-# 데이터 경로
-DATA_DIR = os.path.join("data", "RAG")
-FIXED_PATH = os.path.join(DATA_DIR, "personal_color_RAG.txt")
-TREND_PATH = os.path.join(DATA_DIR, "beauty_trend_2025_autumn_RAG.txt")
-
 # 세션 상태 초기화
 if "pc_chatbot" not in st.session_state:
     st.session_state.pc_chatbot = LLMPersonalColorChatbot(client=client)
@@ -273,6 +219,11 @@ with st.sidebar:
 
     st.markdown("---")
     st.subheader("RAG 옵션")
+    st.session_state.chunker = st.selectbox(
+        "Chunker", options=["structured", "window"],
+        index=["structured", "window"].index(st.session_state.get("chunker", "structured")),
+        help="structured: 제목/문단 경계 기준 분할, window: 고정 길이 + overlap 분할"
+    )
     st.session_state.chunk_size = st.number_input(
         "Chunk size", min_value=200, max_value=2000,
         value=st.session_state.get("chunk_size", 800), step=100
@@ -290,25 +241,42 @@ with st.sidebar:
     st.subheader("RAG 인덱스")
     if st.button("RAG 인덱스 생성/갱신"):
         try:
-            st.session_state.fixed_index = build_rag_index(
-                client, FIXED_PATH,
-                chunk_size=st.session_state.chunk_size,
-                overlap=st.session_state.overlap
-            )
-            st.session_state.trend_index = build_rag_index(
-                client, TREND_PATH,
-                chunk_size=st.session_state.chunk_size,
-                overlap=st.session_state.overlap
-            )
-            st.success("RAG 인덱스가 생성/갱신되었습니다.")
+            # 기본 청크 설정이면 프로세스 공용 인덱스를 재사용, 아니면 세션 전용 인덱스 생성
+            chunk_size, overlap = st.session_state.chunk_size, st.session_state.overlap
+            chunker = st.session_state.chunker
+            shared = get_rag_service(client)
+            if (chunk_size, overlap, chunker) == (shared.chunk_size, shared.overlap, shared.chunker):
+                rag_service = shared
+            else:
+                rag_service = RagService(client, chunk_size=chunk_size, overlap=overlap, chunker=chunker)
+            if rag_service.is_loaded:
+                # 이미 로드된 인덱스는 코퍼스를 다시 읽어 바뀐 청크만 재임베딩 후 교체
+                report = rag_service.reload()
+                lines = []
+                for name, r in report.items():
+                    if r.get("error"):
+                        lines.append(f"⚠️ {name}: 재빌드 오류 - {r['error']}")
+                    elif r["changed"]:
+                        lines.append(f"🔄 {name}: 청크 {r['chunks']}개 (임베딩 {r['embedded']}개, "
+                                     f"재사용 {r['reused']}개, {r['seconds']}초)")
+                    else:
+                        lines.append(f"{name}: 변경 없음 (청크 {r['chunks']}개)")
+                st.session_state.rag_status = lines
+            else:
+                rag_service.load()
+                st.session_state.rag_status = ["RAG 인덱스가 생성되었습니다."]
+            st.session_state.rag_service = rag_service
             st.rerun()
         except Exception as e:
             st.error(f"인덱스 생성 중 오류: {e}")
 
-    fixed_ready = "fixed_index" in st.session_state
-    trend_ready = "trend_index" in st.session_state
+    rag_ready = st.session_state.get("rag_service") is not None
+    fixed_ready = rag_ready and st.session_state.rag_service.has_chunks("personal_color")
+    trend_ready = rag_ready and st.session_state.rag_service.has_chunks("beauty_trend")
     st.caption(f"불변 지식 인덱스: {'✅ 준비됨' if fixed_ready else '❌ 없음'}")
     st.caption(f"가변 지식 인덱스: {'✅ 준비됨' if trend_ready else '❌ 없음'}")
+    for line in st.session_state.get("rag_status", []):
+        st.caption(line)
 
     st.markdown("---")
     st.subheader("테스트/디버그")
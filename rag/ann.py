@@ -0,0 +1,111 @@
+# rag/ann.py
+#
+# IVF(inverted file) 근사 최근접 이웃 인덱스 (NumPy)
+# - 빌드: 샘플로 구면 k-means 학습 → 모든 벡터를 가장 가까운 중심(list)에 배정
+#         list별 행 번호를 CSR(order + offsets) 형태로 저장
+# - 검색: 쿼리와 중심 유사도 상위 nprobe개 list의 후보만 정확히 채점 → top-k
+#   nprobe가 재현율/지연 조절 손잡이 (nprobe = nlist면 전수 검색과 같음)
+# - 저장/로드: rag.store 바이너리 포맷 재사용 (centroids / order / offsets 배열)
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+ANN_NPROBE = int(os.getenv("RAG_ANN_NPROBE", "32"))
+_ASSIGN_BATCH = 65536  # 배정 시 (batch x nlist) 유사도 행렬 크기 제한
+
+
+def default_nlist(n: int) -> int:
+    """list 개수 기본값 (≈ √N)"""
+    return max(1, int(round(np.sqrt(n))))
+
+
+def _assign(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """각 행 → 가장 유사한 중심 번호 (메모리 제한을 위해 배치 처리)"""
+    labels = np.empty(matrix.shape[0], dtype=np.int32)
+    for start in range(0, matrix.shape[0], _ASSIGN_BATCH):
+        block = matrix[start:start + _ASSIGN_BATCH]
+        labels[start:start + len(block)] = (block @ centroids.T).argmax(axis=1)
+    return labels
+
+
+def train_centroids(matrix: np.ndarray, nlist: int, iterations: int = 10,
+                    sample_size: Optional[int] = None, seed: int = 0) -> np.ndarray:
+    """정규화된 행렬 → (nlist, d) 정규화된 중심 (구면 k-means, 샘플 학습)"""
+    rng = np.random.default_rng(seed)
+    n = matrix.shape[0]
+    sample_size = min(n, sample_size or max(nlist * 40, 10_000))
+    sample = matrix[rng.choice(n, sample_size, replace=False)] if sample_size < n else matrix
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        labels = _assign(sample, centroids)
+        counts = np.bincount(labels, minlength=nlist)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        filled = counts > 0
+        sums = np.zeros_like(centroids)
+        sums[filled] = np.add.reduceat(sample[np.argsort(labels, kind="stable")], starts[filled], axis=0)
+        empty = ~filled
+        if empty.any():
+            # 빈 list는 임의 샘플로 다시 시작
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()), replace=False)]
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        centroids = (sums / norms).astype(np.float32)
+    return centroids
+
+
+class IVFIndex:
+    """정규화된 임베딩 행렬 위의 IVF 인덱스 (행렬 자체는 VectorIndex가 보관, 양자화 행렬도 그대로 사용)"""
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray,
+                 nprobe: int = ANN_NPROBE):
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.order = np.asarray(order, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.nprobe = nprobe
+
+    @property
+    def nlist(self) -> int:
+        return self.centroids.shape[0]
+
+    @classmethod
+    def build(cls, matrix: np.ndarray, nlist: Optional[int] = None, nprobe: int = ANN_NPROBE,
+              iterations: int = 10, seed: int = 0) -> "IVFIndex":
+        nlist = min(nlist or default_nlist(matrix.shape[0]), matrix.shape[0])
+        centroids = train_centroids(matrix, nlist, iterations=iterations, seed=seed)
+        labels = _assign(matrix, centroids)
+        order = np.argsort(labels, kind="stable")
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(labels, minlength=nlist))])
+        return cls(centroids, order, offsets, nprobe=nprobe)
+
+    def candidates(self, query: np.ndarray, nprobe: Optional[int] = None) -> np.ndarray:
+        """쿼리 벡터 하나 → 상위 nprobe개 list에 속한 행 번호"""
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        scores = self.centroids @ query
+        probes = np.argpartition(-scores, nprobe - 1)[:nprobe] if nprobe < self.nlist else np.arange(self.nlist)
+        return np.concatenate([self.order[self.offsets[p]:self.offsets[p + 1]] for p in probes])
+
+    def search_batch(self, matrix: np.ndarray, queries: np.ndarray, k: int,
+                     nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(m, d) 정규화된 쿼리 → (m, k) 위치, (m, k) 유사도 (후보가 k개보다 적은 쿼리는 전수 검색)"""
+        k = min(k, matrix.shape[0])
+        ids = np.empty((queries.shape[0], k), dtype=np.int64)
+        sims = np.empty((queries.shape[0], k), dtype=np.float32)
+        for row, query in enumerate(queries):
+            cand = self.candidates(query, nprobe)
+            if len(cand) < k:
+                cand = np.arange(matrix.shape[0])
+            scores = matrix[cand] @ query
+            part = np.argpartition(-scores, k - 1)[:k] if k < len(cand) else np.arange(len(cand))
+            part = part[np.argsort(-scores[part], kind="stable")]
+            ids[row] = cand[part]
+            sims[row] = scores[part]
+        return ids, sims
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {"centroids": self.centroids, "order": self.order, "offsets": self.offsets}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, Any], nprobe: int = ANN_NPROBE) -> "IVFIndex":
+        return cls(arrays["centroids"], arrays["order"], arrays["offsets"], nprobe=nprobe)
@@ -0,0 +1,195 @@
+# rag/cache.py
+#
+# 프로세스 내 캐시
+# - LRUTTLCache: 크기 제한(LRU) + 만료 시간(TTL)을 갖는 범용 캐시 (hit/miss 통계 포함)
+# - DiskEmbeddingCache: 재시작 후에도 유지되는 sqlite 기반 임베딩 2차 캐시
+# - QueryEmbeddingCache: 정규화된 쿼리 텍스트 → 임베딩 벡터 (메모리 1차 + 디스크 2차)
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RAG_QUERY_CACHE_SIZE = int(os.getenv("RAG_QUERY_CACHE_SIZE", "1024"))
+RAG_QUERY_CACHE_TTL = float(os.getenv("RAG_QUERY_CACHE_TTL", str(60 * 60 * 24)))  # 24시간
+RAG_QUERY_CACHE_PATH = os.getenv("RAG_QUERY_CACHE_PATH")  # 설정 시 디스크 2차 캐시 사용
+
+
+class LRUTTLCache:
+    """스레드 안전한 LRU + TTL 캐시 (ttl이 None이면 만료 없음)"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize는 1 이상이어야 합니다.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at <= self._clock():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = self._clock() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class DiskEmbeddingCache:
+    """sqlite에 float32 벡터를 저장하는 임베딩 캐시 (프로세스 재시작 후에도 유지)"""
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector, created_at FROM embeddings WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or (self.ttl is not None and row[1] + self.ttl <= time.time()):
+                self.misses += 1
+                return None
+            self.hits += 1
+        return np.frombuffer(row[0], dtype=np.float32)
+
+    def set(self, key: str, vector: np.ndarray) -> None:
+        blob = np.asarray(vector, dtype=np.float32).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                (key, blob, time.time()),
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"path": self.path, "hits": self.hits, "misses": self.misses}
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """캐시 키용 쿼리 정규화 (유니코드 NFC + 공백 정리)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class QueryEmbeddingCache:
+    """쿼리 임베딩 캐시: 메모리(LRU+TTL) → 디스크(선택) 순서로 조회"""
+
+    def __init__(self, maxsize: int = RAG_QUERY_CACHE_SIZE, ttl: Optional[float] = RAG_QUERY_CACHE_TTL,
+                 disk_path: Optional[str] = RAG_QUERY_CACHE_PATH):
+        self.memory = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self.disk = DiskEmbeddingCache(disk_path, ttl=ttl) if disk_path else None
+
+    @staticmethod
+    def key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\0{normalize_query(text)}".encode("utf-8")).hexdigest()
+
+    def get_or_embed(self, model: str, texts: List[str],
+                     embed: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """캐시에 없는 텍스트만 모아 embed()를 한 번 호출하고 (n, d) 행렬을 반환"""
+        keys = [self.key(model, t) for t in texts]
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        for i, key in enumerate(keys):
+            vec = self.memory.get(key)
+            if vec is None and self.disk is not None:
+                vec = self.disk.get(key)
+                if vec is not None:
+                    self.memory.set(key, vec)
+            if vec is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                vectors[i] = vec
+
+        if missing:
+            miss_keys = list(missing)
+            fresh = embed([texts[missing[k][0]] for k in miss_keys])
+            for key, vec in zip(miss_keys, fresh):
+                vec = np.asarray(vec, dtype=np.float32)
+                self.memory.set(key, vec)
+                if self.disk is not None:
+                    try:
+                        self.disk.set(key, vec)
+                    except sqlite3.Error as e:
+                        logger.warning(f"⚠️ 임베딩 디스크 캐시 저장 실패: {e}")
+                for i in missing[key]:
+                    vectors[i] = vec
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
@@ -0,0 +1,204 @@
+# rag/chunking.py
+#
+# RAG 코퍼스 텍스트 분할
+# - chunk_text: 고정 길이 윈도우 분할 (overlap 포함)
+# - iter_chunks: 제목/문단 경계를 따르는 구조 기반 분할
+#   · 파일을 한 줄씩 읽는 제너레이터라 메모리보다 큰 코퍼스도 처리 가능 (버퍼는 chunk_size 이하)
+#   · 청크마다 출처, 섹션 경로, 계절 태그, 바이트 오프셋 메타데이터를 함께 반환
+#   · 섹션을 넘나들지 않고 겹침이 없어 프롬프트에 같은 내용이 반복되지 않음
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rag.tones import tag_chunk
+
+MIN_CHUNK_CHARS = 200  # 하위 제목에서 끊을 최소 길이 (이보다 짧으면 다음 섹션과 합침)
+HEADING_MAX_CHARS = 60
+LOOSE_HEADING_MAX_CHARS = 30  # 번호 없이 빈 줄 뒤에 오는 소제목의 최대 길이
+
+# 상위 제목: "2) ...", "(1) ...", "① ...", "1. ..." / 하위 제목: "a. ...", "b . ..."
+_TOP_HEADING = re.compile(r"^\s*(\d{1,2}\)|\(\d{1,2}\)|[①-⑳]|\d{1,2}\.\s)")
+_SUB_HEADING = re.compile(r"^\s*[a-z]\s?\.\s")
+_URL_LINE = re.compile(r"^\s*https?://\S+\s*$")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def chunk_text(text: str, chunk_size: int = 800, overlap: int = 100) -> List[str]:
+    """텍스트를 chunk_size 길이로 overlap만큼 겹치게 분할"""
+    if overlap >= chunk_size:
+        raise ValueError("overlap은 chunk_size보다 작아야 합니다.")
+    chunks = []
+    start = 0
+    text_length = len(text)
+    while start < text_length:
+        end = min(start + chunk_size, text_length)
+        chunks.append(text[start:end])
+        if end == text_length:
+            break
+        start += (chunk_size - overlap)
+    return [c.strip() for c in chunks if c.strip()]
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """구조 기반 분할 결과 한 건 (start/end는 원본 파일의 바이트 오프셋, end 미포함)"""
+    text: str
+    source: str
+    section: str
+    seasons: Tuple[str, ...]
+    start: int
+    end: int
+
+    def to_meta(self) -> Dict[str, Any]:
+        """인덱스 메타데이터용 dict (본문 제외)"""
+        meta = asdict(self)
+        del meta["text"]
+        meta["seasons"] = list(self.seasons)
+        return meta
+
+
+@dataclass
+class ChunkStats:
+    """청크 개수/길이 통계 (스트리밍으로 누적)"""
+    count: int = 0
+    total_chars: int = 0
+    min_chars: Optional[int] = None
+    max_chars: int = 0
+    sections: int = 0
+    by_season: Dict[str, int] = field(default_factory=dict)
+    _last_section: Optional[str] = field(default=None, repr=False)
+
+    def add(self, chunk: Chunk) -> None:
+        size = len(chunk.text)
+        self.count += 1
+        self.total_chars += size
+        self.min_chars = size if self.min_chars is None else min(self.min_chars, size)
+        self.max_chars = max(self.max_chars, size)
+        if chunk.section != self._last_section:
+            self.sections += 1
+            self._last_section = chunk.section
+        for season in chunk.seasons:
+            self.by_season[season] = self.by_season.get(season, 0) + 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "total_chars": self.total_chars,
+            "min_chars": self.min_chars or 0,
+            "max_chars": self.max_chars,
+            "mean_chars": round(self.total_chars / self.count, 1) if self.count else 0.0,
+            "sections": self.sections,
+            "by_season": dict(sorted(self.by_season.items())),
+        }
+
+
+def _heading_level(line: str, after_blank: bool) -> int:
+    """0: 본문, 1: 상위 제목(문서/장), 2: 하위 제목"""
+    stripped = line.strip()
+    if not stripped:
+        return 0
+    if _URL_LINE.match(stripped):
+        return 1
+    if len(stripped) > HEADING_MAX_CHARS:
+        return 0
+    if _TOP_HEADING.match(stripped):
+        return 1
+    if _SUB_HEADING.match(stripped):
+        return 2
+    # 빈 줄 뒤에 오는 짧은 한 줄 (기사 소제목 등)
+    if after_blank and len(stripped) <= LOOSE_HEADING_MAX_CHARS and not stripped.endswith(("다.", "요.", ",")):
+        return 2
+    return 0
+
+
+def _split_long(text: str, start: int, chunk_size: int) -> Iterator[Tuple[str, int, int]]:
+    """chunk_size를 넘는 한 덩어리 → 문장 경계로 나눈 (텍스트, 시작, 끝) 바이트 오프셋"""
+    pieces: List[str] = []
+    size = 0
+    offset = start
+    for sentence in _SENTENCE_END.split(text):
+        if pieces and size + len(sentence) + 1 > chunk_size:
+            body = " ".join(pieces)
+            length = len(body.encode("utf-8"))
+            yield body, offset, offset + length
+            offset += length + 1
+            pieces, size = [], 0
+        # 문장 하나가 chunk_size보다 길면 글자 수로 자름
+        while len(sentence) > chunk_size:
+            head, sentence = sentence[:chunk_size], sentence[chunk_size:]
+            length = len(head.encode("utf-8"))
+            yield head, offset, offset + length
+            offset += length
+        pieces.append(sentence)
+        size += len(sentence) + 1
+    if pieces:
+        body = " ".join(pieces)
+        yield body, offset, offset + len(body.encode("utf-8"))
+
+
+def iter_lines(stream: BinaryIO) -> Iterator[Tuple[str, int, int]]:
+    """바이너리 스트림 → (줄 텍스트, 시작 바이트, 끝 바이트) (줄바꿈 제외)"""
+    offset = 0
+    for raw in stream:
+        text = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+        yield text, offset, offset + len(text.encode("utf-8"))
+        offset += len(raw)
+
+
+def iter_chunks_from_lines(lines: Iterable[Tuple[str, int, int]], source: str = "",
+                           chunk_size: int = 800, min_chars: int = MIN_CHUNK_CHARS) -> Iterator[Chunk]:
+    """(줄, 시작, 끝) 스트림 → 제목/문단 경계를 따르는 Chunk"""
+    top, sub = "", ""
+    buffer: List[str] = []
+    buffer_chars = 0
+    start = end = 0
+    chunk_section = ""
+    after_blank = True
+
+    def emit(text: str, s: int, e: int) -> Chunk:
+        seasons = tag_chunk(text, chunk_section)
+        return Chunk(text, source, chunk_section, tuple(sorted(seasons)), s, e)
+
+    def flush() -> Iterator[Chunk]:
+        nonlocal buffer, buffer_chars
+        text = "\n".join(buffer).strip()
+        if text:
+            if len(text) > chunk_size:
+                for piece, s, e in _split_long(text, start, chunk_size):
+                    yield emit(piece, s, e)
+            else:
+                yield emit(text, start, end)
+        buffer, buffer_chars = [], 0
+
+    for line, line_start, line_end in lines:
+        level = _heading_level(line, after_blank)
+        after_blank = not line.strip()
+        # 상위 제목에서는 항상, 하위 제목에서는 버퍼가 충분히 찼을 때만 끊음
+        if level == 1 or (level == 2 and buffer_chars >= min_chars):
+            yield from flush()
+        if level == 1:
+            top, sub = line.strip(), ""
+            if _URL_LINE.match(line):
+                continue  # 출처 URL은 섹션 이름으로만 사용
+        elif level == 2:
+            sub = line.strip()
+        if after_blank and not buffer:
+            continue
+        if buffer and buffer_chars + len(line) + 1 > chunk_size:
+            yield from flush()
+        if not buffer:
+            start = line_start
+            chunk_section = f"{top} > {sub}" if top and sub else top or sub
+        buffer.append(line)
+        buffer_chars += len(line) + 1
+        end = line_end
+    yield from flush()
+
+
+def iter_chunks(filepath: str, chunk_size: int = 800, min_chars: int = MIN_CHUNK_CHARS,
+                source: Optional[str] = None) -> Iterator[Chunk]:
+    """파일을 스트리밍으로 읽어 구조 기반 Chunk를 생성"""
+    with open(filepath, "rb") as f:
+        yield from iter_chunks_from_lines(iter_lines(f), source or filepath, chunk_size, min_chars)
+
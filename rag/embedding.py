@@ -0,0 +1,111 @@
+# rag/embedding.py
+#
+# 임베딩 백엔드
+# - openai: OpenAI 임베딩 API (dimensions를 주면 줄인 차원으로 받음, text-embedding-3-* 모델만 지원)
+# - local : 문자 n-gram 해시 임베딩 (네트워크/과금 없음, 같은 입력이면 항상 같은 벡터)
+#           테스트, 벤치마크, 키 없는 개발 환경용. 의미 유사도가 아니라 색인어 겹침 정도를 반영한다.
+# - RAG_EMBEDDER 환경 변수로 선택, RagService는 Embedder 인터페이스만 사용한다.
+
+import os
+import math
+import hashlib
+import functools
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import List, Optional
+
+import numpy as np
+from openai import OpenAI
+
+from openai_client import get_openai_client
+from rag.lexical import tokenize
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = int(os.getenv("RAG_EMBEDDING_DIMENSIONS", "0")) or None  # 0이면 모델 기본 차원
+EMBEDDERS = ("openai", "local")
+RAG_EMBEDDER = os.getenv("RAG_EMBEDDER", "openai")
+LOCAL_EMBEDDING_DIM = 1024  # local 백엔드 기본 차원 (RAG_EMBEDDING_DIMENSIONS로 변경)
+
+
+def embed_texts(client: OpenAI, texts: List[str], model: str = EMBEDDING_MODEL,
+                dimensions: Optional[int] = None) -> List[List[float]]:
+    """텍스트 리스트를 임베딩 벡터로 변환"""
+    if dimensions:
+        res = client.embeddings.create(model=model, input=texts, dimensions=dimensions)
+    else:
+        res = client.embeddings.create(model=model, input=texts)
+    return [item.embedding for item in res.data]
+
+
+def model_id(model: str, dimensions: Optional[int] = None) -> str:
+    """캐시 키에 쓰는 모델 식별자 (차원을 줄였으면 차원 포함)"""
+    return f"{model}@{dimensions}" if dimensions else model
+
+
+class Embedder(ABC):
+    """텍스트 리스트 → (n, d) float32 임베딩 행렬"""
+
+    model_id = ""  # 캐시 키용 식별자 (백엔드/모델/차원이 다르면 달라야 함)
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        ...
+
+
+class OpenAIEmbedder(Embedder):
+    """OpenAI 임베딩 API (클라이언트는 첫 호출 때 생성하므로 API 키가 없어도 만들 수 있음)"""
+
+    def __init__(self, client: Optional[OpenAI] = None, model: str = EMBEDDING_MODEL,
+                 dimensions: Optional[int] = EMBEDDING_DIMENSIONS):
+        self._client = client
+        self.model = model
+        self.dimensions = dimensions
+        self.model_id = model_id(model, dimensions)
+
+    @property
+    def client(self) -> OpenAI:
+        if self._client is None:
+            self._client = get_openai_client()
+        return self._client
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = embed_texts(self.client, texts, model=self.model, dimensions=self.dimensions)
+        return np.asarray(vectors, dtype=np.float32).reshape(len(texts), -1)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _term_hash(term: str) -> int:
+    # 파이썬 hash()는 프로세스마다 달라지므로 고정 해시 사용
+    return int.from_bytes(hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class HashingEmbedder(Embedder):
+    """
+    로컬 해시 임베딩: rag.lexical 색인어(한글 문자 2·3-gram + 영숫자 어절)를
+    부호 있는 해시로 dim개 칸에 모아 로그 TF 가중 후 L2 정규화
+    """
+
+    def __init__(self, dim: int = LOCAL_EMBEDDING_DIM):
+        self.dim = dim
+        self.model_id = f"local-hash-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term, count in Counter(tokenize(text)).items():
+                h = _term_hash(term)
+                sign = 1.0 if h >> 63 else -1.0  # 충돌한 색인어끼리 상쇄되도록 부호도 해시로 결정
+                matrix[row, h % self.dim] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+
+def get_embedder(name: str = RAG_EMBEDDER, client: Optional[OpenAI] = None, model: str = EMBEDDING_MODEL,
+                 dimensions: Optional[int] = EMBEDDING_DIMENSIONS) -> Embedder:
+    """설정 이름(openai / local) → Embedder"""
+    if name == "openai":
+        return OpenAIEmbedder(client, model=model, dimensions=dimensions)
+    if name == "local":
+        return HashingEmbedder(dimensions or LOCAL_EMBEDDING_DIM)
+    raise ValueError(f"지원하지 않는 임베딩 방식입니다: {name}")
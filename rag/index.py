@@ -0,0 +1,109 @@
+# rag/index.py
+#
+# 벡터 인덱스 (정규화된 임베딩 행렬 + 청크 텍스트)
+# - 검색은 행렬-벡터 곱 1회 + argpartition으로 top-k만 정렬
+# - 행렬은 rag.quantize 저장 형식(float32 / float16 / int8)으로 보관하고 양자화된 상태로 바로 검색한다.
+# - search_batch()는 여러 쿼리를 행렬-행렬 곱 1회로 처리
+# - build_ann()으로 IVF 근사 인덱스(rag.ann)를 붙이면 같은 검색 API가 후보 list만 채점한다.
+
+from typing import List, Tuple, Optional, Dict, Any, Union
+
+import numpy as np
+
+from rag.ann import ANN_NPROBE, IVFIndex
+from rag.quantize import QuantizedMatrix
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """각 행을 L2 정규화한 float32 행렬 (영벡터는 그대로 유지)"""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix.reshape(1, -1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_rows(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """(m, n) 점수 행렬에서 행마다 상위 k개 (인덱스, 점수)를 내림차순으로 반환"""
+    n = scores.shape[1]
+    k = min(k, n)
+    if k <= 0:
+        empty = np.empty((scores.shape[0], 0))
+        return empty.astype(np.int64), empty.astype(np.float32)
+    if k < n:
+        part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        part = np.broadcast_to(np.arange(n), (scores.shape[0], n))
+    part_scores = np.take_along_axis(scores, part, axis=1)
+    order = np.argsort(-part_scores, axis=1, kind="stable")
+    ids = np.take_along_axis(part, order, axis=1)
+    return ids, np.take_along_axis(part_scores, order, axis=1)
+
+
+class VectorIndex:
+    """청크 목록과 정규화된 임베딩 행렬을 함께 보관하는 검색 인덱스 (dtype: 행렬 저장 형식)"""
+
+    def __init__(self, chunks: List[str], matrix: Union[np.ndarray, QuantizedMatrix], normalized: bool = False,
+                 meta: Optional[Dict[str, Any]] = None, dtype: str = "float32"):
+        if isinstance(matrix, QuantizedMatrix):
+            vectors = matrix  # 이미 저장 형식으로 준비된 정규화 행렬 (예: 디스크 캐시 매핑)
+        else:
+            matrix = np.asarray(matrix, dtype=np.float32)
+            if len(chunks) == 0:
+                matrix = matrix.reshape(0, matrix.shape[-1] if matrix.ndim == 2 else 0)
+            vectors = QuantizedMatrix.from_float(matrix if normalized else normalize_rows(matrix), dtype)
+        if len(chunks) and vectors.shape[0] != len(chunks):
+            raise ValueError(f"청크 수({len(chunks)})와 임베딩 수({vectors.shape[0]})가 다릅니다.")
+        self.chunks = list(chunks)
+        self.vectors = vectors
+        self.meta = meta or {}
+        self.ann: Optional[IVFIndex] = None
+
+    @classmethod
+    def empty(cls) -> "VectorIndex":
+        return cls([], np.empty((0, 0), dtype=np.float32), normalized=True)
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def dim(self) -> int:
+        return self.vectors.shape[1] if self.vectors.ndim == 2 else 0
+
+    @property
+    def dtype(self) -> str:
+        return self.vectors.dtype.name
+
+    @property
+    def nbytes(self) -> int:
+        """임베딩 행렬이 차지하는 메모리 (양자화 스케일 포함)"""
+        return self.vectors.nbytes
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """float32 임베딩 행렬 (양자화된 인덱스면 복원한 복사본)"""
+        return self.vectors.to_float()
+
+    def build_ann(self, nlist: Optional[int] = None, nprobe: Optional[int] = None, **kwargs: Any) -> None:
+        """IVF 근사 인덱스 생성 후 부착 (이후 search/search_batch는 근사 검색)"""
+        self.ann = IVFIndex.build(self.vectors, nlist=nlist, nprobe=nprobe or ANN_NPROBE, **kwargs)
+
+    def search(self, query: np.ndarray, k: int = 3, exact: bool = False) -> List[Tuple[int, float]]:
+        """단일 쿼리 벡터 → [(청크 위치, 코사인 유사도), ...]"""
+        ids, scores = self.search_batch(np.asarray(query).reshape(1, -1), k, exact=exact)
+        return list(zip(ids[0].tolist(), scores[0].tolist()))
+
+    def search_batch(self, queries: np.ndarray, k: int = 3, exact: bool = False,
+                     nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (m, d) 쿼리 행렬 → (m, k) 위치 행렬, (m, k) 유사도 행렬
+        ANN이 부착되어 있으면 근사 검색 (exact=True면 항상 전수 검색, nprobe로 재현율/지연 조절)
+        """
+        queries = normalize_rows(queries)
+        if len(self) == 0:
+            return top_k_rows(np.empty((queries.shape[0], 0), dtype=np.float32), k)
+        if self.ann is not None and not exact:
+            return self.ann.search_batch(self.vectors, queries, k, nprobe=nprobe)
+        scores = self.vectors.dot(queries)
+        return top_k_rows(scores, k)
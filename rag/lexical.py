@@ -0,0 +1,104 @@
+# rag/lexical.py
+#
+# 문자 n-gram 역색인 + BM25 (로컬, 네트워크 없음)
+# - 한국어는 띄어쓰기/조사 때문에 단어 단위 매칭이 약하므로 어절 안의 문자 2·3-gram을 색인어로 사용
+# - 영문/숫자/HEX 코드(#FF6F61 등)는 어절 전체도 색인어로 추가해 정확히 일치하는 용어를 잡는다.
+# - 색인어별 포스팅(청크 위치, BM25 가중치)을 빌드 시 미리 계산 → 검색은 포스팅 합산만 (서브 밀리초)
+
+import re
+from collections import Counter
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+NGRAM_SIZES = (2, 3)
+
+_TOKEN = re.compile(r"#?[0-9a-zA-Z]+|[가-힣]+")
+
+
+def tokenize(text: str, sizes: Sequence[int] = NGRAM_SIZES) -> List[str]:
+    """텍스트 → 색인어 목록 (한글 어절은 문자 n-gram, 영숫자/HEX는 어절 그대로 + n-gram)"""
+    terms: List[str] = []
+    for word in _TOKEN.findall(text.lower()):
+        if not word[0] >= "가":
+            terms.append(word)  # 영숫자/HEX 어절 전체
+            word = word.lstrip("#")
+        if len(word) < min(sizes):
+            terms.append(word)
+            continue
+        for n in sizes:
+            terms.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return terms
+
+
+class BM25Index:
+    """청크 목록에 대한 BM25 역색인"""
+
+    def __init__(self, chunks: Sequence[str], k1: float = BM25_K1, b: float = BM25_B):
+        self.size = len(chunks)
+        self.k1 = k1
+        self.b = b
+        term_freqs = [Counter(tokenize(chunk)) for chunk in chunks]
+        lengths = np.array([sum(tf.values()) for tf in term_freqs], dtype=np.float32)
+        avg_len = float(lengths.mean()) if self.size and lengths.mean() > 0 else 1.0
+        norm = k1 * (1 - b + b * lengths / avg_len)
+
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for doc, tf in enumerate(term_freqs):
+            for term, count in tf.items():
+                postings.setdefault(term, []).append((doc, count))
+
+        # 색인어 → (청크 위치 배열, 미리 계산한 BM25 가중치 배열)
+        self.postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for term, rows in postings.items():
+            docs = np.array([d for d, _ in rows], dtype=np.int64)
+            tf = np.array([c for _, c in rows], dtype=np.float32)
+            idf = np.log(1 + (self.size - len(docs) + 0.5) / (len(docs) + 0.5))
+            self.postings[term] = (docs, (idf * tf * (k1 + 1) / (tf + norm[docs])).astype(np.float32))
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self.postings)
+
+    def scores(self, query: str) -> np.ndarray:
+        """쿼리 → 청크별 BM25 점수 (길이 = 청크 수)"""
+        scores = np.zeros(self.size, dtype=np.float32)
+        for term, count in Counter(tokenize(query)).items():
+            posting = self.postings.get(term)
+            if posting is not None:
+                scores[posting[0]] += posting[1] * count  # 포스팅 안의 청크 위치는 중복 없음
+        return scores
+
+    def search(self, query: str, k: int = 3) -> List[Tuple[int, float]]:
+        """쿼리 → [(청크 위치, BM25 점수), ...] (점수 0인 청크는 제외)"""
+        scores = self.scores(query)
+        return top_positive(scores, k)
+
+
+def top_positive(scores: np.ndarray, k: int) -> List[Tuple[int, float]]:
+    """점수 벡터에서 0보다 큰 상위 k개 (내림차순)"""
+    k = min(k, int((scores > 0).sum()))
+    if k <= 0:
+        return []
+    part = np.argpartition(-scores, k - 1)[:k]
+    order = part[np.argsort(-scores[part], kind="stable")]
+    return [(int(i), float(scores[i])) for i in order]
+
+
+def fuse_scores(lexical: np.ndarray, dense: np.ndarray, alpha: float) -> np.ndarray:
+    """
+    BM25 점수와 코사인 유사도를 각각 0-1로 정규화해 가중 합산
+    alpha=1이면 벡터만, alpha=0이면 BM25만
+    """
+    def scale(values: np.ndarray) -> np.ndarray:
+        if not len(values):
+            return values
+        low, high = float(values.min()), float(values.max())
+        return (values - low) / (high - low) if high > low else np.zeros_like(values)
+
+    return alpha * scale(dense) + (1 - alpha) * scale(lexical)
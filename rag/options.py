@@ -0,0 +1,66 @@
+# rag/options.py
+#
+# 설문 선택지 임베딩 (사전 계산)
+# - 문항/선택지는 고정이므로 인덱스 빌드 시 선택지 문구를 한 번만 임베딩해 저장한다.
+# - 제출된 답변의 쿼리 벡터는 선택지 벡터의 가중 평균을 정규화해 로컬에서 합성
+#   → 설문 제출 시 RAG 검색에 임베딩 API 호출이 필요 없다.
+
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rag.index import normalize_rows
+
+OptionKey = Tuple[int, str]
+
+
+class OptionEmbeddings:
+    """(question_id, option_id) → 정규화된 선택지 임베딩"""
+
+    def __init__(self, keys: Sequence[OptionKey], matrix: np.ndarray, meta: Optional[Dict[str, Any]] = None):
+        self.keys: List[OptionKey] = [(int(q), str(o)) for q, o in keys]
+        self.matrix = normalize_rows(np.asarray(matrix, dtype=np.float32))
+        self.meta = meta or {}
+        self._row_of = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: OptionKey) -> bool:
+        return key in self._row_of
+
+    @staticmethod
+    def encode_keys(keys: Iterable[OptionKey]) -> List[str]:
+        """저장용 문자열 키 ("1:opt_warm_undertone")"""
+        return [f"{q}:{o}" for q, o in keys]
+
+    @staticmethod
+    def decode_keys(raw: Iterable[str]) -> List[OptionKey]:
+        return [(int(q), o) for q, o in (item.split(":", 1) for item in raw)]
+
+    def compose(self, answers: Iterable[Any], weights: Optional[Sequence[float]] = None) -> Optional[np.ndarray]:
+        """
+        답변 목록(question_id, option_id 속성) → 정규화된 가중 평균 쿼리 벡터
+        모르는 선택지가 하나라도 있으면 None (호출 측에서 텍스트 임베딩으로 대체)
+        """
+        rows = []
+        for ans in answers:
+            row = self._row_of.get((int(ans.question_id), str(ans.option_id)))
+            if row is None:
+                return None
+            rows.append(row)
+        if not rows:
+            return None
+        w = np.ones(len(rows), dtype=np.float32) if weights is None else np.asarray(weights, dtype=np.float32)
+        vec = w @ self.matrix[rows]
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else None
+
+    def compose_keys(self, weights: Mapping[OptionKey, float]) -> Optional[np.ndarray]:
+        """{(question_id, option_id): 가중치} → 정규화된 가중 합 벡터 (예: 계절 톤 벡터)"""
+        rows = [(self._row_of[key], w) for key, w in weights.items() if key in self._row_of and w]
+        if not rows:
+            return None
+        vec = np.asarray([w for _, w in rows], dtype=np.float32) @ self.matrix[[row for row, _ in rows]]
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm > 0 else None
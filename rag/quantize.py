@@ -0,0 +1,109 @@
+# rag/quantize.py
+#
+# 임베딩 행렬 저장 형식 (스칼라 양자화)
+# - float32: 원본 그대로 (4 bytes/차원)
+# - float16: 반정밀도 (2 bytes/차원), 정규화된 벡터라 값 범위 문제 없음
+# - int8: 행별 스케일(max|x|/127)로 대칭 양자화 (1 byte/차원 + 행당 4 bytes)
+# - 검색은 양자화된 행렬 위에서 바로 수행: 블록 단위로 float32로 올려 곱하고 int8은 행 스케일을 곱함
+#   → 전체 행렬을 float32로 되돌린 복사본을 만들지 않으므로 상주 메모리는 저장 형식 크기만큼만 든다.
+# - int8은 float32와 검색 속도가 비슷하지만 float16은 NumPy의 반정밀도 변환이 느려 검색 지연이 몇 배 늘어난다.
+
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+STORAGE_DTYPES = ("float32", "float16", "int8")
+RAG_EMBEDDING_DTYPE = os.getenv("RAG_EMBEDDING_DTYPE", "float32")  # 인덱스 임베딩 저장 형식
+_BLOCK_ELEMENTS = 1 << 16  # 블록 곱셈 시 float32로 올리는 원소 수 (256KB, 캐시 안에서 처리)
+
+
+class QuantizedMatrix:
+    """
+    (n, d) 임베딩 행렬의 양자화 저장소
+    행 인덱싱(matrix[rows])은 float32로 복원한 행을, matrix @ vec / dot()은 유사도를 돌려준다.
+    """
+
+    def __init__(self, data: np.ndarray, scales: Optional[np.ndarray] = None):
+        self.data = data
+        self.scales = scales  # int8에서만 사용 (n,) float32
+
+    @classmethod
+    def from_float(cls, matrix: np.ndarray, dtype: str = "float32") -> "QuantizedMatrix":
+        if dtype not in STORAGE_DTYPES:
+            raise ValueError(f"지원하지 않는 임베딩 저장 형식입니다: {dtype}")
+        matrix = np.asarray(matrix, dtype=np.float32)
+        if dtype == "float32":
+            return cls(matrix)
+        if dtype == "float16":
+            return cls(matrix.astype(np.float16))
+        scales = np.abs(matrix).max(axis=1) / 127.0 if matrix.size else np.zeros(matrix.shape[0], np.float32)
+        scales = scales.astype(np.float32)
+        safe = np.where(scales > 0, scales, 1.0)[:, None]
+        data = np.clip(np.rint(matrix / safe), -127, 127).astype(np.int8)
+        return cls(data, scales)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        arrays = {"data": self.data}
+        if self.scales is not None:
+            arrays["scales"] = self.scales
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "QuantizedMatrix":
+        return cls(arrays["data"], arrays.get("scales"))
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.data.dtype
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.data.ndim
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def __getitem__(self, rows: Any) -> np.ndarray:
+        """행 선택 → float32로 복원한 행 (정수 하나면 1차원)"""
+        block = self.data[rows].astype(np.float32, copy=False)
+        if self.scales is None:
+            return block
+        scales = self.scales[rows]
+        return block * (scales[..., None] if block.ndim == 2 else scales)
+
+    def to_float(self) -> np.ndarray:
+        """전체 행렬을 float32로 복원 (float32 저장이면 복사 없이 그대로)"""
+        if self.data.dtype == np.float32:
+            return self.data
+        return self[:]
+
+    def _block_rows(self) -> int:
+        return max(1, _BLOCK_ELEMENTS // max(1, self.data.shape[1] if self.data.ndim == 2 else 1))
+
+    def dot(self, queries: np.ndarray) -> np.ndarray:
+        """(m, d) 쿼리 → (m, n) 내적 행렬"""
+        queries = np.asarray(queries, dtype=np.float32)
+        if self.data.dtype == np.float32:
+            return queries @ self.data.T
+        n = self.data.shape[0]
+        scores = np.empty((queries.shape[0], n), dtype=np.float32)
+        step = self._block_rows()
+        for start in range(0, n, step):
+            block = self.data[start:start + step].astype(np.float32)
+            scores[:, start:start + len(block)] = queries @ block.T
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def __matmul__(self, vec: np.ndarray) -> np.ndarray:
+        """행렬 @ 쿼리 벡터 하나 → (n,) 내적"""
+        return self.dot(np.asarray(vec, dtype=np.float32).reshape(1, -1))[0]
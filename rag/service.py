@@ -0,0 +1,566 @@
+# rag/service.py
+#
+# 프로세스 단위 RAG 검색 서비스
+# - 코퍼스 인덱스를 프로세스당 한 번만 로드하고 모든 라우터/Streamlit 앱이 공유한다.
+# - 인덱스는 rag.store 디스크 캐시를 거쳐 로드되므로 재시작 시 임베딩 호출이 없다.
+# - 검색은 정규화된 임베딩 행렬 기반 rag.index.VectorIndex가 담당한다.
+#   디스크 캐시는 float32 원본, 메모리에는 embedding_dtype(float32/float16/int8)로 양자화해 보관한다.
+#   캐시 파일(양자화 결과 포함)은 메모리 매핑으로 열어 같은 서버의 워커 프로세스들이 물리 메모리 한 벌을 공유한다.
+# - 설문 선택지 임베딩도 함께 빌드/캐시해 두고, 설문 제출 시 쿼리 벡터를 로컬에서 합성한다.
+# - 계절별 후보 청크(rag.tones)를 미리 만들어 설문 결과가 있으면 전체 검색 없이 후보만 재정렬한다.
+# - 텍스트 쿼리는 벡터 / BM25(문자 n-gram, 네트워크 없음) / 두 점수를 합친 hybrid 중 선택해 검색한다.
+# - 임베딩은 rag.embedding.Embedder(openai / local 해시)로 계산하며 캐시 키에 백엔드 식별자가 들어간다.
+# - reload(): 코퍼스 파일이 바뀌면 청크 해시 기준으로 새/변경 청크만 임베딩하고 인덱스를 무중단 교체한다.
+
+import os
+import glob
+import time
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from openai import OpenAI
+
+from rag import store as rag_store
+from rag.cache import QueryEmbeddingCache
+from rag.chunking import ChunkStats, chunk_text, iter_chunks
+from rag.embedding import EMBEDDING_DIMENSIONS, EMBEDDING_MODEL, RAG_EMBEDDER, Embedder, get_embedder
+from rag.ann import ANN_NPROBE, IVFIndex
+from rag.index import VectorIndex, normalize_rows, top_k_rows
+from rag.lexical import BM25Index, fuse_scores
+from rag.options import OptionEmbeddings
+from rag.quantize import RAG_EMBEDDING_DTYPE, STORAGE_DTYPES, QuantizedMatrix
+from rag.tones import ToneContext
+from services.scoring import option_texts, season_option_weights
+
+logger = logging.getLogger(__name__)
+
+RAG_DATA_DIR = os.path.join("data", "RAG")
+CHUNKERS = ("structured", "window")  # structured: 제목/문단 기반 (기본), window: 고정 길이 + overlap
+SEARCH_MODES = ("hybrid", "vector", "bm25")
+RAG_SEARCH_MODE = os.getenv("RAG_SEARCH_MODE", "hybrid")      # 텍스트 쿼리 검색 방식
+RAG_HYBRID_ALPHA = float(os.getenv("RAG_HYBRID_ALPHA", "0.5"))  # hybrid에서 벡터 점수 비중 (0-1)
+RAG_ANN_MIN_CHUNKS = int(os.getenv("RAG_ANN_MIN_CHUNKS", "50000"))  # 이 이상이면 IVF 근사 검색 사용 (0이면 끔)
+
+# 인덱스 이름 → 원본 파일 (glob 패턴, 여러 파일이면 이름순으로 합쳐 하나의 인덱스)
+CORPUS_FILES = {
+    "personal_color": os.path.join(RAG_DATA_DIR, "personal_color_RAG.txt"),  # 불변 지식
+    "beauty_trend": os.path.join(RAG_DATA_DIR, "beauty_trend_*_RAG.txt"),    # 가변 지식 (시즌별 파일 교체)
+}
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """검색 결과 한 건"""
+    text: str
+    score: float
+    index: str
+    position: int
+
+
+class RagService:
+    """코퍼스 인덱스를 소유하고 검색 API를 제공하는 서비스"""
+
+    def __init__(self, client: Optional[OpenAI] = None, corpus: Optional[Dict[str, str]] = None,
+                 chunk_size: int = 800, overlap: int = 100, model: str = EMBEDDING_MODEL,
+                 query_cache: Optional[QueryEmbeddingCache] = None,
+                 options: Optional[Dict[Tuple[int, str], str]] = None,
+                 tone_weights: Optional[Dict[str, Dict[Tuple[int, str], float]]] = None,
+                 chunker: str = "structured", search_mode: str = RAG_SEARCH_MODE,
+                 hybrid_alpha: float = RAG_HYBRID_ALPHA, ann_min_chunks: int = RAG_ANN_MIN_CHUNKS,
+                 dimensions: Optional[int] = EMBEDDING_DIMENSIONS, embedding_dtype: str = RAG_EMBEDDING_DTYPE,
+                 mmap: bool = rag_store.RAG_MMAP, embedder: Optional[Embedder] = None):
+        if chunker not in CHUNKERS:
+            raise ValueError(f"지원하지 않는 청크 분할 방식입니다: {chunker}")
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"지원하지 않는 검색 방식입니다: {search_mode}")
+        if embedding_dtype not in STORAGE_DTYPES:
+            raise ValueError(f"지원하지 않는 임베딩 저장 형식입니다: {embedding_dtype}")
+        self.corpus = dict(corpus or CORPUS_FILES)
+        self.chunk_size = chunk_size
+        self.overlap = overlap
+        self.chunker = chunker
+        self.search_mode = search_mode
+        self.hybrid_alpha = hybrid_alpha
+        self.ann_min_chunks = ann_min_chunks
+        # 임베딩 백엔드 (기본값은 RAG_EMBEDDER 설정, OpenAI 클라이언트는 첫 임베딩 호출 때 생성)
+        self.embedder = embedder or get_embedder(RAG_EMBEDDER, client, model=model, dimensions=dimensions)
+        self.model_id = self.embedder.model_id  # 캐시 키용 (백엔드/모델/차원이 다르면 다른 캐시)
+        self.embedding_dtype = embedding_dtype
+        self.mmap = mmap
+        self.query_cache = query_cache or QueryEmbeddingCache()
+        self.options = dict(options or {})
+        self.tone_weights = dict(tone_weights or {})
+        self._indexes: Dict[str, VectorIndex] = {}
+        self._option_embeddings: Optional[OptionEmbeddings] = None
+        self._options_loaded = False
+        self._tones: Optional[ToneContext] = None
+        self._lexical: Dict[str, Tuple[VectorIndex, BM25Index]] = {}
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return len(self._indexes) == len(self.corpus) and self._options_loaded
+
+    def load(self) -> None:
+        """모든 코퍼스 인덱스 로드 (이미 로드되었으면 아무것도 하지 않음)"""
+        if self.is_loaded:
+            return
+        with self._lock:
+            for name in self.corpus:
+                if name in self._indexes:
+                    continue
+                try:
+                    self._indexes[name] = self._build_index(name)
+                except Exception as e:
+                    logger.error(f"⚠️ RAG 인덱스 빌드 오류 ({name}): {e}")
+                    self._indexes[name] = VectorIndex.empty()
+            if not self._options_loaded:
+                try:
+                    self._option_embeddings = self._build_option_embeddings()
+                except Exception as e:
+                    logger.error(f"⚠️ 선택지 임베딩 빌드 오류: {e}")
+                    self._option_embeddings = None
+                self._options_loaded = True
+            if self.tone_weights:
+                self._tones = self._build_tone_context(self._indexes)
+            for name, index in self._indexes.items():
+                self._lexical_for(name, index)
+
+    def _build_tone_context(self, indexes: Dict[str, VectorIndex]) -> ToneContext:
+        tone_vectors = {}
+        if self._option_embeddings is not None:
+            for season, weights in self.tone_weights.items():
+                vec = self._option_embeddings.compose_keys(weights)
+                if vec is not None:
+                    tone_vectors[season] = vec
+        return ToneContext.build(indexes, list(self.tone_weights), tone_vectors)
+
+    def _build_option_embeddings(self) -> Optional[OptionEmbeddings]:
+        if not self.options:
+            return None
+        keys = sorted(self.options)
+        texts = [self.options[key] for key in keys]
+        key = rag_store.texts_key(OptionEmbeddings.encode_keys(keys) + texts, self.model_id, kind="options")
+        cached = rag_store.load_index(key)
+        if cached is not None:
+            meta = dict(cached["meta"], key=key)
+            return OptionEmbeddings(OptionEmbeddings.decode_keys(cached["chunks"]), cached["embeddings"], meta=meta)
+        meta = {"source": "survey_options", "normalized": True, "key": key}
+        options = OptionEmbeddings(keys, self.embedder.embed(texts), meta=meta)
+        rag_store.save_index(key, OptionEmbeddings.encode_keys(keys), options.matrix, meta=meta)
+        return options
+
+    def corpus_files(self, name: str) -> List[str]:
+        """인덱스에 속한 원본 파일 목록 (코퍼스 값은 파일 경로 또는 glob 패턴)"""
+        return sorted(glob.glob(self.corpus[name]))
+
+    def _snapshot_key(self, name: str) -> str:
+        # 인덱스 이름별 마지막 빌드 결과 (재시작 후 증분 재임베딩의 재사용 풀)
+        overlap = self.overlap if self.chunker == "window" else 0
+        return rag_store.texts_key([name, self.chunker, str(self.chunk_size), str(overlap)],
+                                   self.model_id, kind="snapshot")
+
+    def _split_files(self, files: List[str]) -> Tuple[List[str], Dict[str, Any]]:
+        meta: Dict[str, Any] = {}
+        chunks: List[str] = []
+        if self.chunker == "structured":
+            stats = ChunkStats()
+            chunk_meta = []
+            for filepath in files:
+                for chunk in iter_chunks(filepath, chunk_size=self.chunk_size):
+                    stats.add(chunk)
+                    chunks.append(chunk.text)
+                    chunk_meta.append(chunk.to_meta())
+            meta.update(chunk_meta=chunk_meta, chunk_stats=stats.to_dict())
+            logger.info(f"RAG 청크 분할 ({', '.join(files)}): {stats.to_dict()}")
+        else:
+            for filepath in files:
+                with open(filepath, encoding="utf-8") as f:
+                    chunks.extend(chunk_text(f.read(), chunk_size=self.chunk_size, overlap=self.overlap))
+        return chunks, meta
+
+    def _build_index(self, name: str, previous: Optional[VectorIndex] = None) -> VectorIndex:
+        index = self._load_or_embed_index(name, previous)
+        if self.ann_min_chunks and len(index) >= self.ann_min_chunks and index.ann is None:
+            self._attach_ann(index)
+        return index
+
+    def _attach_ann(self, index: VectorIndex) -> None:
+        """큰 인덱스에 IVF 근사 인덱스 부착 (디스크 캐시가 있으면 로드, 없으면 빌드 후 저장)"""
+        key = rag_store.texts_key([index.meta.get("key", "")], self.model_id, kind="ivf")
+        cached = rag_store.load_arrays(key, mmap=self.mmap) if index.meta.get("key") else None
+        if cached is not None:
+            index.ann = IVFIndex.from_arrays(cached["arrays"], nprobe=ANN_NPROBE)
+            return
+        start = time.perf_counter()
+        index.build_ann()
+        logger.info(f"RAG IVF 인덱스 빌드: {len(index)} chunks, nlist={index.ann.nlist}, "
+                    f"{time.perf_counter() - start:.1f}s")
+        if index.meta.get("key"):
+            rag_store.save_arrays(key, index.ann.to_arrays(), meta={"nlist": index.ann.nlist})
+
+    def _load_or_embed_index(self, name: str, previous: Optional[VectorIndex] = None) -> VectorIndex:
+        """
+        인덱스 빌드: 같은 파일 내용의 캐시가 있으면 그대로 로드,
+        없으면 청크 해시가 같은 임베딩(현재 인덱스 + 마지막 스냅샷)을 재사용하고 새/변경 청크만 임베딩
+        """
+        files = self.corpus_files(name)
+        if not files:
+            logger.warning(f"⚠️ RAG 파일을 찾을 수 없습니다: {self.corpus[name]}")
+            return VectorIndex.empty()
+        # structured 분할은 겹침이 없으므로 overlap을 키에서 제외
+        overlap = self.overlap if self.chunker == "window" else 0
+        key = rag_store.index_key(files, self.chunk_size, overlap, self.model_id, chunker=self.chunker)
+        if previous is not None and previous.meta.get("key") == key:
+            return previous
+        cached = rag_store.load_index(key, mmap=self.mmap)
+        if cached is not None:
+            # embedded/reused는 이번 로드 기준 (저장된 meta의 값은 캐시를 만든 빌드의 것)
+            meta = dict(cached["meta"], key=key, embedded=0, reused=len(cached["chunks"]))
+            return self._open_index(key, cached["chunks"], cached["embeddings"], meta)
+        chunks, meta = self._split_files(files)
+        if not chunks:
+            return VectorIndex.empty()
+
+        pool: Dict[str, np.ndarray] = {}
+        sources: List[Any] = [rag_store.load_index(self._snapshot_key(name))]
+        if previous is not None and previous.dtype != "float32":
+            # 양자화된 행은 손실이 있으므로 재사용 임베딩은 디스크의 float32 원본에서 가져온다.
+            previous = rag_store.load_index(previous.meta["key"]) if previous.meta.get("key") else None
+        sources.append(previous)
+        for source in sources:
+            if source is None:
+                continue
+            rows = source["embeddings"] if isinstance(source, dict) else source.matrix
+            texts = source["chunks"] if isinstance(source, dict) else source.chunks
+            for text, row in zip(texts, normalize_rows(rows)):
+                pool[rag_store.chunk_hash(text)] = row
+        hashes = [rag_store.chunk_hash(text) for text in chunks]
+        missing = [i for i, h in enumerate(hashes) if h not in pool]
+        if missing:
+            embedded = normalize_rows(self.embedder.embed([chunks[i] for i in missing]))
+            pool.update((hashes[i], row) for i, row in zip(missing, embedded))
+        matrix = np.stack([pool[h] for h in hashes]).astype(np.float32)
+
+        meta.update(source=", ".join(files), normalized=True, key=key, chunker=self.chunker,
+                    embedded=len(missing), reused=len(chunks) - len(missing))
+        logger.info(f"RAG 인덱스 빌드 ({name}): 청크 {len(chunks)}개 중 {len(missing)}개 임베딩, "
+                    f"{len(chunks) - len(missing)}개 재사용")
+        rag_store.save_index(key, chunks, matrix, meta=meta)
+        rag_store.save_index(self._snapshot_key(name), chunks, matrix, meta=meta)
+        if self.mmap:
+            # 방금 저장한 파일을 매핑해 이후 뜨는 워커들과 같은 물리 메모리를 사용
+            cached = rag_store.load_index(key, mmap=True)
+            if cached is not None:
+                matrix = cached["embeddings"]
+        return self._open_index(key, chunks, matrix, meta)
+
+    def _open_index(self, key: str, chunks: List[str], matrix: np.ndarray, meta: Dict[str, Any]) -> VectorIndex:
+        """
+        float32 행렬 → 저장 형식(embedding_dtype)의 VectorIndex
+        양자화 결과도 디스크에 캐시해 두고 매핑으로 열어 워커마다 다시 양자화하지 않는다.
+        """
+        normalized = meta.get("normalized", False)
+        if self.embedding_dtype == "float32":
+            return VectorIndex(chunks, matrix, normalized=normalized, meta=meta)
+        qkey = rag_store.texts_key([key], self.model_id, kind=self.embedding_dtype)
+        vectors = None
+        cached = rag_store.load_arrays(qkey, mmap=self.mmap)
+        if cached is None:
+            vectors = QuantizedMatrix.from_float(matrix if normalized else normalize_rows(matrix), self.embedding_dtype)
+            rag_store.save_arrays(qkey, vectors.to_arrays(), meta={"dtype": self.embedding_dtype})
+            if self.mmap:
+                cached = rag_store.load_arrays(qkey, mmap=True)
+        if cached is not None:
+            vectors = QuantizedMatrix.from_arrays(cached["arrays"])
+        return VectorIndex(chunks, vectors, meta=meta)
+
+    def reload(self, names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        코퍼스 파일을 다시 읽어 바뀐 인덱스만 증분 재빌드 후 원자적으로 교체
+        진행 중인 검색은 교체 전 인덱스 객체로 끝까지 처리된다.
+        """
+        self.load()
+        with self._reload_lock:
+            current = self._indexes
+            report: Dict[str, Dict[str, Any]] = {}
+            updated = dict(current)
+            for name in names or list(self.corpus):
+                before = current.get(name)
+                start = time.perf_counter()
+                try:
+                    index = self._build_index(name, previous=before)
+                except Exception as e:
+                    logger.error(f"⚠️ RAG 인덱스 재빌드 오류 ({name}): {e}")
+                    report[name] = {"changed": False, "error": str(e)}
+                    continue
+                changed = index is not before
+                updated[name] = index
+                report[name] = {
+                    "changed": changed,
+                    "files": self.corpus_files(name),
+                    "chunks": len(index),
+                    "embedded": index.meta.get("embedded", 0) if changed else 0,
+                    "reused": index.meta.get("reused", len(index)) if changed else len(index),
+                    "seconds": round(time.perf_counter() - start, 3),
+                }
+            if any(r.get("changed") for r in report.values()):
+                tones = self._build_tone_context(updated) if self.tone_weights else None
+                with self._lock:
+                    # 인덱스 dict와 톤 컨텍스트를 통째로 바꿔 끼움 (참조 교체는 원자적)
+                    self._indexes = updated
+                    self._tones = tones
+                for name, index in updated.items():
+                    self._lexical_for(name, index)
+                logger.info(f"🔄 RAG 인덱스 교체 완료: {report}")
+            return report
+
+    def chunk_meta(self, name: str, position: int) -> Optional[Dict[str, Any]]:
+        """청크 메타데이터 (source, section, seasons, start, end), structured 분할이 아니면 None"""
+        rows = self.get_index(name).meta.get("chunk_meta")
+        return rows[position] if rows and 0 <= position < len(rows) else None
+
+    def index_stats(self) -> Dict[str, Dict[str, Any]]:
+        """인덱스별 청크 수/크기 통계 (임베딩 저장 형식, 차원, 메모리 사용량, 계절별 후보 수 포함)"""
+        self.load()
+        tone_stats = self._tones.stats() if self._tones is not None else {}
+        stats = {}
+        for name, index in self._indexes.items():
+            chunk_stats = index.meta.get("chunk_stats")
+            if chunk_stats is None:
+                sizes = [len(chunk) for chunk in index.chunks]
+                chunk_stats = {"count": len(sizes), "total_chars": sum(sizes),
+                               "min_chars": min(sizes, default=0), "max_chars": max(sizes, default=0),
+                               "mean_chars": round(sum(sizes) / len(sizes), 1) if sizes else 0.0}
+            stats[name] = dict(chunk_stats, chunker=index.meta.get("chunker", "window"),
+                               embedder=self.model_id, dtype=index.dtype, dim=index.dim,
+                               embedding_bytes=index.nbytes,
+                               mapped=rag_store.is_mapped(index.vectors.data),
+                               ann=f"ivf(nlist={index.ann.nlist}, nprobe={index.ann.nprobe})" if index.ann else None,
+                               tone_candidates=tone_stats.get(name))
+        return stats
+
+    def get_index(self, name: str) -> VectorIndex:
+        self.load()
+        if name not in self._indexes:
+            raise KeyError(f"등록되지 않은 RAG 인덱스입니다: {name}")
+        return self._indexes[name]
+
+    @property
+    def corpus_version(self) -> str:
+        """로드된 인덱스 내용에 대한 버전 문자열 (코퍼스 파일이 바뀌면 달라짐)"""
+        self.load()
+        raw = "|".join(f"{name}:{self._indexes[name].meta.get('key', '')}" for name in sorted(self._indexes))
+        if self._option_embeddings is not None:
+            raw += f"|options:{self._option_embeddings.meta.get('key', '')}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+    def has_chunks(self, name: str) -> bool:
+        return len(self.get_index(name)) > 0
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """텍스트 리스트 → (n, d) float32 임베딩 행렬"""
+        return np.asarray(self.embedder.embed(texts), dtype=np.float32)
+
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """쿼리 임베딩 (캐시 적중 시 API 호출 없음, 미스만 모아 한 번에 호출)"""
+        return self.query_cache.get_or_embed(self.model_id, queries, self.embed)
+
+    def search(self, query: str, index: str, k: int = 3) -> List[SearchResult]:
+        """쿼리와 유사한 상위 k개 청크 검색"""
+        return self.search_batch([query], index, k)[0]
+
+    def search_batch(self, queries: List[str], index: str, k: int = 3) -> List[List[SearchResult]]:
+        """여러 쿼리를 임베딩 호출 1회 + 행렬 곱 1회로 검색"""
+        target = self.get_index(index)
+        if not queries:
+            return []
+        if len(target) == 0:
+            return [[] for _ in queries]
+        ids, scores = target.search_batch(self.embed_queries(queries), k)
+        return [
+            [SearchResult(target.chunks[i], float(score), index, int(i)) for i, score in zip(row_ids, row_scores)]
+            for row_ids, row_scores in zip(ids, scores)
+        ]
+
+    def search_texts(self, query: str, index: str, k: int = 3) -> List[str]:
+        """search() 결과의 청크 텍스트만 반환"""
+        return [r.text for r in self.search(query, index, k)]
+
+    def search_vector_multi(self, query_vec: np.ndarray, ks: Dict[str, int]) -> Dict[str, List[SearchResult]]:
+        """이미 임베딩된 쿼리 벡터 하나로 여러 인덱스를 검색 → {인덱스 이름: top-k 결과}"""
+        results = {}
+        for name, k in ks.items():
+            target = self.get_index(name)
+            results[name] = [
+                SearchResult(target.chunks[i], score, name, i)
+                for i, score in target.search(query_vec, k)
+            ]
+        return results
+
+    def _lexical_for(self, name: str, index: VectorIndex) -> BM25Index:
+        """인덱스와 같은 청크에 대한 BM25 역색인 (인덱스가 교체되면 다시 빌드)"""
+        cached = self._lexical.get(name)
+        if cached is None or cached[0] is not index:
+            cached = (index, BM25Index(index.chunks))
+            self._lexical[name] = cached
+        return cached[1]
+
+    def search_lexical_multi(self, query: str, ks: Dict[str, int]) -> Dict[str, List[SearchResult]]:
+        """BM25만으로 여러 인덱스 검색 (임베딩 호출 없음)"""
+        results = {}
+        for name, k in ks.items():
+            target = self.get_index(name)
+            lexical = self._lexical_for(name, target)
+            results[name] = [SearchResult(target.chunks[i], score, name, i) for i, score in lexical.search(query, k)]
+        return results
+
+    def search_hybrid_multi(self, query: str, query_vec: np.ndarray, ks: Dict[str, int],
+                            alpha: Optional[float] = None) -> Dict[str, List[SearchResult]]:
+        """
+        BM25 점수와 벡터 유사도를 정규화해 합친 점수로 여러 인덱스 검색
+        IVF가 부착된 큰 인덱스는 ANN 후보 + BM25 상위 후보의 합집합 안에서만 합산
+        """
+        alpha = self.hybrid_alpha if alpha is None else alpha
+        query_vec = normalize_rows(query_vec)[0]
+        results = {}
+        for name, k in ks.items():
+            target = self.get_index(name)
+            lexical = self._lexical_for(name, target).scores(query)
+            if target.ann is not None:
+                pool = max(k * 10, 50)
+                dense_ids, _ = target.search_batch(query_vec.reshape(1, -1), pool)
+                lexical_ids, _ = top_k_rows(lexical.reshape(1, -1), pool)
+                rows = np.union1d(dense_ids[0], lexical_ids[0])
+                dense = target.vectors[rows] @ query_vec
+            else:
+                rows = np.arange(len(target))
+                dense = target.vectors @ query_vec
+            fused = fuse_scores(lexical[rows], dense, alpha)
+            ids, scores = top_k_rows(fused.reshape(1, -1), k)
+            results[name] = [SearchResult(target.chunks[rows[i]], float(score), name, int(rows[i]))
+                             for i, score in zip(ids[0], scores[0])]
+        return results
+
+    def search_multi(self, query: str, ks: Dict[str, int], mode: Optional[str] = None) -> Dict[str, List[SearchResult]]:
+        """
+        쿼리 하나로 여러 인덱스를 검색 (예: {"personal_color": 3, "beauty_trend": 2})
+        mode: vector(쿼리 임베딩 1회) / bm25(임베딩 없음) / hybrid (기본값은 RAG_SEARCH_MODE)
+        hybrid에서 쿼리 임베딩이 실패하면 BM25 결과로 응답
+        """
+        mode = mode or self.search_mode
+        targets = {name: k for name, k in ks.items() if len(self.get_index(name)) > 0}
+        results = {name: [] for name in ks}
+        if not targets:
+            return results
+        if mode == "bm25":
+            results.update(self.search_lexical_multi(query, targets))
+            return results
+        try:
+            query_vec = self.embed_queries([query])[0]
+        except Exception as e:
+            if mode != "hybrid":
+                raise
+            logger.warning(f"⚠️ 쿼리 임베딩 실패, BM25 검색으로 대체합니다: {e}")
+            results.update(self.search_lexical_multi(query, targets))
+            return results
+        if mode == "hybrid":
+            results.update(self.search_hybrid_multi(query, query_vec, targets))
+        else:
+            results.update(self.search_vector_multi(query_vec, targets))
+        return results
+
+    def search_texts_multi(self, query: str, ks: Dict[str, int], mode: Optional[str] = None) -> Dict[str, List[str]]:
+        """search_multi() 결과의 청크 텍스트만 반환"""
+        return {name: [r.text for r in rows] for name, rows in self.search_multi(query, ks, mode).items()}
+
+    def compose_answers(self, answers: Iterable[Any], weights=None) -> Optional[np.ndarray]:
+        """설문 답변 → 선택지 임베딩 가중 평균 쿼리 벡터 (선택지 임베딩이 없거나 모르는 선택지면 None)"""
+        self.load()
+        if self._option_embeddings is None:
+            return None
+        return self._option_embeddings.compose(answers, weights)
+
+    def search_answers_multi(self, answers: Iterable[Any], ks: Dict[str, int],
+                             fallback_query: str) -> Dict[str, List[SearchResult]]:
+        """
+        설문 답변으로 여러 인덱스 검색 (임베딩 API 호출 없음)
+        합성할 수 없는 답변이면 fallback_query 텍스트를 임베딩해 search_multi()로 검색
+        """
+        query_vec = self.compose_answers(answers)
+        if query_vec is None:
+            return self.search_multi(fallback_query, ks)
+        targets = {name: k for name, k in ks.items() if len(self.get_index(name)) > 0}
+        results = {name: [] for name in ks}
+        results.update(self.search_vector_multi(query_vec, targets))
+        return results
+
+    def search_answers_texts_multi(self, answers: Iterable[Any], ks: Dict[str, int],
+                                   fallback_query: str) -> Dict[str, List[str]]:
+        """search_answers_multi() 결과의 청크 텍스트만 반환"""
+        return {name: [r.text for r in rows]
+                for name, rows in self.search_answers_multi(answers, ks, fallback_query).items()}
+
+    def has_tone(self, tone: Optional[str]) -> bool:
+        self.load()
+        return self._tones is not None and tone in self.tone_weights
+
+    def search_tone_multi(self, tone: str, ks: Dict[str, int], answers: Optional[Iterable[Any]] = None,
+                          query: Optional[str] = None) -> Dict[str, List[SearchResult]]:
+        """
+        계절별 사전 계산 후보 안에서만 검색 (임베딩 API 호출 없음)
+        query(사용자 질문)가 있으면 후보의 BM25 점수로, answers가 있으면 선택지 임베딩 합성 벡터 유사도로
+        재정렬하고 둘 다 있으면 hybrid 검색과 같은 방식(hybrid_alpha)으로 합산,
+        둘 다 없으면 미리 정한 순서 그대로 사용
+        """
+        if not self.has_tone(tone):
+            raise KeyError(f"사전 계산된 톤 컨텍스트가 없습니다: {tone}")
+        query_vec = self.compose_answers(answers) if answers is not None else None
+        tones = self._tones
+        results = {}
+        for name, k in ks.items():
+            target = tones.indexes[name]
+            rows = tones.lookup(name, tone)
+            if rows is None:
+                results[name] = []
+                continue
+            dense = (target.vectors[rows] @ query_vec
+                     if query_vec is not None and target.dim == query_vec.shape[0] else None)
+            lexical = self._lexical_for(name, target).scores(query)[rows] if query else None
+            if dense is not None and lexical is not None:
+                scores = fuse_scores(lexical, dense, self.hybrid_alpha)
+            else:
+                scores = dense if dense is not None else lexical
+            if scores is not None:
+                order = np.argsort(-scores, kind="stable")[:k]
+                results[name] = [SearchResult(target.chunks[rows[i]], float(scores[i]), name, int(rows[i]))
+                                 for i in order]
+            else:
+                results[name] = [SearchResult(target.chunks[i], 0.0, name, int(i)) for i in rows[:k]]
+        return results
+
+    def search_tone_texts_multi(self, tone: str, ks: Dict[str, int], answers: Optional[Iterable[Any]] = None,
+                                query: Optional[str] = None) -> Dict[str, List[str]]:
+        """search_tone_multi() 결과의 청크 텍스트만 반환"""
+        return {name: [r.text for r in rows]
+                for name, rows in self.search_tone_multi(tone, ks, answers, query).items()}
+
+
+_service: Optional[RagService] = None
+_service_lock = threading.Lock()
+
+
+def get_rag_service(client: Optional[OpenAI] = None) -> RagService:
+    """프로세스 공용 RagService (최초 호출 시 생성)"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = RagService(client, options=option_texts(),
+                                      tone_weights=season_option_weights())
+    return _service
@@ -0,0 +1,210 @@
+# rag/store.py
+#
+# RAG 인덱스 디스크 캐시 (content-addressed)
+# - 키: 원본 파일 해시 + 청크 분할 방식/chunk_size/overlap + 임베딩 모델
+# - 값: 청크 텍스트 + 임베딩 행렬을 담은 단일 바이너리 파일 (.ragidx)
+#
+# 파일 구조:
+#   MAGIC(8B) | 헤더 길이(uint32, LE) | 헤더 JSON(UTF-8) | padding | 배열 데이터...
+#   각 배열은 64바이트 경계에 정렬되어 있어 그대로 numpy로 읽을 수 있다.
+# - mmap=True로 읽으면 배열을 복사하지 않고 파일을 읽기 전용으로 매핑한다 (np.memmap).
+#   같은 파일을 여는 워커 프로세스들이 OS 페이지 캐시의 물리 메모리 한 벌을 공유하고, 로드는 헤더만 읽는다.
+#   파일은 os.replace로만 교체하므로 매핑 중인 이전 파일 내용은 바뀌지 않는다.
+
+import os
+import json
+import struct
+import hashlib
+import logging
+import tempfile
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RAG_CACHE_DIR = os.getenv("RAG_CACHE_DIR", ".rag_cache")
+RAG_MMAP = os.getenv("RAG_MMAP", "true").lower() in ("1", "true", "yes")  # 캐시 배열을 메모리 매핑으로 공유
+
+MAGIC = b"RAGIDX01"
+FORMAT_VERSION = 1
+_ALIGN = 64
+_HEADER_LEN = struct.Struct("<I")
+
+
+def _align(n: int) -> int:
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def file_sha256(filepath: str) -> str:
+    """파일 내용의 sha256 해시"""
+    h = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def chunk_hash(text: str) -> str:
+    """청크 본문의 sha256 (증분 재임베딩 시 재사용 판단용)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def index_key(filepaths: Union[str, Sequence[str]], chunk_size: int, overlap: int, model: str,
+              chunker: str = "window") -> str:
+    """인덱스 캐시 키 생성 (내용이 같으면 경로가 달라도 같은 키, 여러 파일이면 순서대로 합친 내용 기준)"""
+    paths = [filepaths] if isinstance(filepaths, str) else list(filepaths)
+    content = (file_sha256(paths[0]) if len(paths) == 1
+               else hashlib.sha256("\n".join(file_sha256(p) for p in paths).encode("utf-8")).hexdigest())
+    params = {
+        "content": content,
+        "chunker": chunker,
+        "chunk_size": chunk_size,
+        "overlap": overlap,
+        "model": model,
+        "format": FORMAT_VERSION,
+    }
+    raw = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def texts_key(texts: List[str], model: str, kind: str) -> str:
+    """파일이 아닌 고정 텍스트 목록(예: 설문 선택지)의 임베딩 캐시 키"""
+    params = {
+        "texts": hashlib.sha256("\n".join(texts).encode("utf-8")).hexdigest(),
+        "kind": kind,
+        "model": model,
+        "format": FORMAT_VERSION,
+    }
+    raw = json.dumps(params, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def index_path(key: str, cache_dir: Optional[str] = None) -> str:
+    return os.path.join(cache_dir or RAG_CACHE_DIR, f"{key}.ragidx")
+
+
+def write_index_file(path: str, chunks: List[str], arrays: Dict[str, np.ndarray],
+                     meta: Optional[Dict[str, Any]] = None) -> None:
+    """청크 + numpy 배열들을 하나의 파일로 원자적으로 저장"""
+    layout = {}
+    offset = 0
+    for name, arr in arrays.items():
+        arr = np.ascontiguousarray(arr)
+        arrays[name] = arr
+        layout[name] = {"dtype": arr.dtype.str, "shape": list(arr.shape), "offset": offset}
+        offset = _align(offset + arr.nbytes)
+
+    header = json.dumps({
+        "version": FORMAT_VERSION,
+        "meta": meta or {},
+        "chunks": chunks,
+        "arrays": layout,
+    }, ensure_ascii=False).encode("utf-8")
+    data_start = _align(len(MAGIC) + _HEADER_LEN.size + len(header))
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LEN.pack(len(header)))
+            f.write(header)
+            for name, arr in arrays.items():
+                f.seek(data_start + layout[name]["offset"])
+                f.write(arr.tobytes())
+            f.truncate(f.tell())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def read_index_file(path: str, mmap: bool = False) -> Dict[str, Any]:
+    """write_index_file로 저장한 파일 로드 → {"chunks", "arrays", "meta"} (mmap=True면 배열은 읽기 전용 매핑)"""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"RAG 인덱스 파일 형식이 아닙니다: {path}")
+        (header_len,) = _HEADER_LEN.unpack(f.read(_HEADER_LEN.size))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 RAG 인덱스 버전입니다: {header.get('version')}")
+        data_start = _align(len(MAGIC) + _HEADER_LEN.size + header_len)
+
+        arrays = {}
+        for name, spec in header["arrays"].items():
+            dtype = np.dtype(spec["dtype"])
+            shape = tuple(spec["shape"])
+            count = int(np.prod(shape)) if shape else 1
+            if mmap and count:
+                arrays[name] = np.asarray(np.memmap(path, dtype=dtype, mode="r", shape=shape,
+                                                    offset=data_start + spec["offset"]))
+                continue
+            f.seek(data_start + spec["offset"])
+            arrays[name] = np.fromfile(f, dtype=dtype, count=count).reshape(shape)
+    return {"chunks": header["chunks"], "arrays": arrays, "meta": header.get("meta", {})}
+
+
+def is_mapped(arr: np.ndarray) -> bool:
+    """배열이 파일 매핑(mmap=True 로드) 위에 있는지"""
+    base = arr
+    while base is not None:
+        if isinstance(base, np.memmap):
+            return True
+        base = getattr(base, "base", None)
+    return False
+
+
+def load_index(key: str, cache_dir: Optional[str] = None, mmap: bool = False) -> Optional[Dict[str, Any]]:
+    """캐시된 인덱스 로드. 없거나 손상되었으면 None"""
+    path = index_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        data = read_index_file(path, mmap=mmap)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"⚠️ RAG 인덱스 캐시를 읽을 수 없어 다시 생성합니다: {path} ({e})")
+        return None
+    embeddings = data["arrays"]["embeddings"]
+    logger.info(f"📦 RAG 인덱스 캐시 로드: {path} ({embeddings.shape[0]} chunks)")
+    return {"chunks": data["chunks"], "embeddings": embeddings, "meta": data["meta"]}
+
+
+def save_index(key: str, chunks: List[str], embeddings: Union[np.ndarray, List[List[float]]],
+               meta: Optional[Dict[str, Any]] = None, cache_dir: Optional[str] = None) -> None:
+    """인덱스를 캐시에 저장 (실패해도 서비스는 계속 동작)"""
+    if not chunks:
+        return
+    path = index_path(key, cache_dir)
+    matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(chunks), -1)
+    try:
+        write_index_file(path, list(chunks), {"embeddings": matrix}, meta)
+        logger.info(f"💾 RAG 인덱스 캐시 저장: {path}")
+    except OSError as e:
+        logger.warning(f"⚠️ RAG 인덱스 캐시 저장 실패: {path} ({e})")
+
+
+def load_arrays(key: str, cache_dir: Optional[str] = None, mmap: bool = False) -> Optional[Dict[str, Any]]:
+    """청크 없이 배열만 저장한 파일 로드 (예: ANN 인덱스) → {"arrays", "meta"}, 없거나 손상되었으면 None"""
+    path = index_path(key, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        data = read_index_file(path, mmap=mmap)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"⚠️ RAG 캐시를 읽을 수 없어 다시 생성합니다: {path} ({e})")
+        return None
+    return {"arrays": data["arrays"], "meta": data["meta"]}
+
+
+def save_arrays(key: str, arrays: Dict[str, np.ndarray], meta: Optional[Dict[str, Any]] = None,
+                cache_dir: Optional[str] = None) -> None:
+    """배열만 캐시에 저장 (실패해도 서비스는 계속 동작)"""
+    path = index_path(key, cache_dir)
+    try:
+        write_index_file(path, [], dict(arrays), meta)
+        logger.info(f"💾 RAG 캐시 저장: {path}")
+    except OSError as e:
+        logger.warning(f"⚠️ RAG 캐시 저장 실패: {path} ({e})")
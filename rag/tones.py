@@ -0,0 +1,110 @@
+# rag/tones.py
+#
+# 계절(톤)별 사전 계산 컨텍스트
+# - 인덱스 로드 시 청크마다 계절 태그를 붙이고 (섹션 제목의 계절명, 제목에 없으면 본문의 계절명),
+#   계절별 상위 청크 후보 목록을 미리 만들어 둔다.
+#   웜/쿨 같은 키워드는 두 계절에 걸치고, 본문은 다른 계절과 비교하는 문장이 많아 제목을 우선한다.
+# - 계절 순위는 선택지 임베딩을 규칙 기반 가중치로 합성한 "톤 벡터"와의 유사도로 정한다
+#   → 빌드에도 조회에도 추가 임베딩 호출이 없다.
+# - 설문 결과가 있는 챗봇 요청은 톤 후보 목록 조회(O(1)) + 후보 안에서만 재정렬한다.
+#   (사용자 질문의 BM25 점수 + 설문 답변 합성 벡터 유사도, rag.service.search_tone_multi)
+
+import os
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from rag.index import VectorIndex
+
+TONE_CANDIDATES = int(os.getenv("RAG_TONE_CANDIDATES", "12"))  # 인덱스·계절별 후보 청크 수
+
+# 청크 태깅에 쓰는 계절 이름
+SEASON_NAMES: Mapping[str, str] = {
+    "봄": "spring",
+    "여름": "summer",
+    "가을": "autumn",
+    "겨울": "winter",
+    "spring": "spring",
+    "summer": "summer",
+    "autumn": "autumn",
+    "winter": "winter",
+}
+
+
+def _count_names(text: str) -> Dict[str, int]:
+    lowered = text.lower()
+    counts: Dict[str, int] = {}
+    for name, season in SEASON_NAMES.items():
+        hits = lowered.count(name)
+        if hits:
+            counts[season] = counts.get(season, 0) + hits
+    return counts
+
+
+def tag_chunk(text: str, section: str = "") -> Dict[str, int]:
+    """
+    청크 → {계절: 계절명 등장 횟수} (언급이 없는 계절은 빠짐)
+    섹션 제목("상위 > 하위")에 계절명이 있으면 가장 안쪽 제목의 계절만 태그 (횟수는 본문 언급 + 1)
+    """
+    body = _count_names(text)
+    for heading in reversed(section.split(" > ")):
+        named = _count_names(heading)
+        if named:
+            return {season: body.get(season, 0) + 1 for season in named}
+    return body
+
+
+class ToneContext:
+    """(인덱스 이름, 계절) → 미리 정렬된 후보 청크 위치"""
+
+    def __init__(self, candidates: Dict[Tuple[str, str], np.ndarray],
+                 tags: Dict[str, List[FrozenSet[str]]], indexes: Optional[Mapping[str, VectorIndex]] = None):
+        self.candidates = candidates
+        self.tags = tags
+        # 후보 위치가 가리키는 인덱스 (인덱스가 교체되어도 같은 스냅샷으로 조회)
+        self.indexes = dict(indexes or {})
+
+    @classmethod
+    def build(cls, indexes: Mapping[str, VectorIndex], seasons: Sequence[str],
+              tone_vectors: Optional[Mapping[str, np.ndarray]] = None,
+              size: int = TONE_CANDIDATES) -> "ToneContext":
+        candidates: Dict[Tuple[str, str], np.ndarray] = {}
+        tags: Dict[str, List[FrozenSet[str]]] = {}
+        for name, index in indexes.items():
+            # 구조 기반 분할이면 섹션 제목의 계절명을 우선
+            sections = [meta.get("section", "") for meta in index.meta.get("chunk_meta") or ()]
+            sections += [""] * (len(index.chunks) - len(sections))
+            counts = [tag_chunk(chunk, section) for chunk, section in zip(index.chunks, sections)]
+            tags[name] = [frozenset(c) for c in counts]
+            general = np.array([not c for c in counts], dtype=bool)
+            for season in seasons:
+                hits = np.array([c.get(season, 0) for c in counts], dtype=np.float32)
+                vec = (tone_vectors or {}).get(season)
+                if vec is not None and len(index) and index.dim == vec.shape[0]:
+                    similarity = index.vectors @ vec
+                else:
+                    similarity = np.zeros(len(index), dtype=np.float32)
+                # 태그된 청크를 톤 벡터 유사도 순으로 먼저, 모자라면 어느 계절에도 태그되지 않은 청크 중
+                # 유사도 순으로 채움 (다른 계절 청크는 후보에 넣지 않음)
+                tagged = np.flatnonzero(hits > 0)
+                untagged = np.flatnonzero(general)
+                tagged = tagged[np.lexsort((-hits[tagged], -similarity[tagged]))]
+                rows = list(tagged[:size])
+                if len(rows) < size and vec is not None:
+                    untagged = untagged[np.argsort(-similarity[untagged], kind="stable")]
+                    rows.extend(untagged[:size - len(rows)])
+                candidates[(name, season)] = np.asarray(rows, dtype=np.int64)
+        return cls(candidates, tags, indexes)
+
+    def lookup(self, name: str, season: str) -> Optional[np.ndarray]:
+        """후보 청크 위치 (계절 후보가 없으면 None)"""
+        rows = self.candidates.get((name, season))
+        return rows if rows is not None and len(rows) else None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """인덱스별 {계절: 후보 청크 수}"""
+        return {
+            name: {season: len(self.candidates.get((name, season), ()))
+                   for season in sorted({s for (n, s) in self.candidates if n == name})}
+            for name in self.tags
+        }
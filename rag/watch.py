@@ -0,0 +1,78 @@
+# rag/watch.py
+#
+# RAG 코퍼스 디렉터리 감시
+# - 주기적으로 코퍼스 파일 목록/수정 시각/크기를 비교해 바뀌면 RagService.reload() 실행
+# - reload는 새/변경 청크만 임베딩하고 인덱스를 원자적으로 교체하므로 재시작이 필요 없다.
+# - 외부 의존성(watchdog 등) 없이 asyncio 폴링으로 동작
+
+import os
+import asyncio
+import glob
+import logging
+from typing import Dict, Optional, Tuple
+
+from services.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+RAG_WATCH_INTERVAL = float(os.getenv("RAG_WATCH_INTERVAL", "0"))  # 초, 0이면 감시하지 않음
+
+
+def corpus_fingerprint(service) -> Dict[str, Tuple[int, int]]:
+    """코퍼스 패턴에 걸리는 파일 → (수정 시각 ns, 크기)"""
+    fingerprint = {}
+    for pattern in service.corpus.values():
+        for path in glob.glob(pattern):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            fingerprint[path] = (st.st_mtime_ns, st.st_size)
+    return fingerprint
+
+
+class CorpusWatcher:
+    """코퍼스 파일이 바뀌면 인덱스를 증분 재빌드하는 백그라운드 작업"""
+
+    def __init__(self, service, interval: float = RAG_WATCH_INTERVAL):
+        self.service = service
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._last: Dict[str, Tuple[int, int]] = {}
+        self.reloads = 0
+
+    async def start(self) -> None:
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._last = corpus_fingerprint(self.service)
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"👀 RAG 코퍼스 감시 시작 ({self.interval:g}초 간격)")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def check(self) -> bool:
+        """한 번 비교해서 바뀌었으면 reload (바뀌었으면 True)"""
+        current = corpus_fingerprint(self.service)
+        if current == self._last:
+            return False
+        logger.info("📝 RAG 코퍼스 변경 감지, 인덱스를 다시 빌드합니다.")
+        await run_blocking(self.service.reload)
+        self._last = current
+        self.reloads += 1
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"⚠️ RAG 코퍼스 감시 오류: {e}")
@@ -0,0 +1,48 @@
+# routers/admin_router.py
+#
+# 운영용 관리 API (RAG_ADMIN_TOKEN 환경변수로 보호, 미설정 시 비활성)
+
+import os
+import hmac
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from dotenv import load_dotenv
+
+from rag.service import get_rag_service
+from services.executor import run_blocking
+
+load_dotenv()
+RAG_ADMIN_TOKEN = os.getenv("RAG_ADMIN_TOKEN", "")
+
+router = APIRouter(prefix="/api/admin", tags=["Admin"])
+
+rag_service = get_rag_service()
+
+def require_admin_token(x_admin_token: str = Header(default="")):
+    if not RAG_ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="관리 API가 비활성화되어 있습니다. (RAG_ADMIN_TOKEN 미설정)"
+        )
+    if not hmac.compare_digest(x_admin_token, RAG_ADMIN_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="관리자 토큰이 올바르지 않습니다."
+        )
+
+@router.post("/rag/reload")
+async def reload_rag_index(_: None = Depends(require_admin_token)):
+    """
+    data/RAG 코퍼스를 다시 읽어 바뀐 인덱스만 증분 재빌드 후 무중단 교체
+    """
+    report = await run_blocking(rag_service.reload)
+    print(f"▶ RAG 인덱스 재빌드: {report}")
+    return {"corpus_version": rag_service.corpus_version, "indexes": report}
+
+@router.get("/rag/status")
+async def rag_index_status(_: None = Depends(require_admin_token)):
+    return {
+        "corpus_version": rag_service.corpus_version,
+        "files": {name: rag_service.corpus_files(name) for name in rag_service.corpus},
+        "indexes": rag_service.index_stats(),
+    }
@@ -1,26 +1,24 @@
 # routers/chatbot_router.py
 
-import os
 import json
-from typing import List, Dict, Any
-from math import sqrt
+from typing import List
 
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from openai import OpenAI
 from dotenv import load_dotenv
 from sqlalchemy.orm import Session
 
 import models
 from routers.user_router import get_current_user
 from database import SessionLocal
+from rag.service import get_rag_service
+from services.executor import run_blocking
+from services.sse import IncrementalJSONParser, SSE_HEADERS, format_sse
+from openai_client import get_openai_client, get_async_openai_client
 
 load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise RuntimeError("환경변수 OPENAI_API_KEY가 설정되지 않았습니다.")
 
-client = OpenAI(api_key=OPENAI_API_KEY)
 router = APIRouter(prefix="/api/chatbot", tags=["Chatbot"])
 
 # DB 세션 의존성 (에러 로깅 추가)
@@ -37,46 +35,8 @@ def get_db():
         db.close()
         print("▶ DB 세션 종료")
 
-# ---------------- 유틸 함수 ----------------
-def chunk_text(text: str, chunk_size: int = 800, overlap: int = 100) -> List[str]:
-    if overlap >= chunk_size:
-        raise ValueError("overlap은 chunk_size보다 작아야 합니다.")
-    chunks = []
-    start = 0
-    text_length = len(text)
-    while start < text_length:
-        end = min(start + chunk_size, text_length)
-        chunks.append(text[start:end])
-        if end == text_length:
-            break
-        start += (chunk_size - overlap)
-    return [c.strip() for c in chunks if c.strip()]
-
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    dot = sum(x * y for x, y in zip(a, b))
-    na = sqrt(sum(x * x for x in a)) or 1e-8
-    nb = sqrt(sum(x * x for x in b)) or 1e-8
-    return dot / (na * nb)
-
-def embed_texts(client: OpenAI, texts: List[str], model: str = "text-embedding-3-small") -> List[List[float]]:
-    res = client.embeddings.create(model=model, input=texts)
-    return [item.embedding for item in res.data]
-
-def top_k_chunks(query: str, index: Dict[str, Any], client: OpenAI, k: int = 3) -> List[str]:
-    q_emb = embed_texts(client, [query])[0]
-    sims = [(cosine_similarity(q_emb, emb), i) for i, emb in enumerate(index["embeddings"])]
-    sims.sort(reverse=True, key=lambda x: x[0])
-    return [index["chunks"][i] for _, i in sims[:k]]
-
-def build_rag_index(client: OpenAI, filepath: str) -> Dict[str, Any]:
-    with open(filepath, encoding="utf-8") as f:
-        text = f.read()
-    chunks = chunk_text(text, chunk_size=800, overlap=100)
-    embeddings = embed_texts(client, chunks)
-    return {"chunks": chunks, "embeddings": embeddings}
-
-fixed_index = build_rag_index(client, "data/RAG/personal_color_RAG.txt")
-trend_index = build_rag_index(client, "data/RAG/beauty_trend_2025_autumn_RAG.txt")
+# 공용 RAG 검색 서비스 (인덱스는 프로세스당 한 번만 로드)
+rag_service = get_rag_service()
 
 class ChatbotRequest(BaseModel):
     answers: List[str]
@@ -91,56 +51,61 @@ class ChatbotResponse(BaseModel):
 def health_check(current_user: models.User = Depends(get_current_user)):
     return {"status": "ok", "message": "Chatbot API is running"}
 
-@router.post("/analyze", response_model=ChatbotResponse)
-def analyze_personal_color(
-    request: ChatbotRequest,
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    try:
-        # 1. DB에서 사용자 최신 설문 결과 조회
-        survey_result = db.query(models.SurveyResult)\
-            .filter(models.SurveyResult.user_id == current_user.id)\
-            .order_by(models.SurveyResult.created_at.desc())\
-            .first()
-
-        # 2. 설문 결과 컨텍스트 생성 (최신 진단값 직접 포함)
-        survey_context = ""
-        if survey_result:
-            survey_context = (
-                f"[최신 설문 결과]\n"
-                f"진단 tone: {survey_result.result_tone}\n"
-                f"confidence: {survey_result.confidence}\n"
-                f"total_score: {survey_result.total_score}\n"
-            )
-            survey_context += "\n".join(
-                f"{ans.question_id}: {ans.option_label}"
-                for ans in survey_result.answers
-            )
-
-        # 3. 사용자 입력 + 설문 병합
-        query_part = " / ".join(request.answers).strip()
-        combined_query = (
-            f"{query_part}\n\n[사용자 설문 결과]\n{survey_context}"
-            if survey_context else query_part
+def build_chatbot_messages(request: ChatbotRequest, current_user: models.User, db: Session) -> list:
+    """
+    최신 설문 결과 + 사용자 입력 + RAG 컨텍스트로 LLM 메시지 생성
+    """
+    # 1. DB에서 사용자 최신 설문 결과 조회
+    survey_result = db.query(models.SurveyResult)\
+        .filter(models.SurveyResult.user_id == current_user.id)\
+        .order_by(models.SurveyResult.created_at.desc())\
+        .first()
+
+    # 2. 설문 결과 컨텍스트 생성 (최신 진단값 직접 포함)
+    survey_context = ""
+    if survey_result:
+        survey_context = (
+            f"[최신 설문 결과]\n"
+            f"진단 tone: {survey_result.result_tone}\n"
+            f"confidence: {survey_result.confidence}\n"
+            f"total_score: {survey_result.total_score}\n"
+        )
+        survey_context += "\n".join(
+            f"{ans.question_id}: {ans.option_label}"
+            for ans in survey_result.answers
         )
 
-        if not combined_query.strip():
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="answers 배열에 하나 이상의 답변이 필요합니다."
-            )
-
-        # 4. RAG 검색
-        fixed_chunks = top_k_chunks(combined_query, fixed_index, client, k=3)
-        trend_chunks = top_k_chunks(combined_query, trend_index, client, k=3)
-
-        # 5. 프롬프트 생성
-        prompt_system = (
-            "당신은 퍼스널컬러 전문가이자 최신 패션 트렌드 컨설턴트입니다. "
-            "사용자의 최신 설문 진단 결과(result_tone, confidence, total_score 등)를 반드시 참고해서 퍼스널컬러 리포트와 추천을 작성해 주세요."
+    # 3. 사용자 입력 + 설문 병합
+    query_part = " / ".join(request.answers).strip()
+    combined_query = (
+        f"{query_part}\n\n[사용자 설문 결과]\n{survey_context}"
+        if survey_context else query_part
+    )
+
+    if not combined_query.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="answers 배열에 하나 이상의 답변이 필요합니다."
         )
-        prompt_user = f"""
+
+    # 4. RAG 검색
+    #    설문 결과가 있으면 해당 계절의 사전 계산 후보만 사용자 질문(BM25) + 설문 답변 기준으로 재정렬 (임베딩 호출 없음)
+    #    없으면 쿼리 임베딩 1회로 불변/가변 지식 동시 검색
+    ks = {"personal_color": 3, "beauty_trend": 3}
+    if survey_result and rag_service.has_tone(survey_result.result_tone):
+        found = rag_service.search_tone_texts_multi(survey_result.result_tone, ks, answers=survey_result.answers,
+                                                    query=query_part or None)
+    else:
+        found = rag_service.search_texts_multi(combined_query, ks)
+    fixed_chunks = found["personal_color"]
+    trend_chunks = found["beauty_trend"]
+
+    # 5. 프롬프트 생성
+    prompt_system = (
+        "당신은 퍼스널컬러 전문가이자 최신 패션 트렌드 컨설턴트입니다. "
+        "사용자의 최신 설문 진단 결과(result_tone, confidence, total_score 등)를 반드시 참고해서 퍼스널컬러 리포트와 추천을 작성해 주세요."
+    )
+    prompt_user = f"""
 사용자 데이터:
 {combined_query}
 
@@ -157,38 +122,108 @@ JSON 형식으로 only 결과를 반환:
 - recommendations: 추천 리스트
 """
 
-        messages = [
-            {"role": "system", "content": prompt_system},
-            {"role": "user", "content": prompt_user}
-        ]
+    return [
+        {"role": "system", "content": prompt_system},
+        {"role": "user", "content": prompt_user}
+    ]
+
+def parse_chatbot_content(content: str) -> ChatbotResponse:
+    """
+    LLM 응답 텍스트 → ChatbotResponse
+    """
+    # JSON 파싱
+    start, end = content.find("{"), content.rfind("}")
+    if start == -1 or end == -1:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="JSON 결과를 찾을 수 없습니다."
+        )
+    data = json.loads(content[start:end+1])
+
+    # recommendations 리스트 보장
+    recs = data.get("recommendations")
+    if isinstance(recs, dict):
+        data["recommendations"] = recs.get("colors") or list(recs.values())[0]
+    if not isinstance(data["recommendations"], list):
+        data["recommendations"] = []
+
+    return ChatbotResponse(**data)
+
+@router.post("/analyze", response_model=ChatbotResponse)
+def analyze_personal_color(
+    request: ChatbotRequest,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    try:
+        messages = build_chatbot_messages(request, current_user, db)
 
-        # 6. LLM 호출
-        resp = client.chat.completions.create(
+        # LLM 호출
+        resp = get_openai_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
             temperature=0.3,
             max_tokens=600
         )
-        content = resp.choices[0].message.content
-
-        # 7. JSON 파싱
-        start, end = content.find("{"), content.rfind("}")
-        if start == -1 or end == -1:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="JSON 결과를 찾을 수 없습니다."
-            )
-        data = json.loads(content[start:end+1])
-
-        # 8. recommendations 리스트 보장
-        recs = data.get("recommendations")
-        if isinstance(recs, dict):
-            data["recommendations"] = recs.get("colors") or list(recs.values())[0]
-        if not isinstance(data["recommendations"], list):
-            data["recommendations"] = []
-
-        return ChatbotResponse(**data)
+        return parse_chatbot_content(resp.choices[0].message.content)
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+
+async def stream_chatbot_analysis(messages: list):
+    """
+    챗봇 분석 SSE 제너레이터
+    
+    이벤트: field(primary_tone, sub_tone) → text(description 조각) → item(recommendations 원소)
+           → done(ChatbotResponse 전체) | error
+    """
+    parser = IncrementalJSONParser(
+        scalars=("primary_tone", "sub_tone"),
+        strings=("description",),
+        arrays=("recommendations",),
+    )
+    try:
+        stream = await get_async_openai_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=0.3,
+            max_tokens=600,
+            stream=True
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            for event, payload in parser.feed(chunk.choices[0].delta.content or ""):
+                yield format_sse(event, payload)
+
+        yield format_sse("done", parse_chatbot_content(parser.buffer).model_dump())
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        yield format_sse("error", {"detail": f"서버 내부 오류: {e}"})
+
+@router.post("/analyze/stream")
+async def analyze_personal_color_stream(
+    request: ChatbotRequest,
+    current_user: models.User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    /analyze 의 SSE 스트리밍 버전 (text/event-stream)
+    """
+    try:
+        # DB 조회 + RAG 검색은 요청 세션이 살아있는 동안 전용 스레드 풀에서 처리
+        messages = await run_blocking(build_chatbot_messages, request, current_user, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"서버 내부 오류: {e}")
+
+    return StreamingResponse(
+        stream_chatbot_analysis(messages),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
@@ -1,24 +1,28 @@
 from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from database import SessionLocal
 import models, schemas
+import os
 import json
+import copy
+import asyncio
 from datetime import datetime, timezone
 from routers.user_router import get_current_user   # 인증 함수 import
-import os
-from openai import OpenAI
 import re
-from typing import List, Dict, Any
-from math import sqrt
 from dotenv import load_dotenv
+from rag.service import get_rag_service
+from services.analysis_cache import analysis_cache, analysis_key
+from services.executor import run_blocking
+from services.jobs import job_queue, QueueFullError
+from services.singleflight import analysis_flight
+from services.scoring import ToneScore, score_answers, compare_with_llm
+from services.catalog import SEASON_CATALOG, catalog_result, catalog_top_types, fill_type_entry, season_order
+from services.sse import IncrementalJSONParser, SSE_HEADERS, format_sse
+from openai_client import get_openai_client, get_async_openai_client
 
 # 환경 변수 로드
 load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-if not OPENAI_API_KEY:
-    raise RuntimeError("환경변수 OPENAI_API_KEY가 설정되지 않았습니다.")
-
-client = OpenAI(api_key=OPENAI_API_KEY)
 
 router = APIRouter(prefix="/api/survey")
 
@@ -29,73 +33,26 @@ def get_db():
     finally:
         db.close()
 
-# ============ RAG 관련 유틸 함수 ============
-def chunk_text(text: str, chunk_size: int = 800, overlap: int = 100) -> List[str]:
-    """텍스트를 청크로 분할"""
-    if overlap >= chunk_size:
-        raise ValueError("overlap은 chunk_size보다 작아야 합니다.")
-    chunks = []
-    start = 0
-    text_length = len(text)
-    while start < text_length:
-        end = min(start + chunk_size, text_length)
-        chunks.append(text[start:end])
-        if end == text_length:
-            break
-        start += (chunk_size - overlap)
-    return [c.strip() for c in chunks if c.strip()]
-
-def cosine_similarity(a: List[float], b: List[float]) -> float:
-    """코사인 유사도 계산"""
-    dot = sum(x * y for x, y in zip(a, b))
-    na = sqrt(sum(x * x for x in a)) or 1e-8
-    nb = sqrt(sum(x * x for x in b)) or 1e-8
-    return dot / (na * nb)
-
-def embed_texts(texts: List[str], model: str = "text-embedding-3-small") -> List[List[float]]:
-    """텍스트를 임베딩으로 변환"""
-    res = client.embeddings.create(model=model, input=texts)
-    return [item.embedding for item in res.data]
-
-def top_k_chunks(query: str, index: Dict[str, Any], k: int = 3) -> List[str]:
-    """쿼리와 유사한 상위 k개 청크 검색"""
-    q_emb = embed_texts([query])[0]
-    sims = [(cosine_similarity(q_emb, emb), i) for i, emb in enumerate(index["embeddings"])]
-    sims.sort(reverse=True, key=lambda x: x[0])
-    return [index["chunks"][i] for _, i in sims[:k]]
-
-def build_rag_index(filepath: str) -> Dict[str, Any]:
-    """RAG 인덱스 구축"""
-    try:
-        with open(filepath, encoding="utf-8") as f:
-            text = f.read()
-        chunks = chunk_text(text, chunk_size=800, overlap=100)
-        embeddings = embed_texts(chunks)
-        return {"chunks": chunks, "embeddings": embeddings}
-    except FileNotFoundError:
-        print(f"⚠️ RAG 파일을 찾을 수 없습니다: {filepath}")
-        return {"chunks": [], "embeddings": []}
-
-# RAG 인덱스 빌드 (앱 시작 시 한 번만 실행)
-try:
-    personal_color_index = build_rag_index("data/RAG/personal_color_RAG.txt")
-    beauty_trend_index = build_rag_index("data/RAG/beauty_trend_2025_autumn_RAG.txt")
-except Exception as e:
-    print(f"⚠️ RAG 인덱스 빌드 오류: {e}")
-    personal_color_index = {"chunks": [], "embeddings": []}
-    beauty_trend_index = {"chunks": [], "embeddings": []}
-
-def analyze_personal_color_with_openai(answers: list[schemas.SurveyAnswerCreate]) -> dict:
+# 공용 RAG 검색 서비스 (인덱스는 프로세스당 한 번만 로드)
+rag_service = get_rag_service()
+
+# 분석 프롬프트 버전 (프롬프트나 응답 형식을 바꾸면 올려서 분석 캐시를 무효화)
+ANALYSIS_PROMPT_VERSION = "v3"
+
+# LLM은 순위/점수/설명 문장만 생성하고 팔레트·키워드·팁은 카탈로그에서 채우므로 출력이 짧음
+ANALYSIS_MAX_TOKENS = 700
+
+# /submit 응답 마감 시간(초) - 넘기면 카탈로그 결과로 먼저 응답 (0 이하면 LLM 응답까지 대기)
+ANALYSIS_DEADLINE = float(os.getenv("ANALYSIS_DEADLINE", "12"))
+# 마감 후 LLM 분석이 끝나면 저장된 결과를 LLM 결과로 교체
+ANALYSIS_BACKGROUND_UPGRADE = os.getenv("ANALYSIS_BACKGROUND_UPGRADE", "true").lower() in ("1", "true", "yes")
+
+degrade_stats = {"deadline_exceeded": 0, "upgraded": 0, "upgrade_failed": 0}
+_background_tasks: set = set()
+
+def build_analysis_prompts(answers: list[schemas.SurveyAnswerCreate]) -> tuple[str, str]:
     """
-    사용자의 답변을 OpenAI API로 분석하여 퍼스널 컬러 타입 결정
-    RAG를 활용하여 컨텍스트 기반 분석 수행
-    
-    Returns:
-        {
-            'result_tone': 'spring'|'summer'|'autumn'|'winter',
-            'confidence': 0-100 (신뢰도 퍼센트),
-            'total_score': 0-100 (종합 점수)
-        }
+    사용자 답변 + RAG 컨텍스트로 (system_prompt, user_prompt) 생성
     """
     
     # 프롬프트 구성 - 사용자의 답변을 명확하게 전달
@@ -104,17 +61,18 @@ def analyze_personal_color_with_openai(answers: list[schemas.SurveyAnswerCreate]
         for ans in answers
     ])
     
-    # RAG 검색으로 관련 정보 가져오기
+    # RAG 검색으로 관련 정보 가져오기 (사전 계산된 선택지 임베딩을 합성 → 임베딩 API 호출 없음,
+    # 모르는 선택지가 섞이면 답변 텍스트를 임베딩해 검색)
+    found = rag_service.search_answers_texts_multi(answers, {"personal_color": 3, "beauty_trend": 2},
+                                                   fallback_query=answers_text)
     rag_context = ""
-    if personal_color_index["chunks"]:
-        related_chunks = top_k_chunks(answers_text, personal_color_index, k=3)
-        rag_context = "\n\n[퍼스널 컬러 참고 정보]\n" + "\n".join(related_chunks)
+    if found["personal_color"]:
+        rag_context = "\n\n[퍼스널 컬러 참고 정보]\n" + "\n".join(found["personal_color"])
     
     # 트렌드 정보도 추가
     trend_context = ""
-    if beauty_trend_index["chunks"]:
-        trend_chunks = top_k_chunks(answers_text, beauty_trend_index, k=2)
-        trend_context = "\n\n[최신 뷰티 트렌드]\n" + "\n".join(trend_chunks)
+    if found["beauty_trend"]:
+        trend_context = "\n\n[최신 뷰티 트렌드]\n" + "\n".join(found["beauty_trend"])
     
     system_prompt = (
         "당신은 전문적인 퍼스널 컬러 진단 컨설턴트입니다. "
@@ -132,9 +90,10 @@ def analyze_personal_color_with_openai(answers: list[schemas.SurveyAnswerCreate]
 이 답변들을 기반으로 사용자의 퍼스널 컬러 타입을 분석하세요.
 
 반드시 다음 가이드라인을 따라주세요:
-- 메인 타입 1개와 추천 타입 2개로 총 3개의 타입을 제공해주세요
+- 메인 타입 1개와 추천 타입 2개로 총 3개의 타입을 적합한 순서대로 ranking에 제공해주세요
 - 각 타입의 description은 문학적이고 감성적으로 작성해주세요
-- name은 이모지와 함께 일관된 형식으로 작성해주세요 (예: '봄 웜톤 🌸')
+- palette에는 그 타입에 어울리는 대표 색 HEX 코드를 최대 3개만 적어주세요 (선택, 서버에서 큐레이션 팔레트로 보정)
+- 타입명, 스타일 키워드, 메이크업 팁은 서버에서 채우므로 작성하지 마세요
 
 분석 결과는 다음 형식으로 JSON으로 반드시 응답해주세요:
 {{
@@ -142,327 +101,343 @@ def analyze_personal_color_with_openai(answers: list[schemas.SurveyAnswerCreate]
     "confidence": 0-100 사이의 숫자 (신뢰도 퍼센트, 진단의 확실성 정도),
     "total_score": 0-100 사이의 숫자 (종합 점수, 타입 특성의 부합도),
     "detailed_analysis": "사용자의 답변을 기반으로 한 자세한 분석 설명 (200-400자 정도)",
-    "top_types": [
-        {{
-            "type": "spring|summer|autumn|winter",
-            "name": "퍼스널 컬러 타입명 (반드시 '봄 웜톤 🌸' 형식)",
-            "description": "타입의 특성을 문학적이고 감성적으로 표현한 설명 (30-50자)",
-            "color_palette": ["#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0"],
-            "style_keywords": ["화사함", "발랄함", "생동감", "밝음", "따뜻함"],
-            "makeup_tips": ["코럴 블러셔", "피치 립", "골든 아이섀도우", "브라운 마스카라"],
-            "score": 0-100 (해당 타입과의 일치도)
-        }},
-        {{
-            "type": "두 번째로 적합한 타입",
-            "name": "두 번째 타입명 (동일한 형식)",
-            "description": "두 번째 타입의 감성적 설명",
-            "color_palette": ["색상 코드 5개"],
-            "style_keywords": ["키워드 5개"],
-            "makeup_tips": ["메이크업 팁 4개"],
-            "score": 첫 번째보다 10-20점 낮은 점수
-        }},
-        {{
-            "type": "세 번째로 적합한 타입",
-            "name": "세 번째 타입명 (동일한 형식)",
-            "description": "세 번째 타입의 감성적 설명",
-            "color_palette": ["색상 코드 5개"],
-            "style_keywords": ["키워드 5개"],
-            "makeup_tips": ["메이크업 팁 4개"],
-            "score": 두 번째보다 10-15점 낮은 점수
-        }}
+    "ranking": [
+        {{"type": "메인 타입 (result_tone과 동일)", "score": 0-100, "description": "타입의 특성을 감성적으로 표현한 설명 (30-50자)", "palette": ["#RRGGBB", ...]}},
+        {{"type": "두 번째로 적합한 타입", "score": 첫 번째보다 10-20점 낮은 점수, "description": "30-50자", "palette": ["#RRGGBB", ...]}},
+        {{"type": "세 번째로 적합한 타입", "score": 두 번째보다 10-15점 낮은 점수, "description": "30-50자", "palette": ["#RRGGBB", ...]}}
     ]
 }}
 
 응답은 반드시 JSON 형식만 포함해야 합니다. 다른 설명은 포함하지 마세요."""
 
+    return system_prompt, user_prompt
+
+def normalize_analysis_result(result: dict) -> dict:
+    """
+    OpenAI 응답(JSON) 검증 및 정규화 - 누락/잘못된 필드는 카탈로그 기본값으로 채움
+    """
+    # 결과 검증 및 정규화
+    if result.get("result_tone") not in SEASON_CATALOG:
+        result["result_tone"] = "spring"
+    
+    result["confidence"] = max(0, min(100, int(result.get("confidence", 50))))
+    result["total_score"] = max(0, min(100, int(result.get("total_score", 50))))
+    
+    # detailed_analysis 검증
+    if not result.get("detailed_analysis"):
+        result["detailed_analysis"] = "답변을 종합 분석한 결과입니다."
+    
+    main_type = result["result_tone"]
+    total_score = result.get("total_score", 85)
+    
+    # top_types 검증 및 기본값 설정
+    if not result.get("top_types") or not isinstance(result.get("top_types"), list):
+        # 메인 타입을 첫 번째로, 나머지 타입 2개를 카탈로그에서 추가
+        others = season_order(main_type)[1:]
+        result["top_types"] = catalog_top_types(
+            [main_type, others[0], others[1]],
+            [total_score, max(60, total_score - 20), max(40, total_score - 35)]
+        )
+    else:
+        # top_types가 2개 미만이면 아직 없는 타입으로 3개까지 채우기
+        if len(result["top_types"]) < 2:
+            present = {t.get("type") for t in result["top_types"] if isinstance(t, dict)}
+            for type_key in season_order(main_type)[1:]:
+                if len(result["top_types"]) >= 3:
+                    break
+                if type_key not in present:
+                    score = max(50, total_score - (len(result["top_types"]) * 15))
+                    result["top_types"].append(SEASON_CATALOG[type_key].to_type_entry(score))
+        
+        # 최대 3개로 제한
+        result["top_types"] = result["top_types"][:3]
+        
+        for i, type_data in enumerate(result["top_types"]):
+            if not isinstance(type_data, dict):
+                continue
+            # 필수 필드 검증 및 카탈로그 fallback 적용
+            type_key = type_data.get("type", main_type if i == 0 else "spring")
+            if type_key not in SEASON_CATALOG:
+                type_key = "spring"
+            fill_type_entry(type_data, type_key, max(50, total_score - (i * 15)))
+                
+    # 하위 호환성을 위한 메인 타입 정보 추출
+    main_type_data = result["top_types"][0] if result["top_types"] else {}
+    result["name"] = main_type_data.get("name", "퍼스널 컬러")
+    result["description"] = main_type_data.get("description", "당신만의 특별한 컬러")
+    result["color_palette"] = main_type_data.get("color_palette", [])
+    result["style_keywords"] = main_type_data.get("style_keywords", [])
+    result["makeup_tips"] = main_type_data.get("makeup_tips", [])
+    
+    return result
+
+def ranking_to_type_entry(item: dict, index: int, total_score=None) -> dict:
+    """
+    LLM ranking 원소({type, score, description}) → 카탈로그로 채운 top_types 원소
+    """
+    total_score = int(total_score) if isinstance(total_score, (int, float)) else 85
+    type_key = item.get("type") if item.get("type") in SEASON_CATALOG else "spring"
+    entry = {"description": item.get("description"), "score": item.get("score"), "palette": item.get("palette")}
+    return fill_type_entry(entry, type_key, max(50, total_score - (index * 15)))
+
+def expand_ranking(result: dict) -> dict:
+    """
+    간결한 LLM 응답의 ranking을 top_types로 확장 (팔레트/키워드/팁은 카탈로그 값)
+    """
+    ranking = result.pop("ranking", None)
+    if isinstance(ranking, list) and not result.get("top_types"):
+        result["top_types"] = [
+            ranking_to_type_entry(item, i, result.get("total_score"))
+            for i, item in enumerate(ranking) if isinstance(item, dict)
+        ]
+    return result
+
+def parse_analysis_response(response_text: str) -> dict:
+    """
+    LLM 응답 텍스트 → 정규화된 분석 결과 (JSON이 아니면 json.JSONDecodeError)
+    """
+    response_text = (response_text or "").strip()
+    
+    # JSON 추출 (혹시 다른 텍스트가 포함될 경우 대비)
+    json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+    if json_match:
+        response_text = json_match.group()
+    
+    result = normalize_analysis_result(expand_ranking(json.loads(response_text)))
+    result["source"] = "llm"
+    return result
+
+def fallback_analysis_result(answers: list[schemas.SurveyAnswerCreate], detailed_analysis: str = None) -> dict:
+    """
+    LLM 실패/지연 시 규칙 기반 점수 + 계절 카탈로그로 만든 결과 (캐시하지 않음)
+    """
+    return catalog_result(score_answers(answers), detailed_analysis)
+
+def analyze_personal_color_with_openai(answers: list[schemas.SurveyAnswerCreate], fresh: bool = False) -> dict:
+    """
+    사용자의 답변을 OpenAI API로 분석하여 퍼스널 컬러 타입 결정
+    RAG를 활용하여 컨텍스트 기반 분석 수행
+    같은 답변 조합의 성공한 분석 결과는 캐시에서 바로 반환 (fresh=True면 캐시를 건너뜀)
+    같은 답변 조합이 동시에 들어오면 OpenAI 호출 1회로 합쳐서 결과를 나눠줌
+    
+    Returns:
+        {
+            'result_tone': 'spring'|'summer'|'autumn'|'winter',
+            'confidence': 0-100 (신뢰도 퍼센트),
+            'total_score': 0-100 (종합 점수)
+        }
+    """
+    
+    # 동일한 답변 조합 + 프롬프트/코퍼스 버전이면 캐시된 분석 결과 사용
+    cache_key = analysis_key(answers, ANALYSIS_PROMPT_VERSION, rag_service.corpus_version)
+    if fresh:
+        analysis_cache.record_bypass()
+    else:
+        cached = analysis_cache.get(cache_key)
+        if cached is not None:
+            print(f"✅ 분석 캐시 적중: {cache_key[:12]}")
+            return cached
+    
+    # fresh 요청은 진행 중인 호출에 합류하지 않고 항상 새로 분석
+    if fresh:
+        return request_analysis_from_openai(answers, cache_key)
+    
+    # 같은 답변 조합의 분석이 이미 진행 중이면 새로 호출하지 않고 그 결과를 함께 받음
+    result, shared = analysis_flight.do(cache_key, request_analysis_from_openai, answers, cache_key)
+    if shared:
+        print(f"✅ 진행 중인 동일 분석 결과 공유: {cache_key[:12]}")
+        return copy.deepcopy(result)
+    return result
+
+def request_analysis_from_openai(answers: list[schemas.SurveyAnswerCreate], cache_key: str) -> dict:
+    """
+    OpenAI 분석 1회 실행 (성공한 결과만 분석 캐시에 저장)
+    """
+    system_prompt, user_prompt = build_analysis_prompts(answers)
+
     try:
         # OpenAI API 호출 (타임아웃 30초)
-        response = client.chat.completions.create(
+        response = get_openai_client().chat.completions.create(
             model="gpt-4o-mini",
             messages=[
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
             temperature=0.7,
-            max_tokens=1500,  # 토큰 수 증가
+            max_tokens=ANALYSIS_MAX_TOKENS,
             timeout=30.0  # 30초 타임아웃
         )
         
-        # 응답 파싱
-        response_text = response.choices[0].message.content.strip()
-        
-        # JSON 추출 (혹시 다른 텍스트가 포함될 경우 대비)
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            response_text = json_match.group()
-        
-        result = json.loads(response_text)
-        
-        # 결과 검증 및 정규화
-        if result.get("result_tone") not in ["spring", "summer", "autumn", "winter"]:
-            result["result_tone"] = "spring"
-        
-        result["confidence"] = max(0, min(100, int(result.get("confidence", 50))))
-        result["total_score"] = max(0, min(100, int(result.get("total_score", 50))))
-        
-        # detailed_analysis 검증
-        if not result.get("detailed_analysis"):
-            result["detailed_analysis"] = "답변을 종합 분석한 결과입니다."
-        
-        # top_types 검증 및 기본값 설정
-        if not result.get("top_types") or not isinstance(result.get("top_types"), list):
-            # 기본 타입 데이터 생성
-            type_names = {
-                "spring": "봄 웜톤 🌸",
-                "summer": "여름 쿨톤 💎", 
-                "autumn": "가을 웜톤 🍂",
-                "winter": "겨울 쿨톤 ❄️"
-            }
-            type_descriptions = {
-                "spring": "밝고 생기 있는 봄날의 따뜻함을 담은 당신",
-                "summer": "시원하고 우아한 여름날의 세련됨을 담은 당신",
-                "autumn": "깊고 따뜻한 가을날의 포근함을 담은 당신", 
-                "winter": "시원하고 강렬한 겨울날의 우아함을 담은 당신"
-            }
-            type_palettes = {
-                "spring": ["#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0"],
-                "summer": ["#F8BBD9", "#E6E6FA", "#ADD8E6", "#DDA0DD", "#D3D3D3"],
-                "autumn": ["#800020", "#8B7355", "#FFD700", "#FF4500", "#556B2F"],
-                "winter": ["#000000", "#FFFFFF", "#4169E1", "#FF1493", "#DC143C"]
-            }
-            type_styles = {
-                "spring": ["화사함", "발랄함", "생동감", "밝음", "따뜻함"],
-                "summer": ["차분함", "세련됨", "우아함", "로맨틱", "부드러움"],
-                "autumn": ["따뜻함", "성숙함", "깊이", "풍성함", "고급스러움"],
-                "winter": ["강렬함", "고급스러움", "시크함", "도시적", "명확함"]
-            }
-            type_makeup = {
-                "spring": ["코럴 블러셔", "피치 립", "골든 아이섀도우", "브라운 마스카라"],
-                "summer": ["로즈 블러셔", "더스티핑크 립", "라벤더 아이섀도우", "브라운 마스카라"],
-                "autumn": ["오렌지 블러셔", "브릭레드 립", "골든브라운 아이섀도우", "브라운 마스카라"],
-                "winter": ["푸시아 블러셔", "트루레드 립", "스모키 아이섀도우", "블랙 마스카라"]
-            }
-            
-            # 메인 타입을 첫 번째로, 나머지 타입들을 추가 (최소 2개, 최대 3개)
-            main_type = result["result_tone"]
-            all_types = ["spring", "summer", "autumn", "winter"]
-            other_types = [t for t in all_types if t != main_type]
-            
-            result["top_types"] = [
-                {
-                    "type": main_type,
-                    "name": type_names[main_type],
-                    "description": type_descriptions[main_type],
-                    "color_palette": type_palettes[main_type],
-                    "style_keywords": type_styles[main_type],
-                    "makeup_tips": type_makeup[main_type],
-                    "score": result.get("total_score", 85)
-                },
-                {
-                    "type": other_types[0],
-                    "name": type_names[other_types[0]],
-                    "description": type_descriptions[other_types[0]],
-                    "color_palette": type_palettes[other_types[0]],
-                    "style_keywords": type_styles[other_types[0]],
-                    "makeup_tips": type_makeup[other_types[0]],
-                    "score": max(60, result.get("total_score", 85) - 20)
-                },
-                {
-                    "type": other_types[1],
-                    "name": type_names[other_types[1]],
-                    "description": type_descriptions[other_types[1]],
-                    "color_palette": type_palettes[other_types[1]],
-                    "style_keywords": type_styles[other_types[1]],
-                    "makeup_tips": type_makeup[other_types[1]],
-                    "score": max(40, result.get("total_score", 85) - 35)
-                }
-            ]
-        else:
-            # top_types가 있는 경우 최소 2개, 최대 3개로 제한하고 필수 필드 검증
-            if len(result["top_types"]) < 2:
-                # 2개 미만이면 기본 타입들로 채우기
-                main_type = result["result_tone"]
-                all_types = ["spring", "summer", "autumn", "winter"]
-                other_types = [t for t in all_types if t != main_type]
-                
-                # 부족한 만큼 기본 데이터로 추가 (개선된 fallback 데이터)
-                type_names = {
-                    "spring": "봄 웜톤 🌸",
-                    "summer": "여름 쿨톤 💎", 
-                    "autumn": "가을 웜톤 🍂",
-                    "winter": "겨울 쿨톤 ❄️"
-                }
-                type_descriptions = {
-                    "spring": "밝고 생기 있는 봄날의 따뜻함을 담은 당신",
-                    "summer": "시원하고 우아한 여름날의 세련됨을 담은 당신",
-                    "autumn": "깊고 따뜻한 가을날의 포근함을 담은 당신", 
-                    "winter": "시원하고 강렬한 겨울날의 우아함을 담은 당신"
-                }
-                type_palettes = {
-                    "spring": ["#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0"],
-                    "summer": ["#F8BBD9", "#E6E6FA", "#ADD8E6", "#DDA0DD", "#D3D3D3"],
-                    "autumn": ["#800020", "#8B7355", "#FFD700", "#FF4500", "#556B2F"],
-                    "winter": ["#000000", "#FFFFFF", "#4169E1", "#FF1493", "#DC143C"]
-                }
-                type_styles = {
-                    "spring": ["화사함", "발랄함", "생동감", "밝음", "따뜻함"],
-                    "summer": ["차분함", "세련됨", "우아함", "로맨틱", "부드러움"],
-                    "autumn": ["따뜻함", "성숙함", "깊이", "풍성함", "고급스러움"],
-                    "winter": ["강렬함", "고급스러움", "시크함", "도시적", "명확함"]
-                }
-                type_makeup = {
-                    "spring": ["코럴 블러셔", "피치 립", "골든 아이섀도우", "브라운 마스카라"],
-                    "summer": ["로즈 블러셔", "더스티핑크 립", "라벤더 아이섀도우", "브라운 마스카라"],
-                    "autumn": ["오렌지 블러셔", "브릭레드 립", "골든브라운 아이섀도우", "브라운 마스카라"],
-                    "winter": ["푸시아 블러셔", "트루레드 립", "스모키 아이섀도우", "블랙 마스카라"]
-                }
-                
-                while len(result["top_types"]) < 3:
-                    missing_index = len(result["top_types"]) - 1
-                    if missing_index < len(other_types):
-                        type_key = other_types[missing_index]
-                        result["top_types"].append({
-                            "type": type_key,
-                            "name": type_names[type_key],
-                            "description": type_descriptions[type_key],
-                            "color_palette": type_palettes[type_key],
-                            "style_keywords": type_styles[type_key],
-                            "makeup_tips": type_makeup[type_key],
-                            "score": max(50, result.get("total_score", 85) - (len(result["top_types"]) * 15))
-                        })
-            
-            # 최대 3개로 제한
-            result["top_types"] = result["top_types"][:3]
-            
-            # 개선된 fallback 데이터
-            fallback_data = {
-                "spring": {
-                    "name": "봄 웜톤 🌸",
-                    "description": "밝고 생기 있는 봄날의 따뜻함을 담은 당신",
-                    "color_palette": ["#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0"],
-                    "style_keywords": ["화사함", "발랄함", "생동감", "밝음", "따뜻함"],
-                    "makeup_tips": ["코럴 블러셔", "피치 립", "골든 아이섀도우", "브라운 마스카라"]
-                },
-                "summer": {
-                    "name": "여름 쿨톤 💎",
-                    "description": "시원하고 우아한 여름날의 세련됨을 담은 당신",
-                    "color_palette": ["#F8BBD9", "#E6E6FA", "#ADD8E6", "#DDA0DD", "#D3D3D3"],
-                    "style_keywords": ["차분함", "세련됨", "우아함", "로맨틱", "부드러움"],
-                    "makeup_tips": ["로즈 블러셔", "더스티핑크 립", "라벤더 아이섀도우", "브라운 마스카라"]
-                },
-                "autumn": {
-                    "name": "가을 웜톤 🍂",
-                    "description": "깊고 따뜻한 가을날의 포근함을 담은 당신",
-                    "color_palette": ["#800020", "#8B7355", "#FFD700", "#FF4500", "#556B2F"],
-                    "style_keywords": ["따뜻함", "성숙함", "깊이", "풍성함", "고급스러움"],
-                    "makeup_tips": ["오렌지 블러셔", "브릭레드 립", "골든브라운 아이섀도우", "브라운 마스카라"]
-                },
-                "winter": {
-                    "name": "겨울 쿨톤 ❄️",
-                    "description": "시원하고 강렬한 겨울날의 우아함을 담은 당신",
-                    "color_palette": ["#000000", "#FFFFFF", "#4169E1", "#FF1493", "#DC143C"],
-                    "style_keywords": ["강렬함", "고급스러움", "시크함", "도시적", "명확함"],
-                    "makeup_tips": ["푸시아 블러셔", "트루레드 립", "스모키 아이섀도우", "블랙 마스카라"]
-                }
-            }
-            
-            for i, type_data in enumerate(result["top_types"]):
-                if not isinstance(type_data, dict):
-                    continue
-                # 필수 필드 검증 및 개선된 fallback 적용
-                type_key = type_data.get("type", result["result_tone"] if i == 0 else "spring")
-                if type_key not in fallback_data:
-                    type_key = "spring"
-                
-                type_data["type"] = type_key
-                
-                if not type_data.get("name") or type_data["name"] == f"{type_key} 타입":
-                    type_data["name"] = fallback_data[type_key]["name"]
-                if not type_data.get("description") or type_data["description"] in ["추가 타입입니다.", "퍼스널 컬러 타입입니다."]:
-                    type_data["description"] = fallback_data[type_key]["description"]
-                if not type_data.get("color_palette") or not isinstance(type_data.get("color_palette"), list):
-                    type_data["color_palette"] = fallback_data[type_key]["color_palette"]
-                if not type_data.get("style_keywords") or not isinstance(type_data.get("style_keywords"), list):
-                    type_data["style_keywords"] = fallback_data[type_key]["style_keywords"]
-                if not type_data.get("makeup_tips") or not isinstance(type_data.get("makeup_tips"), list):
-                    type_data["makeup_tips"] = fallback_data[type_key]["makeup_tips"]
-                if not type_data.get("score"):
-                    type_data["score"] = max(50, result.get("total_score", 85) - (i * 15))
-                    
-        # 하위 호환성을 위한 메인 타입 정보 추출
-        main_type_data = result["top_types"][0] if result["top_types"] else {}
-        result["name"] = main_type_data.get("name", "퍼스널 컬러")
-        result["description"] = main_type_data.get("description", "당신만의 특별한 컬러")
-        result["color_palette"] = main_type_data.get("color_palette", [])
-        result["style_keywords"] = main_type_data.get("style_keywords", [])
-        result["makeup_tips"] = main_type_data.get("makeup_tips", [])
-        
+        result = parse_analysis_response(response.choices[0].message.content)
         print(f"✅ OpenAI 분석 완료: {result}")
-        return result
         
     except json.JSONDecodeError as e:
         print(f"❌ JSON 파싱 오류: {e}")
-        # JSON 파싱 실패 시 기본값 반환
-        return {
-            "result_tone": "spring",
-            "confidence": 50,
-            "total_score": 50,
-            "detailed_analysis": "분석 처리 중 오류가 발생했습니다.",
-            "top_types": [
-                {
-                    "type": "spring",
-                    "name": "봄 웜톤 🌸",
-                    "description": "밝고 생기 있는 봄날의 따뜻함을 담은 당신",
-                    "color_palette": ["#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0"],
-                    "style_keywords": ["화사함", "발랄함", "생동감", "밝음", "따뜻함"],
-                    "makeup_tips": ["코럴 블러셔", "피치 립", "골든 아이섀도우", "브라운 마스카라"],
-                    "score": 50
-                },
-                {
-                    "type": "summer",
-                    "name": "여름 쿨톤 💎",
-                    "description": "시원하고 우아한 여름날의 세련됨을 담은 당신",
-                    "color_palette": ["#F8BBD9", "#E6E6FA", "#ADD8E6", "#DDA0DD", "#D3D3D3"],
-                    "style_keywords": ["차분함", "세련됨", "우아함", "로맨틱", "부드러움"],
-                    "makeup_tips": ["로즈 블러셔", "더스티핑크 립", "라벤더 아이섀도우", "브라운 마스카라"],
-                    "score": 35
-                }
-            ]
-        }
+        # JSON 파싱 실패 시 규칙 기반 카탈로그 결과 반환
+        return fallback_analysis_result(answers)
     except Exception as e:
         print(f"❌ OpenAI API 호출 오류: {e}")
-        # API 오류 시 기본값 반환
-        return {
-            "result_tone": "spring",
-            "confidence": 50,
-            "total_score": 50,
-            "detailed_analysis": "OpenAI API 연결에 문제가 발생했습니다.",
-            "top_types": [
-                {
-                    "type": "spring",
-                    "name": "봄 웜톤 🌸",
-                    "description": "밝고 생기 있는 봄날의 따뜻함을 담은 당신",
-                    "color_palette": ["#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0"],
-                    "style_keywords": ["화사함", "발랄함", "생동감", "밝음", "따뜻함"],
-                    "makeup_tips": ["코럴 블러셔", "피치 립", "골든 아이섀도우", "브라운 마스카라"],
-                    "score": 50
-                },
-                {
-                    "type": "summer",
-                    "name": "여름 쿨톤 💎",
-                    "description": "시원하고 우아한 여름날의 세련됨을 담은 당신",
-                    "color_palette": ["#F8BBD9", "#E6E6FA", "#ADD8E6", "#DDA0DD", "#D3D3D3"],
-                    "style_keywords": ["차분함", "세련됨", "우아함", "로맨틱", "부드러움"],
-                    "makeup_tips": ["로즈 블러셔", "더스티핑크 립", "라벤더 아이섀도우", "브라운 마스카라"],
-                    "score": 35
-                }
-            ]
-        }
+        # API 오류 시 규칙 기반 카탈로그 결과 반환
+        return fallback_analysis_result(answers)
+    
+    # 정상 분석 결과만 캐시 (오류 시 대체 결과는 캐시하지 않음)
+    analysis_cache.set(cache_key, result)
+    return result
+
+def apply_analysis_result(survey_result: models.SurveyResult, openai_result: dict) -> None:
+    """
+    분석 결과 필드를 SurveyResult에 기록 (JSON 필드는 문자열로 저장)
+    """
+    survey_result.result_tone = openai_result['result_tone']
+    survey_result.confidence = openai_result['confidence']
+    survey_result.total_score = openai_result['total_score']
+    survey_result.detailed_analysis = openai_result.get('detailed_analysis')
+    survey_result.result_name = openai_result.get('name')
+    survey_result.result_description = openai_result.get('description')
+    survey_result.color_palette = json.dumps(openai_result.get('color_palette', []), ensure_ascii=False)
+    survey_result.style_keywords = json.dumps(openai_result.get('style_keywords', []), ensure_ascii=False)
+    survey_result.makeup_tips = json.dumps(openai_result.get('makeup_tips', []), ensure_ascii=False)
+    survey_result.top_types = json.dumps(openai_result.get('top_types', []), ensure_ascii=False)
+
+def save_survey_result(db: Session, user_id: int, answers: list[schemas.SurveyAnswerCreate], openai_result: dict) -> models.SurveyResult:
+    """
+    분석 결과(SurveyResult)와 답변(SurveyAnswer)을 저장하고 커밋
+    """
+    survey_result = models.SurveyResult(user_id=user_id, created_at=datetime.now(timezone.utc))
+    apply_analysis_result(survey_result, openai_result)
+    db.add(survey_result)
+    db.flush()  # ID 생성을 위해 flush
+    
+    print(f"▶ SurveyResult 생성: ID {survey_result.id}")
+    
+    for ans in answers:
+        answer = models.SurveyAnswer(
+            survey_result_id=survey_result.id,
+            question_id=ans.question_id,
+            option_id=ans.option_id,
+            option_label=ans.option_label
+        )
+        db.add(answer)
+    
+    db.commit()
+    db.refresh(survey_result)
+    return survey_result
+
+def upgrade_survey_result(survey_result_id: int, openai_result: dict) -> bool:
+    """
+    카탈로그 결과로 먼저 저장된 SurveyResult를 LLM 분석 결과로 교체 (이미 삭제됐으면 False)
+    """
+    db = SessionLocal()
+    try:
+        survey_result = db.get(models.SurveyResult, survey_result_id)
+        if survey_result is None:
+            return False
+        apply_analysis_result(survey_result, openai_result)
+        db.commit()
+        return True
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def persist_survey_result(user_id: int, answers: list[schemas.SurveyAnswerCreate], openai_result: dict) -> int:
+    """
+    요청 스코프 밖(스트리밍 응답 등)에서 자체 세션으로 저장 → survey_result_id
+    """
+    db = SessionLocal()
+    try:
+        return save_survey_result(db, user_id, answers, openai_result).id
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def survey_response_payload(survey_result_id: int, openai_result: dict, rule: ToneScore = None) -> dict:
+    """
+    설문 제출 응답 본문 (/submit, /submit/stream 공통)
+    rule이 있으면 규칙 기반 점수와 LLM 진단 비교 결과를 rule_based로 함께 반환
+    """
+    payload = {
+        "message": "설문 결과 저장 완료", 
+        "survey_result_id": survey_result_id,
+        "result_tone": openai_result['result_tone'],
+        "confidence": openai_result['confidence'],
+        "total_score": openai_result['total_score'],
+        "detailed_analysis": openai_result.get('detailed_analysis', '분석 결과가 준비되지 않았습니다.'),
+        "top_types": openai_result.get('top_types', []),
+        "name": openai_result.get('name', '퍼스널 컬러'),
+        "description": openai_result.get('description', '당신만의 특별한 컬러'),
+        "color_palette": openai_result.get('color_palette', []),
+        "style_keywords": openai_result.get('style_keywords', []),
+        "makeup_tips": openai_result.get('makeup_tips', []),
+        "source": openai_result.get('source', 'llm')
+    }
+    if rule is not None:
+        comparison = compare_with_llm(rule, openai_result['result_tone'])
+        if not comparison["agrees"]:
+            print(f"⚠️ LLM 진단({comparison['llm_tone']})과 규칙 기반 진단({comparison['rule_tone']})이 다릅니다.")
+        payload["rule_based"] = {**rule.to_dict(), **comparison}
+    return payload
+
+def run_survey_job(user_id: int, answers: list[schemas.SurveyAnswerCreate], fresh: bool = False) -> dict:
+    """
+    작업 큐 워커에서 실행되는 분석 + 저장 (결과는 /submit 응답 본문과 동일)
+    """
+    openai_result = analyze_personal_color_with_openai(answers, fresh=fresh)
+    survey_result_id = persist_survey_result(user_id, answers, openai_result)
+    print(f"✅ 설문 결과 저장 완료 (작업) - Survey ID: {survey_result_id}")
+    return survey_response_payload(survey_result_id, openai_result, score_answers(answers))
+
+async def analyze_within_deadline(answers: list[schemas.SurveyAnswerCreate], fresh: bool = False,
+                                  deadline: float = ANALYSIS_DEADLINE) -> tuple[dict, asyncio.Future | None]:
+    """
+    마감 시간 안에 LLM 분석이 끝나면 (결과, None),
+    넘기면 (규칙 기반 카탈로그 결과, 계속 진행 중인 LLM 분석 작업)
+    """
+    task = asyncio.ensure_future(run_blocking(analyze_personal_color_with_openai, answers, fresh=fresh))
+    if deadline <= 0:
+        return await task, None
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), deadline), None
+    except asyncio.TimeoutError:
+        degrade_stats["deadline_exceeded"] += 1
+        print(f"⏱ LLM 분석이 {deadline:.1f}초 안에 끝나지 않아 카탈로그 결과로 먼저 응답")
+        return fallback_analysis_result(answers), task
+
+async def upgrade_when_ready(task: asyncio.Future, survey_result_id: int) -> None:
+    """
+    진행 중인 LLM 분석이 끝나면 저장된 결과를 교체 (LLM도 실패했으면 그대로 둠)
+    """
+    try:
+        openai_result = await task
+        if openai_result.get("source") != "llm":
+            return
+        if await run_blocking(upgrade_survey_result, survey_result_id, openai_result):
+            degrade_stats["upgraded"] += 1
+            print(f"✅ 설문 결과 LLM 분석으로 교체 - Survey ID: {survey_result_id}")
+    except Exception as e:
+        degrade_stats["upgrade_failed"] += 1
+        print(f"❌ 설문 결과 교체 실패 - Survey ID: {survey_result_id}: {e}")
+
+def schedule_result_upgrade(task: asyncio.Future, survey_result_id: int) -> bool:
+    """
+    백그라운드 교체 예약 (ANALYSIS_BACKGROUND_UPGRADE=false면 예약하지 않음)
+    """
+    if not ANALYSIS_BACKGROUND_UPGRADE:
+        return False
+    upgrade = asyncio.create_task(upgrade_when_ready(task, survey_result_id))
+    _background_tasks.add(upgrade)  # 완료 전 GC 방지
+    upgrade.add_done_callback(_background_tasks.discard)
+    return True
 
 # TODO: survey API 구현 필요. 현재 정상 동작 X
 @router.post("/submit", status_code=201)
 async def submit_survey(
     result: schemas.SurveyResultCreate,
+    fresh: bool = False,
+    job: bool = False,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_user)
 ):
@@ -472,9 +447,16 @@ async def submit_survey(
     프로세스:
     1. 프론트엔드에서 사용자 답변 데이터만 받음
     2. OpenAI API에 답변 데이터를 prompt로 전송 (RAG 컨텍스트 포함)
+       - ANALYSIS_DEADLINE 초 안에 응답이 없으면 규칙 기반 카탈로그 결과(source=catalog)로 먼저 저장/응답하고
+         LLM 분석이 끝나면 저장된 결과를 교체 (upgrade_pending=true)
     3. OpenAI에서 result_tone, confidence, total_score 받음
     4. DB에 설문 결과 및 답변 저장
     
+    Query:
+        fresh=true 이면 분석 캐시를 건너뛰고 항상 새로 분석
+        job=true   이면 분석을 작업 큐에 넣고 바로 202 + job_id 반환
+                   (결과는 GET /api/survey/jobs/{job_id} 로 조회)
+    
     Request Body (PersonalColorTest 컴포넌트에서 전송):
         {
             "answers": [
@@ -515,65 +497,50 @@ async def submit_survey(
     print(f"▶ 받은 답변 수: {len(result.answers)}")
     print(f"▶ 받은 데이터: {result}")
 
+    # 규칙 기반 점수 (LLM 응답 검증용, 수 마이크로초)
+    rule = score_answers(result.answers)
+
+    if job:
+        # 작업 모드: 요청/DB 세션을 붙잡지 않고 바로 응답
+        try:
+            queued = await job_queue.submit(run_survey_job, current_user.id, result.answers,
+                                            fresh=fresh, owner_id=current_user.id)
+        except QueueFullError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="분석 요청이 많습니다. 잠시 후 다시 시도해주세요."
+            )
+        print(f"▶ 분석 작업 등록: {queued.id}")
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={
+                "message": "분석 작업이 등록되었습니다.",
+                "job_id": queued.id,
+                "status": queued.status,
+                "status_url": f"/api/survey/jobs/{queued.id}"
+            }
+        )
+
     try:
         # 1. OpenAI API 호출로 result_tone, confidence, total_score 받기
+        #    (동기 호출이므로 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않음)
+        #    (ANALYSIS_DEADLINE 초를 넘기면 카탈로그 결과로 먼저 응답하고 LLM 결과는 나중에 반영)
         print("▶ OpenAI API로 퍼스널 컬러 분석 중...")
-        openai_result = analyze_personal_color_with_openai(result.answers)
+        openai_result, pending = await analyze_within_deadline(result.answers, fresh=fresh)
         result_tone = openai_result['result_tone']
         confidence = openai_result['confidence']
         total_score = openai_result['total_score']
         
         print(f"✅ 분석 완료 - tone: {result_tone}, confidence: {confidence}, score: {total_score}")
 
-        # 2. Survey Result 생성 (상세 분석 결과 포함)
-        survey_result = models.SurveyResult(
-            user_id=current_user.id,
-            result_tone=result_tone,
-            confidence=confidence,
-            total_score=total_score,
-            detailed_analysis=openai_result.get('detailed_analysis'),
-            result_name=openai_result.get('name'),
-            result_description=openai_result.get('description'),
-            color_palette=json.dumps(openai_result.get('color_palette', []), ensure_ascii=False),
-            style_keywords=json.dumps(openai_result.get('style_keywords', []), ensure_ascii=False),
-            makeup_tips=json.dumps(openai_result.get('makeup_tips', []), ensure_ascii=False),
-            top_types=json.dumps(openai_result.get('top_types', []), ensure_ascii=False),
-            created_at=datetime.now(timezone.utc)
-        )
-        db.add(survey_result)
-        db.flush()  # ID 생성을 위해 flush
-        
-        print(f"▶ SurveyResult 생성: ID {survey_result.id}")
-        
-        # 3. 모든 답변 저장
-        for ans in result.answers:
-            answer = models.SurveyAnswer(
-                survey_result_id=survey_result.id,
-                question_id=ans.question_id,
-                option_id=ans.option_id,
-                option_label=ans.option_label
-            )
-            db.add(answer)
-        
-        db.commit()
-        db.refresh(survey_result)
+        # 2. Survey Result + 모든 답변 저장
+        survey_result = save_survey_result(db, current_user.id, result.answers, openai_result)
         
         print(f"✅ 설문 결과 저장 완료 - Survey ID: {survey_result.id}")
         
-        return {
-            "message": "설문 결과 저장 완료", 
-            "survey_result_id": survey_result.id,
-            "result_tone": result_tone,
-            "confidence": confidence,
-            "total_score": total_score,
-            "detailed_analysis": openai_result.get('detailed_analysis', '분석 결과가 준비되지 않았습니다.'),
-            "top_types": openai_result.get('top_types', []),
-            "name": openai_result.get('name', '퍼스널 컬러'),
-            "description": openai_result.get('description', '당신만의 특별한 컬러'),
-            "color_palette": openai_result.get('color_palette', []),
-            "style_keywords": openai_result.get('style_keywords', []),
-            "makeup_tips": openai_result.get('makeup_tips', [])
-        }
+        payload = survey_response_payload(survey_result.id, openai_result, rule)
+        payload["upgrade_pending"] = pending is not None and schedule_result_upgrade(pending, survey_result.id)
+        return payload
     
     except Exception as e:
         print(f"❌ 설문 처리 중 오류 발생: {e}")
@@ -585,6 +552,126 @@ async def submit_survey(
             detail="분석 서비스에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요."
         )
 
+async def stream_personal_color_analysis(answers: list[schemas.SurveyAnswerCreate], user_id: int, fresh: bool = False):
+    """
+    분석 결과를 SSE 이벤트로 흘려보내는 제너레이터
+    
+    이벤트:
+        field     {"name": "result_tone"|"confidence"|"total_score", "value": ...}  값이 파싱되는 즉시
+        text      {"name": "detailed_analysis", "delta": "..."}                   생성되는 대로 이어붙이기
+        text_end  {"name": "detailed_analysis", "value": "..."}
+        item      {"name": "top_types", "index": 0, "value": {...}}               타입 하나가 완성될 때마다
+        preliminary  규칙 기반 즉시 결과 (scores, result_tone, confidence, total_score, ranking)
+        done      /submit 응답과 같은 본문 (정규화된 최종값, survey_result_id 포함)
+        error     {"detail": "..."}
+    
+    스트리밍 중 값은 미리보기이며, 최종값은 항상 done 이벤트 기준
+    """
+    # 규칙 기반 1차 결과를 LLM 호출 전에 먼저 전송
+    rule = score_answers(answers)
+    yield format_sse("preliminary", rule.to_dict())
+    
+    cache_key = analysis_key(answers, ANALYSIS_PROMPT_VERSION, rag_service.corpus_version)
+    openai_result = None
+    if fresh:
+        analysis_cache.record_bypass()
+    else:
+        openai_result = analysis_cache.get(cache_key)
+    
+    if openai_result is not None:
+        # 캐시 적중: 완성된 결과를 같은 이벤트 형식으로 바로 전송
+        print(f"✅ 분석 캐시 적중: {cache_key[:12]}")
+        for name in ("result_tone", "confidence", "total_score"):
+            yield format_sse("field", {"name": name, "value": openai_result[name]})
+        yield format_sse("text", {"name": "detailed_analysis", "delta": openai_result["detailed_analysis"]})
+        yield format_sse("text_end", {"name": "detailed_analysis", "value": openai_result["detailed_analysis"]})
+        for i, type_data in enumerate(openai_result.get("top_types", [])):
+            yield format_sse("item", {"name": "top_types", "index": i, "value": type_data})
+    else:
+        parser = IncrementalJSONParser(
+            scalars=("result_tone", "confidence", "total_score"),
+            strings=("detailed_analysis",),
+            arrays=("ranking",),
+        )
+        try:
+            # RAG 검색(임베딩 호출)은 동기이므로 전용 스레드 풀에서 실행
+            system_prompt, user_prompt = await run_blocking(build_analysis_prompts, answers)
+            stream = await get_async_openai_client().chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.7,
+                max_tokens=ANALYSIS_MAX_TOKENS,
+                timeout=30.0,
+                stream=True
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                for event, payload in parser.feed(chunk.choices[0].delta.content or ""):
+                    if payload["name"] == "ranking" and isinstance(payload["value"], dict):
+                        # 순위 원소가 완성되면 카탈로그로 채운 top_types 원소로 전송
+                        payload = {"name": "top_types", "index": payload["index"],
+                                   "value": ranking_to_type_entry(payload["value"], payload["index"],
+                                                                  parser.values.get("total_score"))}
+                    yield format_sse(event, payload)
+            
+            openai_result = parse_analysis_response(parser.buffer)
+            print(f"✅ OpenAI 스트리밍 분석 완료: {openai_result['result_tone']}")
+            analysis_cache.set(cache_key, openai_result)
+        except json.JSONDecodeError as e:
+            print(f"❌ JSON 파싱 오류: {e}")
+            openai_result = fallback_analysis_result(answers)
+        except Exception as e:
+            print(f"❌ OpenAI API 스트리밍 오류: {e}")
+            openai_result = fallback_analysis_result(answers)
+    
+    # 스트림이 끝난 뒤 한 번만 DB 저장
+    try:
+        survey_result_id = await run_blocking(persist_survey_result, user_id, answers, openai_result)
+    except Exception as e:
+        print(f"❌ 설문 처리 중 오류 발생: {e}")
+        yield format_sse("error", {"detail": "분석 서비스에 일시적인 문제가 발생했습니다. 잠시 후 다시 시도해주세요."})
+        return
+    
+    print(f"✅ 설문 결과 저장 완료 - Survey ID: {survey_result_id}")
+    yield format_sse("done", survey_response_payload(survey_result_id, openai_result, rule))
+
+@router.post("/submit/stream")
+async def submit_survey_stream(
+    result: schemas.SurveyResultCreate,
+    fresh: bool = False,
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    퍼스널 컬러 테스트 결과 제출 (SSE 스트리밍)
+    
+    /submit 과 같은 요청 본문을 받고 text/event-stream으로 응답.
+    result_tone/confidence는 파싱되는 즉시, detailed_analysis와 top_types는
+    생성되는 대로 전송하며, 스트림 종료 후 DB에 저장하고 done 이벤트를 보낸다.
+    """
+    if not current_user or not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="로그인 후 설문 응답만 가능합니다."
+        )
+    
+    if not result.answers or len(result.answers) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="답변 데이터가 필요합니다."
+        )
+    
+    print(f"▶ 사용자 {current_user.username}({current_user.id})의 설문 제출 (스트리밍)")
+    
+    return StreamingResponse(
+        stream_personal_color_analysis(result.answers, current_user.id, fresh=fresh),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
+
 @router.get("/list", response_model=list[schemas.SurveyResult])
 async def get_my_survey_results(
     db: Session = Depends(get_db),
@@ -605,6 +692,67 @@ async def get_my_survey_results(
     
     return results
 
+@router.get("/metrics")
+async def get_survey_metrics(
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    분석 캐시 / 동일 분석 합치기 / 쿼리 임베딩 캐시 / 작업 큐 통계 조회
+    """
+    if not current_user or not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="로그인이 필요합니다."
+        )
+
+    return {
+        "analysis_cache": analysis_cache.stats(),
+        "query_embedding_cache": rag_service.query_cache.stats(),
+        "rag_index": rag_service.index_stats(),
+        "analysis_singleflight": analysis_flight.stats(),
+        "degrade": dict(degrade_stats),
+        "jobs": job_queue.stats(),
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_survey_job(
+    job_id: str,
+    current_user: models.User = Depends(get_current_user)
+):
+    """
+    분석 작업 상태/결과 조회 (본인이 등록한 작업만)
+    
+    Response:
+        {
+            "job_id": "...",
+            "status": "queued"|"running"|"succeeded"|"failed",
+            "result": /submit 응답 본문 (succeeded일 때),
+            "error": 오류 메시지 (failed일 때)
+        }
+    """
+    if not current_user or not current_user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, 
+            detail="로그인이 필요합니다."
+        )
+
+    found = job_queue.get(job_id)
+    if found is None or found.owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, 
+            detail="분석 작업을 찾을 수 없습니다."
+        )
+
+    return {
+        "job_id": found.id,
+        "status": found.status,
+        "created_at": found.created_at,
+        "started_at": found.started_at,
+        "finished_at": found.finished_at,
+        "result": found.result,
+        "error": found.error,
+    }
+
 @router.get("/{survey_id}", response_model=schemas.SurveyResult)
 async def get_survey_detail(
     survey_id: int,
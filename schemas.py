@@ -59,7 +59,8 @@ class Token(BaseModel):
 class SurveyAnswerCreate(BaseModel):
     """
     사용자의 답변 데이터 (프론트엔드에서 전송)
-    - score_map, confidence, total_score는 OpenAI에서 받을 예정
+    - confidence, total_score는 OpenAI에서 받을 예정
+    - score_map은 services/scoring.py 의 규칙 기반 가중치로 채워짐
     """
     question_id: int
     option_id: str
@@ -0,0 +1,68 @@
+# services/analysis_cache.py
+#
+# 설문 분석 결과 캐시
+# - 키: 정렬된 (question_id, option_id) 답변 집합 + 프롬프트 버전 + RAG 코퍼스 버전
+# - 같은 답변 조합이 다시 들어오면 LLM 호출 없이 저장된 분석 결과를 반환한다.
+
+import os
+import copy
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from rag.cache import LRUTTLCache
+
+ANALYSIS_CACHE_SIZE = int(os.getenv("ANALYSIS_CACHE_SIZE", "512"))
+ANALYSIS_CACHE_TTL = float(os.getenv("ANALYSIS_CACHE_TTL", str(60 * 60 * 6)))  # 6시간
+
+
+def canonical_answers(answers: Iterable[Any]) -> Tuple[Tuple[int, str], ...]:
+    """답변 목록 → 순서와 무관한 정렬된 (question_id, option_id) 튜플"""
+    return tuple(sorted((int(a.question_id), str(a.option_id)) for a in answers))
+
+
+def analysis_key(answers: Iterable[Any], prompt_version: str, corpus_version: str) -> str:
+    """분석 결과 캐시 키"""
+    raw = json.dumps({
+        "answers": canonical_answers(answers),
+        "prompt": prompt_version,
+        "corpus": corpus_version,
+    }, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """분석 결과 LRU + TTL 캐시 (반환값은 항상 복사본)"""
+
+    def __init__(self, maxsize: int = ANALYSIS_CACHE_SIZE, ttl: Optional[float] = ANALYSIS_CACHE_TTL):
+        self._cache = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+        self.bypassed = 0
+        self.stored = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self._cache.get(key)
+        return copy.deepcopy(result) if result is not None else None
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        self._cache.set(key, copy.deepcopy(result))
+        with self._lock:
+            self.stored += 1
+
+    def record_bypass(self) -> None:
+        """fresh 분석 요청으로 캐시를 건너뛴 횟수 기록"""
+        with self._lock:
+            self.bypassed += 1
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        stats.update({"bypassed": self.bypassed, "stored": self.stored})
+        return stats
+
+
+# 프로세스 공용 인스턴스
+analysis_cache = AnalysisCache()
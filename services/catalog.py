@@ -0,0 +1,153 @@
+# services/catalog.py
+#
+# 계절 타입 카탈로그 (불변)
+# - 타입명, 설명, 팔레트, 스타일 키워드, 메이크업 팁을 모듈 로드 시 한 번만 생성
+# - LLM 응답의 누락 필드 보충, LLM 실패/지연 시 대체 결과 생성에 사용
+
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from services.scoring import SEASONS, ToneScore
+from services.color import palette_fit, snap_palette, valid_hexes
+
+
+@dataclass(frozen=True)
+class SeasonProfile:
+    type: str
+    name: str
+    description: str
+    color_palette: Tuple[str, ...]
+    style_keywords: Tuple[str, ...]
+    makeup_tips: Tuple[str, ...]
+
+    def to_type_entry(self, score: int) -> Dict[str, Any]:
+        """top_types 원소 형태의 dict (호출마다 새 리스트)"""
+        return {
+            "type": self.type,
+            "name": self.name,
+            "description": self.description,
+            "color_palette": list(self.color_palette),
+            "style_keywords": list(self.style_keywords),
+            "makeup_tips": list(self.makeup_tips),
+            "score": score,
+        }
+
+
+SEASON_CATALOG: Mapping[str, SeasonProfile] = MappingProxyType({
+    "spring": SeasonProfile(
+        type="spring",
+        name="봄 웜톤 🌸",
+        description="밝고 생기 있는 봄날의 따뜻함을 담은 당신",
+        color_palette=("#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0"),
+        style_keywords=("화사함", "발랄함", "생동감", "밝음", "따뜻함"),
+        makeup_tips=("코럴 블러셔", "피치 립", "골든 아이섀도우", "브라운 마스카라"),
+    ),
+    "summer": SeasonProfile(
+        type="summer",
+        name="여름 쿨톤 💎",
+        description="시원하고 우아한 여름날의 세련됨을 담은 당신",
+        color_palette=("#F8BBD9", "#E6E6FA", "#ADD8E6", "#DDA0DD", "#D3D3D3"),
+        style_keywords=("차분함", "세련됨", "우아함", "로맨틱", "부드러움"),
+        makeup_tips=("로즈 블러셔", "더스티핑크 립", "라벤더 아이섀도우", "브라운 마스카라"),
+    ),
+    "autumn": SeasonProfile(
+        type="autumn",
+        name="가을 웜톤 🍂",
+        description="깊고 따뜻한 가을날의 포근함을 담은 당신",
+        color_palette=("#800020", "#8B7355", "#FFD700", "#FF4500", "#556B2F"),
+        style_keywords=("따뜻함", "성숙함", "깊이", "풍성함", "고급스러움"),
+        makeup_tips=("오렌지 블러셔", "브릭레드 립", "골든브라운 아이섀도우", "브라운 마스카라"),
+    ),
+    "winter": SeasonProfile(
+        type="winter",
+        name="겨울 쿨톤 ❄️",
+        description="시원하고 강렬한 겨울날의 우아함을 담은 당신",
+        color_palette=("#000000", "#FFFFFF", "#4169E1", "#FF1493", "#DC143C"),
+        style_keywords=("강렬함", "고급스러움", "시크함", "도시적", "명확함"),
+        makeup_tips=("푸시아 블러셔", "트루레드 립", "스모키 아이섀도우", "블랙 마스카라"),
+    ),
+})
+
+# LLM이 채우지 않은 것으로 보는 자리표시 문구
+PLACEHOLDER_DESCRIPTIONS = frozenset({"추가 타입입니다.", "퍼스널 컬러 타입입니다."})
+
+
+def fill_type_entry(type_data: Dict[str, Any], season: str, default_score: int) -> Dict[str, Any]:
+    """
+    top_types 원소의 누락/잘못된 필드를 카탈로그 값으로 보충 (제자리 수정)
+    LLM이 제안한 대표 색(palette)은 HEX 검증 후 계절 적합도를 기록하고 큐레이션 팔레트 색으로 스냅,
+    다른 계절에 더 가까운 팔레트면 타입과 맞지 않으므로 카탈로그 팔레트를 사용
+    """
+    profile = SEASON_CATALOG[season]
+    type_data["type"] = season
+    if not type_data.get("name") or type_data["name"] == f"{season} 타입":
+        type_data["name"] = profile.name
+    if not type_data.get("description") or type_data["description"] in PLACEHOLDER_DESCRIPTIONS:
+        type_data["description"] = profile.description
+    suggested = type_data.pop("palette", None)  # 한 번만 평가 (다시 채울 때 스냅된 팔레트를 재평가하지 않음)
+    suggested = valid_hexes(suggested) if isinstance(suggested, list) else []
+    palette = type_data.get("color_palette") if isinstance(type_data.get("color_palette"), list) else []
+    if suggested:
+        fit = palette_fit(suggested)
+        type_data["palette_fit"] = fit[season]
+        if fit[season] < max(fit.values()):
+            best = max(SEASONS, key=fit.get)
+            print(f"⚠️ {season} 타입에 제안된 팔레트가 {best}에 더 가깝습니다 ({fit[season]} < {fit[best]}), 카탈로그 팔레트 사용")
+            type_data["color_palette"] = list(profile.color_palette)
+        else:
+            type_data["color_palette"] = snap_palette(suggested, season)
+    elif valid_hexes(palette):
+        # 이미 채워졌거나 top_types 형식으로 온 팔레트: 큐레이션 색으로 스냅 (큐레이션 색은 그대로 유지됨)
+        type_data["color_palette"] = snap_palette(palette, season)
+    else:
+        type_data["color_palette"] = list(profile.color_palette)
+    if not type_data.get("style_keywords") or not isinstance(type_data.get("style_keywords"), list):
+        type_data["style_keywords"] = list(profile.style_keywords)
+    if not type_data.get("makeup_tips") or not isinstance(type_data.get("makeup_tips"), list):
+        type_data["makeup_tips"] = list(profile.makeup_tips)
+    if not type_data.get("score"):
+        type_data["score"] = default_score
+    return type_data
+
+
+def catalog_top_types(ranking: Sequence[str], scores: Sequence[int]) -> List[Dict[str, Any]]:
+    """계절 순위 + 점수 → 카탈로그 기반 top_types"""
+    return [SEASON_CATALOG[season].to_type_entry(score) for season, score in zip(ranking, scores)]
+
+
+def catalog_result(rule: ToneScore, detailed_analysis: Optional[str] = None, count: int = 3) -> Dict[str, Any]:
+    """
+    규칙 기반 점수 → LLM 없이 만든 분석 결과 (normalize_analysis_result와 같은 형태)
+    """
+    ranking = list(rule.ranking[:count])
+    top = rule.total_score
+    # 2·3위 점수는 1위 대비 원점수 비율로 환산
+    head = max(rule.scores[ranking[0]], 1)
+    scores = [top] + [int(round(top * rule.scores[season] / head)) for season in ranking[1:]]
+    top_types = catalog_top_types(ranking, scores)
+    main = top_types[0]
+    if detailed_analysis is None:
+        keywords = ", ".join(main["style_keywords"][:3])
+        detailed_analysis = (
+            f"답변을 문항별 가중치로 분석한 결과 {main['name']} 타입과 가장 가깝습니다. "
+            f"{main['description']}으로, {keywords} 같은 분위기가 잘 어울립니다."
+        )
+    return {
+        "result_tone": rule.result_tone,
+        "confidence": rule.confidence,
+        "total_score": rule.total_score,
+        "detailed_analysis": detailed_analysis,
+        "top_types": top_types,
+        "name": main["name"],
+        "description": main["description"],
+        "color_palette": main["color_palette"],
+        "style_keywords": main["style_keywords"],
+        "makeup_tips": main["makeup_tips"],
+        "source": "catalog",
+    }
+
+
+def season_order(main: str) -> List[str]:
+    """메인 계절을 맨 앞에 두고 나머지는 SEASONS 순서"""
+    return [main] + [season for season in SEASONS if season != main]
@@ -0,0 +1,145 @@
+# services/color.py
+#
+# CIELAB 색상 엔진 (NumPy)
+# - HEX → sRGB → XYZ(D65) → CIELAB 변환 (벡터화)
+# - ΔE(CIE76, Lab 유클리드 거리)로 LLM이 제안한 색을 계절별 큐레이션 팔레트의 가장 가까운 색으로 스냅
+# - 팔레트가 각 계절과 얼마나 어울리는지 적합도(0-100) 계산 → 제안한 타입과 팔레트가 맞는지 검사
+# - 모델이 팔레트를 빠뜨리거나 일부만 주면 큐레이션 팔레트로 채움
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from services.scoring import SEASONS
+
+PALETTE_SIZE = 5
+FIT_SCALE = 30.0  # 평균 ΔE가 이 값일 때 적합도 ≈ 37 (exp(-1))
+
+_HEX_PATTERN = re.compile(r"^#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})$")
+
+# 계절별 큐레이션 팔레트 (계절당 13개: 앞 5개 = 카탈로그 기본 팔레트, 앞 7개 = 프론트엔드 swatches, 나머지 6개 = 추가 큐레이션 색)
+# 가장 가까운 색이 어느 계절인지로 적합도를 매기므로 계절 간에 같은 색이 없어야 함
+# (프론트엔드 봄 swatches의 라벤더 #E6E6FA는 여름 카탈로그 색이라 봄에서는 따뜻한 살구색 #FFB347로 대체)
+SEASON_SWATCHES: Dict[str, Tuple[str, ...]] = {
+    "spring": ("#FF6F61", "#FFD1B3", "#FFE5B4", "#98FB98", "#40E0D0", "#FFB347", "#FFFACD",
+               "#FF7F50", "#FFDAB9", "#F4C430", "#FFA07A", "#9ACD32", "#F5DEB3"),
+    "summer": ("#F8BBD9", "#E6E6FA", "#ADD8E6", "#DDA0DD", "#D3D3D3", "#FFB6C1", "#B0E0E6",
+               "#C8A2C8", "#B0C4DE", "#778899", "#DB7093", "#87CEEB", "#F5F5F5"),
+    "autumn": ("#800020", "#8B7355", "#FFD700", "#FF4500", "#556B2F", "#A0522D", "#CD853F",
+               "#B7410E", "#808000", "#D2691E", "#E1AD01", "#008080", "#C19A6B"),
+    "winter": ("#000000", "#FFFFFF", "#4169E1", "#FF1493", "#DC143C", "#50C878", "#191970",
+               "#000080", "#800080", "#C0C0C0", "#E0FFFF", "#0F52BA", "#36454F"),
+}
+
+
+def normalize_hex(value) -> Optional[str]:
+    """'#abc', 'AABBCC' 등 → '#AABBCC' (HEX가 아니면 None)"""
+    if not isinstance(value, str):
+        return None
+    match = _HEX_PATTERN.match(value.strip())
+    if not match:
+        return None
+    digits = match.group(1)
+    if len(digits) == 3:
+        digits = "".join(ch * 2 for ch in digits)
+    return "#" + digits.upper()
+
+
+def hex_to_rgb(hexes: Sequence[str]) -> np.ndarray:
+    """정규화된 HEX 목록 → (N, 3) sRGB 0-1"""
+    if not hexes:
+        return np.zeros((0, 3), dtype=np.float64)
+    raw = np.array([[int(h[i:i + 2], 16) for i in (1, 3, 5)] for h in hexes], dtype=np.float64)
+    return raw / 255.0
+
+
+_SRGB_TO_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+_D65_WHITE = np.array([0.95047, 1.0, 1.08883])
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """(N, 3) sRGB 0-1 → (N, 3) CIELAB (D65)"""
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    xyz = linear @ _SRGB_TO_XYZ.T / _D65_WHITE
+    eps, kappa = 216 / 24389, 24389 / 27
+    f = np.where(xyz > eps, np.cbrt(xyz), (kappa * xyz + 16) / 116)
+    lab = np.empty_like(f)
+    lab[:, 0] = 116 * f[:, 1] - 16
+    lab[:, 1] = 500 * (f[:, 0] - f[:, 1])
+    lab[:, 2] = 200 * (f[:, 1] - f[:, 2])
+    return lab
+
+
+def hex_to_lab(hexes: Sequence[str]) -> np.ndarray:
+    return rgb_to_lab(hex_to_rgb(hexes))
+
+
+def delta_e(lab_a: np.ndarray, lab_b: np.ndarray) -> np.ndarray:
+    """(N, 3) x (M, 3) → (N, M) ΔE(CIE76) 거리 행렬"""
+    diff = lab_a[:, None, :] - lab_b[None, :, :]
+    return np.sqrt(np.einsum("nmk,nmk->nm", diff, diff))
+
+
+def _build_swatch_matrix():
+    hexes = [h for season in SEASONS for h in SEASON_SWATCHES[season]]
+    if len(set(hexes)) != len(hexes):
+        raise ValueError("SEASON_SWATCHES: 여러 계절에 같은 색이 있으면 적합도/스냅 계절이 동점이 됨")
+    bounds = np.cumsum([0] + [len(SEASON_SWATCHES[season]) for season in SEASONS])
+    return tuple(hexes), hex_to_lab(hexes), bounds
+
+
+SWATCH_HEXES, SWATCH_LAB, _SEASON_BOUNDS = _build_swatch_matrix()
+SWATCH_LAB.setflags(write=False)
+
+
+def _season_slice(season: str) -> slice:
+    i = SEASONS.index(season)
+    return slice(_SEASON_BOUNDS[i], _SEASON_BOUNDS[i + 1])
+
+
+def valid_hexes(values: Iterable) -> List[str]:
+    """HEX가 아닌 값은 버리고 정규화"""
+    return [h for h in (normalize_hex(v) for v in (values or [])) if h is not None]
+
+
+def snap_palette(values: Iterable, season: str, size: int = PALETTE_SIZE) -> List[str]:
+    """
+    LLM 팔레트 → 계절 큐레이션 팔레트 색으로 스냅 (중복 제거, 순서 유지)
+    유효한 색이 size개보다 적으면 큐레이션 팔레트 앞쪽 색으로 채움
+    """
+    hexes = valid_hexes(values)
+    block = _season_slice(season)
+    swatches = SWATCH_HEXES[block]
+    snapped: List[str] = []
+    if hexes:
+        nearest = delta_e(hex_to_lab(hexes), SWATCH_LAB[block]).argmin(axis=1)
+        for i in nearest:
+            if swatches[i] not in snapped:
+                snapped.append(swatches[i])
+    for swatch in swatches:
+        if len(snapped) >= size:
+            break
+        if swatch not in snapped:
+            snapped.append(swatch)
+    return snapped[:size]
+
+
+def palette_fit(values: Iterable) -> Dict[str, int]:
+    """
+    팔레트의 계절별 적합도 (0-100)
+    각 색과 계절 큐레이션 팔레트 사이 최소 ΔE의 평균이 작을수록 높음
+    """
+    hexes = valid_hexes(values)
+    if not hexes:
+        return {season: 0 for season in SEASONS}
+    distances = delta_e(hex_to_lab(hexes), SWATCH_LAB)  # (N, 전체 swatch)
+    # 계절 구간별 최소 거리 → (N, 4)
+    nearest = np.minimum.reduceat(distances, _SEASON_BOUNDS[:-1], axis=1)
+    mean = nearest.mean(axis=0)
+    return {season: int(round(100 * np.exp(-m / FIT_SCALE))) for season, m in zip(SEASONS, mean)}
+
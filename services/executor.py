@@ -0,0 +1,42 @@
+# services/executor.py
+#
+# 블로킹 작업(LLM/임베딩 호출 등) 전용 스레드 풀
+# - async 엔드포인트에서 동기 OpenAI 호출을 그대로 부르면 이벤트 루프 전체가 멈춘다.
+# - run_blocking()으로 전용 풀에 넘기면 다른 요청은 계속 처리된다.
+
+import os
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+LLM_WORKERS = int(os.getenv("LLM_WORKERS", "16"))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """프로세스 공용 스레드 풀 (최초 호출 시 생성)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=LLM_WORKERS, thread_name_prefix="llm")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """동기 함수를 전용 스레드 풀에서 실행하고 결과를 기다림"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """애플리케이션 종료 시 스레드 풀 정리"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
@@ -0,0 +1,190 @@
+# services/jobs.py
+#
+# 백그라운드 작업 큐
+# - submit()은 작업을 큐에 넣고 바로 Job(id)을 반환한다 (HTTP 202 + 폴링용).
+# - 고정 개수의 워커가 큐에서 꺼내 전용 스레드 풀(run_blocking)에서 실행 → 동시 실행 수 제한
+# - 작업 상태/결과 저장소는 JobBackend 인터페이스로 분리 (기본: 프로세스 메모리)
+#   여러 프로세스/서버에서 공유하려면 Redis 등으로 JobBackend를 구현해 교체
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict, field
+from typing import Any, Callable, Dict, List, Optional
+
+from services.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+SURVEY_JOB_WORKERS = int(os.getenv("SURVEY_JOB_WORKERS", "4"))
+SURVEY_JOB_QUEUE_SIZE = int(os.getenv("SURVEY_JOB_QUEUE_SIZE", "1000"))
+SURVEY_JOB_TTL = float(os.getenv("SURVEY_JOB_TTL", str(60 * 60)))  # 완료된 작업 보관 시간 (1시간)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+@dataclass
+class Job:
+    id: str
+    owner_id: Optional[int] = None
+    status: str = QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class JobBackend(ABC):
+    """작업 상태 저장소 인터페이스"""
+
+    @abstractmethod
+    def put(self, job: Job) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    def update(self, job_id: str, **fields: Any) -> None:
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+
+class InMemoryJobBackend(JobBackend):
+    """프로세스 메모리 저장소 (완료 후 ttl초가 지난 작업은 정리)"""
+
+    def __init__(self, ttl: float = SURVEY_JOB_TTL):
+        self.ttl = ttl
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def put(self, job: Job) -> None:
+        with self._lock:
+            self._purge()
+            self._jobs[job.id] = job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return Job(**job.to_dict()) if job is not None else None
+
+    def update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                for name, value in fields.items():
+                    setattr(job, name, value)
+
+    def _purge(self) -> None:
+        now = time.time()
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.done and job.finished_at is not None and now - job.finished_at > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, SUCCEEDED: 0, FAILED: 0}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return counts
+
+
+class JobQueue:
+    """asyncio 대기열 + 고정 워커 수로 동시 실행을 제한하는 작업 큐"""
+
+    def __init__(self, backend: Optional[JobBackend] = None, workers: int = SURVEY_JOB_WORKERS,
+                 maxsize: int = SURVEY_JOB_QUEUE_SIZE):
+        self.backend = backend or InMemoryJobBackend()
+        self.workers = max(1, workers)
+        self.maxsize = maxsize
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.rejected = 0
+
+    async def start(self) -> None:
+        """워커 시작 (lifespan 또는 첫 submit 시 호출, 현재 이벤트 루프에 바인딩)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._tasks:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+        logger.info(f"🧵 작업 큐 시작 (워커 {self.workers}개, 대기열 {self.maxsize})")
+
+    async def stop(self) -> None:
+        """워커 종료 (대기 중인 작업은 버려짐)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+    async def submit(self, func: Callable[..., Any], *args: Any, owner_id: Optional[int] = None, **kwargs: Any) -> Job:
+        """동기 함수 실행을 예약하고 바로 Job 반환 (대기열이 가득 차면 QueueFullError)"""
+        await self.start()
+        job = Job(id=uuid.uuid4().hex, owner_id=owner_id)
+        try:
+            self._queue.put_nowait((job.id, func, args, kwargs))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise QueueFullError("작업 대기열이 가득 찼습니다.")
+        self.backend.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self.backend.get(job_id)
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id, func, args, kwargs = await self._queue.get()
+            self.backend.update(job_id, status=RUNNING, started_at=time.time())
+            try:
+                result = await run_blocking(func, *args, **kwargs)
+                self.backend.update(job_id, status=SUCCEEDED, result=result, finished_at=time.time())
+            except asyncio.CancelledError:
+                self.backend.update(job_id, status=FAILED, error="서버 종료로 작업이 취소되었습니다.", finished_at=time.time())
+                raise
+            except Exception as e:
+                logger.error(f"❌ 작업 실패 ({job_id}): {e}")
+                self.backend.update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+            finally:
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        stats: Dict[str, Any] = dict(self.backend.stats())
+        stats.update({
+            "workers": self.workers,
+            "queue_size": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.maxsize,
+            "rejected": self.rejected,
+        })
+        return stats
+
+
+# 설문 분석용 프로세스 공용 작업 큐
+job_queue = JobQueue()
@@ -0,0 +1,213 @@
+# services/scoring.py
+#
+# 규칙 기반 퍼스널 컬러 점수 엔진
+# - (question_id, option_id) → 계절별 가중치 (프론트엔드 문항의 scores와 동일)
+# - 답변 집합을 one-hot 벡터로 만들어 가중치 행렬과 곱해 계절별 점수 계산
+# - LLM 없이 수 마이크로초 안에 result_tone / confidence / total_score 산출
+#   → 즉시 보여줄 1차 결과, LLM 지연 시 대체 결과, LLM 응답 검증용
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+SEASONS: Tuple[str, ...] = ("spring", "summer", "autumn", "winter")
+
+# 문항별 선택지 가중치 (spring, summer, autumn, winter)
+# frontend/src/constants/personalColorQuestions.ts 의 scores와 맞춰서 수정할 것
+QUESTION_OPTION_SCORES: Dict[int, Dict[str, Tuple[int, int, int, int]]] = {
+    1: {  # 피부 색상
+        "opt_warm_undertone": (2, 0, 2, 0),
+        "opt_cool_undertone": (0, 2, 0, 2),
+        "opt_neutral_undertone": (1, 1, 1, 1),
+    },
+    2: {  # 피부 명도
+        "opt_light_skin": (2, 2, 0, 0),
+        "opt_medium_skin": (1, 1, 2, 1),
+        "opt_dark_skin": (0, 0, 1, 2),
+    },
+    3: {  # 머리카락 색상
+        "opt_hair_golden": (3, 0, 1, 0),
+        "opt_hair_ashy": (0, 3, 0, 0),
+        "opt_hair_deep_warm": (0, 0, 3, 0),
+        "opt_hair_deep_cool": (0, 0, 0, 3),
+    },
+    4: {  # 눈동자 색상
+        "opt_eye_warm_light": (3, 0, 1, 0),
+        "opt_eye_cool_soft": (0, 3, 0, 0),
+        "opt_eye_warm_deep": (0, 0, 3, 0),
+        "opt_eye_cool_clear": (0, 0, 0, 3),
+    },
+    5: {  # 손목 정맥
+        "opt_vein_golden_green": (2, 0, 2, 0),
+        "opt_vein_blue": (0, 2, 0, 2),
+        "opt_vein_mixed": (1, 1, 1, 1),
+    },
+    6: {  # 혈색
+        "opt_complexion_healthy": (2, 1, 0, 0),
+        "opt_complexion_rosy": (0, 2, 0, 1),
+        "opt_complexion_muted": (0, 0, 2, 1),
+    },
+    7: {  # 메탈 악세서리
+        "opt_metal_warm": (2, 0, 2, 0),
+        "opt_metal_cool": (0, 2, 0, 2),
+        "opt_metal_both": (1, 1, 1, 1),
+    },
+    8: {  # 화이트/베이지 톤
+        "opt_white_pure": (0, 2, 0, 2),
+        "opt_white_ivory": (2, 0, 2, 0),
+        "opt_white_unsure": (1, 1, 1, 1),
+    },
+}
+
+# 문항별 선택지 문구 (프론트엔드 label과 동일, 선택지 임베딩 사전 계산용)
+QUESTION_OPTION_LABELS: Dict[int, Dict[str, str]] = {
+    1: {
+        "opt_warm_undertone": "노란빛, 복숭아빛 - 황금색 느낌",
+        "opt_cool_undertone": "분홍빛, 붉은빛 - 분홍색 느낌",
+        "opt_neutral_undertone": "두 색감이 섞여있음",
+    },
+    2: {
+        "opt_light_skin": "밝음 (아이보리, 밝은 베이지 톤)",
+        "opt_medium_skin": "중간 (자연스러운 중간 톤)",
+        "opt_dark_skin": "어두움 (깊고 어두운 톤)",
+    },
+    3: {
+        "opt_hair_golden": "금색, 밝은 갈색, 적갈색",
+        "opt_hair_ashy": "회색기미, 애쉬 갈색, 밝은 갈색",
+        "opt_hair_deep_warm": "구리색, 초콜릿, 검정색",
+        "opt_hair_deep_cool": "검정색, 진한 갈색",
+    },
+    4: {
+        "opt_eye_warm_light": "황금 갈색, 토파즈, 밝은 아쿠아",
+        "opt_eye_cool_soft": "연한 파란색, 회색 파란색, 소프트 갈색",
+        "opt_eye_warm_deep": "올리브 그린, 황금 갈색, 검은색",
+        "opt_eye_cool_clear": "검은색, 회색, 깊은 파란색",
+    },
+    5: {
+        "opt_vein_golden_green": "녹색 또는 노란 녹색",
+        "opt_vein_blue": "파란색 또는 보라 파란색",
+        "opt_vein_mixed": "녹색과 파란색이 섞여있음",
+    },
+    6: {
+        "opt_complexion_healthy": "생기있고 투명함 - 밝고 건강한 인상",
+        "opt_complexion_rosy": "분홍색 또는 붉은 색감 - 분홍빛 도는 인상",
+        "opt_complexion_muted": "차분하거나 흐릿함 - 깊고 자연스러운 인상",
+    },
+    7: {
+        "opt_metal_warm": "골드/구리색",
+        "opt_metal_cool": "실버/백금",
+        "opt_metal_both": "둘 다 어울림",
+    },
+    8: {
+        "opt_white_pure": "순백색 - 깨끗하고 선명한 흰색",
+        "opt_white_ivory": "아이보리/크림색 - 따뜻하고 부드러운 흰색",
+        "opt_white_unsure": "둘 다 비슷하게 보임",
+    },
+}
+
+
+def option_texts() -> Dict[Tuple[int, str], str]:
+    """(question_id, option_id) → 임베딩할 문구 ("Q1: 라벨", 설문 분석 프롬프트의 답변 줄과 같은 형식)"""
+    return {(qid, oid): f"Q{qid}: {label}"
+            for qid, options in QUESTION_OPTION_LABELS.items() for oid, label in options.items()}
+
+
+def _build_matrix():
+    keys = [(qid, oid) for qid, options in QUESTION_OPTION_SCORES.items() for oid in options]
+    row_of = {key: i for i, key in enumerate(keys)}
+    weights = np.array([QUESTION_OPTION_SCORES[qid][oid] for qid, oid in keys], dtype=np.float32)
+    question_rows = {qid: np.array([row_of[(qid, oid)] for oid in options])
+                     for qid, options in QUESTION_OPTION_SCORES.items()}
+    # 문항별 계절 최고 가중치 (total_score 정규화용)
+    question_max = {qid: weights[rows].max(axis=0) for qid, rows in question_rows.items()}
+    return row_of, weights, question_max
+
+
+ROW_OF, WEIGHTS, QUESTION_MAX = _build_matrix()
+WEIGHTS.setflags(write=False)
+
+
+@dataclass(frozen=True)
+class ToneScore:
+    scores: Dict[str, int]
+    result_tone: str
+    confidence: int
+    total_score: int
+    ranking: Tuple[str, ...]
+    matched: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "scores": dict(self.scores),
+            "result_tone": self.result_tone,
+            "confidence": self.confidence,
+            "total_score": self.total_score,
+            "ranking": list(self.ranking),
+            "matched": self.matched,
+        }
+
+
+def option_score_map(question_id: int, option_id: str) -> Optional[Dict[str, int]]:
+    """선택지 하나의 계절별 가중치 (SurveyAnswer.score_map), 모르는 선택지면 None"""
+    row = ROW_OF.get((int(question_id), str(option_id)))
+    if row is None:
+        return None
+    return {season: int(w) for season, w in zip(SEASONS, WEIGHTS[row])}
+
+
+def season_option_weights() -> Dict[str, Dict[Tuple[int, str], int]]:
+    """계절 → {(question_id, option_id): 가중치} (RAG 톤 벡터 합성용)"""
+    return {season: {key: int(WEIGHTS[row, i]) for key, row in ROW_OF.items()}
+            for i, season in enumerate(SEASONS)}
+
+
+def _answer_rows(answers: Iterable[Any]) -> Tuple[List[int], List[int]]:
+    # 문항당 마지막 답변만 사용 (중복 제출 방지), 모르는 선택지는 무시
+    by_question: Dict[int, int] = {}
+    for ans in answers:
+        row = ROW_OF.get((int(ans.question_id), str(ans.option_id)))
+        if row is not None:
+            by_question[int(ans.question_id)] = row
+    return list(by_question.values()), list(by_question.keys())
+
+
+def _derive(season_scores: np.ndarray, max_scores: np.ndarray, matched: int) -> ToneScore:
+    order = np.argsort(-season_scores, kind="stable")  # 동점이면 SEASONS 순서
+    top, second = season_scores[order[0]], season_scores[order[1]]
+    if matched == 0 or top <= 0:
+        confidence, total_score = 0, 0
+    else:
+        # 신뢰도: 1·2위 격차가 클수록 높음 (동점 50, 2위가 0점이면 100)
+        confidence = int(round(50 + 50 * (top - second) / top))
+        # 종합 점수: 1위 계절이 답한 문항에서 받을 수 있는 최고점 대비 비율
+        total_score = int(round(100 * top / max_scores[order[0]]))
+    return ToneScore(
+        scores={season: int(s) for season, s in zip(SEASONS, season_scores)},
+        result_tone=SEASONS[order[0]],
+        confidence=max(0, min(100, confidence)),
+        total_score=max(0, min(100, total_score)),
+        ranking=tuple(SEASONS[i] for i in order),
+        matched=matched,
+    )
+
+
+def score_answers(answers: Iterable[Any]) -> ToneScore:
+    """답변 목록(question_id, option_id 속성) → 규칙 기반 점수"""
+    rows, questions = _answer_rows(answers)
+    one_hot = np.zeros(len(WEIGHTS), dtype=np.float32)
+    one_hot[rows] = 1.0
+    season_scores = one_hot @ WEIGHTS
+    max_scores = sum((QUESTION_MAX[q] for q in questions), np.zeros(len(SEASONS), dtype=np.float32))
+    return _derive(season_scores, max_scores, len(rows))
+
+
+def compare_with_llm(rule: ToneScore, llm_tone: Optional[str]) -> Dict[str, Any]:
+    """LLM 진단과 규칙 기반 진단 비교 (sanity check)"""
+    rank = rule.ranking.index(llm_tone) if llm_tone in rule.ranking else None
+    return {
+        "rule_tone": rule.result_tone,
+        "llm_tone": llm_tone,
+        "agrees": llm_tone == rule.result_tone or (rank is not None and rule.scores[llm_tone] == rule.scores[rule.result_tone]),
+        "llm_rule_rank": rank + 1 if rank is not None else None,
+    }
@@ -0,0 +1,77 @@
+# services/singleflight.py
+#
+# 동일 작업 합치기 (single-flight)
+# - 같은 키의 작업이 이미 실행 중이면 새로 실행하지 않고 그 결과를 함께 받는다.
+# - 분석 캐시는 "끝난" 결과만 재사용하므로, 동시에 들어온 같은 답변 조합은
+#   캐시가 채워지기 전까지 모두 OpenAI를 호출하게 된다. 이 구간을 한 번의 호출로 합친다.
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """키별로 동시에 하나의 실행만 허용하고 결과를 대기자들에게 나눠줌 (스레드 기반)"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.executions = 0   # 실제로 실행된 횟수
+        self.coalesced = 0    # 실행 없이 결과를 나눠 받은 횟수
+        self.peak_fanout = 0  # 한 번의 실행을 함께 기다린 최대 요청 수
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Tuple[Any, bool]:
+        """
+        func(*args, **kwargs) 실행 → (결과, 공유 여부)
+        같은 키가 실행 중이면 끝날 때까지 기다렸다가 그 결과(또는 예외)를 받음
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                self.peak_fanout = max(self.peak_fanout, call.waiters + 1)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result, False
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.executions + self.coalesced
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "coalesce_rate": self.coalesced / total if total else 0.0,
+                "in_flight": len(self._calls),
+                "peak_fanout": self.peak_fanout,
+            }
+
+
+# 설문 분석용 프로세스 공용 인스턴스
+analysis_flight = SingleFlight()
@@ -0,0 +1,229 @@
+# services/sse.py
+#
+# Server-Sent Events 유틸
+# - format_sse(): SSE 프레임 문자열 생성
+# - IncrementalJSONParser: LLM이 스트리밍으로 생성 중인 JSON에서
+#   완성된 필드를 가능한 빨리 꺼내는 점진적 파서
+#     scalars: 값이 완성되면 한 번 emit          (예: result_tone, confidence)
+#     strings: 문자열 값이 늘어날 때마다 delta emit (예: detailed_analysis)
+#     arrays : 배열 원소가 하나 완성될 때마다 emit  (예: top_types)
+
+import re
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # nginx 프록시 버퍼링 비활성화
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """SSE 프레임 (event + JSON data)"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+_SCALAR_VALUE = re.compile(r'\s*("(?:[^"\\]|\\.)*"|-?\d+(?:\.\d+)?|true|false|null)(?=\s*[,}\]\s])')
+_VALUE_START = re.compile(r"\s*(\S)")
+
+
+class _ArrayState:
+    def __init__(self, start: int):
+        self.pos = start
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.element_start = start
+        self.count = 0
+        self.done = False
+
+
+class IncrementalJSONParser:
+    """
+    스트리밍 JSON 텍스트에서 지정한 필드를 점진적으로 추출
+    최상위 객체의 키만 인식하므로 문자열 값 안에 "confidence": 같은 문구가 있어도 무시하고,
+    버퍼는 지난번에 멈춘 위치부터 이어서 훑는다 (조각마다 전체를 다시 검색하지 않음).
+    """
+
+    def __init__(self, scalars: Iterable[str] = (), strings: Iterable[str] = (), arrays: Iterable[str] = ()):
+        self.buffer = ""
+        self._scalars = tuple(scalars)
+        self._strings = tuple(strings)
+        self._arrays = tuple(arrays)
+        self.values: Dict[str, Any] = {}  # 지금까지 파싱된 scalar 값
+        self._string_starts: Dict[str, int] = {}
+        self._string_sent: Dict[str, int] = {}
+        self._string_done: Dict[str, bool] = {}
+        self._array_states: Dict[str, _ArrayState] = {}
+        # 최상위 키 스캐너 상태
+        self._value_at: Dict[str, int] = {}  # 키 → ':' 다음 위치
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_open = 0
+        self._expect_key = False
+        self._pending_key: Optional[str] = None
+
+    def feed(self, delta: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """텍스트 조각 추가 → 새로 완성된 [(이벤트 종류, payload), ...]"""
+        if not delta:
+            return []
+        self.buffer += delta
+        self._scan_keys()
+        events = []
+        events.extend(self._scan_scalars())
+        events.extend(self._scan_strings())
+        events.extend(self._scan_arrays())
+        return events
+
+    # ---------------- top-level keys ----------------
+    def _scan_keys(self) -> None:
+        """새로 들어온 부분만 훑어 최상위 객체의 키와 값 시작 위치를 기록 (문자열 안은 건너뜀)"""
+        buf = self.buffer
+        for i in range(self._pos, len(buf)):
+            ch = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._pending_key = buf[self._string_open:i]
+            elif ch == '"':
+                self._in_string = True
+                self._string_open = i + 1
+            elif ch == ":" and self._pending_key is not None:
+                self._value_at.setdefault(self._pending_key, i + 1)
+                self._pending_key = None
+                self._expect_key = False
+            elif ch in "{[":
+                self._depth += 1
+                self._expect_key = self._depth == 1 and ch == "{"
+            elif ch in "}]":
+                self._depth -= 1
+            elif ch == "," and self._depth == 1:
+                self._expect_key = True
+        self._pos = len(buf)
+
+    def _value_start(self, name: str, opener: str) -> Optional[int]:
+        """키 name의 값이 opener(" 또는 [)로 시작하면 그 다음 위치"""
+        at = self._value_at.get(name)
+        if at is None:
+            return None
+        match = _VALUE_START.match(self.buffer, at)
+        if not match or match.group(1) != opener:
+            return None
+        return match.end()
+
+    # ---------------- scalar ----------------
+    def _scan_scalars(self):
+        for name in self._scalars:
+            if name in self.values or name not in self._value_at:
+                continue
+            match = _SCALAR_VALUE.match(self.buffer, self._value_at[name])
+            if match:
+                try:
+                    value = json.loads(match.group(1))
+                except json.JSONDecodeError:
+                    continue
+                self.values[name] = value
+                yield "field", {"name": name, "value": value}
+
+    # ---------------- progressive string ----------------
+    def _scan_strings(self):
+        for name in self._strings:
+            if self._string_done.get(name):
+                continue
+            if name not in self._string_starts:
+                start = self._value_start(name, '"')
+                if start is None:
+                    continue
+                self._string_starts[name] = start
+                self._string_sent[name] = 0
+            raw, closed = self._read_string(self._string_starts[name])
+            text = self._decode_partial(raw)
+            if text is None:
+                continue
+            sent = self._string_sent[name]
+            if len(text) > sent:
+                self._string_sent[name] = len(text)
+                yield "text", {"name": name, "delta": text[sent:]}
+            if closed:
+                self._string_done[name] = True
+                yield "text_end", {"name": name, "value": text}
+
+    def _read_string(self, start: int) -> Tuple[str, bool]:
+        escape = False
+        for i in range(start, len(self.buffer)):
+            ch = self.buffer[i]
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                return self.buffer[start:i], True
+        return self.buffer[start:], False
+
+    @staticmethod
+    def _decode_partial(raw: str) -> Optional[str]:
+        # 잘린 이스케이프 시퀀스(\, \u12 등)는 다음 조각이 올 때까지 보류
+        cut = raw.rfind("\\")
+        if cut != -1:
+            tail = raw[cut:]
+            if tail == "\\" or (tail.startswith("\\u") and len(tail) < 6):
+                raw = raw[:cut]
+        try:
+            return json.loads(f'"{raw}"')
+        except json.JSONDecodeError:
+            return None
+
+    # ---------------- array items ----------------
+    def _scan_arrays(self):
+        for name in self._arrays:
+            state = self._array_states.get(name)
+            if state is None:
+                start = self._value_start(name, "[")
+                if start is None:
+                    continue
+                state = self._array_states[name] = _ArrayState(start)
+            if state.done:
+                continue
+            yield from self._advance_array(name, state)
+
+    def _advance_array(self, name: str, state: _ArrayState):
+        buf = self.buffer
+        while state.pos < len(buf):
+            ch = buf[state.pos]
+            if state.in_string:
+                if state.escape:
+                    state.escape = False
+                elif ch == "\\":
+                    state.escape = True
+                elif ch == '"':
+                    state.in_string = False
+            elif ch == '"':
+                state.in_string = True
+            elif ch in "{[":
+                state.depth += 1
+            elif ch in "}]" and state.depth > 0:
+                state.depth -= 1
+            elif ch in ",]" and state.depth == 0:
+                element = buf[state.element_start:state.pos].strip()
+                state.element_start = state.pos + 1
+                if element:
+                    try:
+                        value = json.loads(element)
+                    except json.JSONDecodeError:
+                        value = None
+                    if value is not None:
+                        yield "item", {"name": name, "index": state.count, "value": value}
+                        state.count += 1
+                if ch == "]":
+                    state.done = True
+                    state.pos += 1
+                    return
+            state.pos += 1